@@ -1,6 +1,36 @@
+from importlib import import_module
 
 from .base import Automaton
 from .nfa import NFA
 from .dfa import DFA
 
-__all__ = ["Automaton", "NFA", "DFA"]
+# The matchers are imported on first access (see automata_tool.core).
+_LAZY = {
+    "CompiledDFA": ".compiled",
+    "LazyDFA": ".lazy",
+    "BitsetNFA": ".bitset",
+    "DFASearcher": ".search",
+    "StreamMatcher": ".streaming",
+    "PikeProgram": ".pike",
+    "PikeVM": ".pike",
+}
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(import_module(module, __name__), name)
+    return value
+
+__all__ = [
+    "Automaton",
+    "NFA",
+    "DFA",
+    "CompiledDFA",
+    "LazyDFA",
+    "BitsetNFA",
+    "DFASearcher",
+    "StreamMatcher",
+    "PikeProgram",
+    "PikeVM",
+]
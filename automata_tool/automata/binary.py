@@ -0,0 +1,109 @@
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from typing import Union
+
+from .compiled import CompiledDFA
+
+MAGIC = b"ATDFABIN"
+FORMAT_VERSION = 1
+
+# magic, version, flags, num_states, num_columns, symbols length (bytes)
+_HEADER = struct.Struct("<8sHHIII")
+_ALIGN = 8
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+def _pad(n: int) -> int:
+    return (-n) % _ALIGN
+
+def dumps_compiled(compiled: CompiledDFA) -> bytes:
+    """Serialize a CompiledDFA to the versioned binary format.
+
+    Layout (little-endian, each section padded to 8 bytes): header, symbol
+    list as UTF-8 JSON in column order, final-state bitmap, then the
+    transition table as int32 row offsets.
+    """
+    num_states = compiled.num_states
+    num_columns = compiled.num_columns
+    if num_states * num_columns >= 2 ** 31:
+        raise ValueError("El DFA es demasiado grande para el formato binario")
+
+    symbols = [""] * len(compiled.columns)
+    for sym, col in compiled.columns.items():
+        symbols[col] = sym
+    symbols_blob = json.dumps(symbols, ensure_ascii=False).encode("utf-8")
+
+    bitmap = bytearray((num_states + 7) // 8)
+    for i, acc in enumerate(compiled.accepting):
+        if acc:
+            bitmap[i >> 3] |= 1 << (i & 7)
+
+    table = array("i", compiled.table)
+    if sys.byteorder != "little":
+        table.byteswap()
+
+    parts = [
+        _HEADER.pack(MAGIC, FORMAT_VERSION, 0, num_states, num_columns, len(symbols_blob)),
+        symbols_blob, b"\0" * _pad(len(symbols_blob)),
+        bytes(bitmap), b"\0" * _pad(len(bitmap)),
+        table.tobytes(),
+    ]
+    return b"".join(parts)
+
+def loads_compiled(buffer: Buffer) -> CompiledDFA:
+    """Load a CompiledDFA from a buffer without copying its transition table.
+
+    On little-endian machines the table is a ``memoryview`` over `buffer`
+    (which must stay open while the DFA is used); elsewhere it is copied
+    and byte-swapped.
+    """
+    view = memoryview(buffer)
+    if len(view) < _HEADER.size:
+        raise ValueError("Archivo de autómata binario truncado")
+    magic, version, _flags, num_states, num_columns, sym_len = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("No es un archivo de autómata binario de automata_tool")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Versión de formato binario no soportada: {version}")
+
+    pos = _HEADER.size
+    symbols = json.loads(bytes(view[pos:pos + sym_len]).decode("utf-8"))
+    pos += sym_len + _pad(sym_len)
+
+    bitmap_len = (num_states + 7) // 8
+    bitmap = view[pos:pos + bitmap_len]
+    pos += bitmap_len + _pad(bitmap_len)
+
+    table_len = num_states * num_columns * 4
+    if len(view) < pos + table_len:
+        raise ValueError("Archivo de autómata binario truncado")
+    raw = view[pos:pos + table_len]
+    if sys.byteorder == "little":
+        table = raw.cast("i")
+    else:
+        table = array("i", bytes(raw))
+        table.byteswap()
+
+    accepting = bytearray(num_states)
+    for i in range(num_states):
+        if bitmap[i >> 3] & (1 << (i & 7)):
+            accepting[i] = 1
+    columns = {sym: col for col, sym in enumerate(symbols)}
+    state_names = [""] + [f"D{i}" for i in range(num_states - 1)]
+    compiled = CompiledDFA(table, num_columns, columns, accepting, state_names)
+    compiled.buffer = buffer  # keep the backing buffer (e.g. mmap) alive
+    return compiled
+
+def dump_compiled(compiled: CompiledDFA, path: str) -> None:
+    with open(path, "wb") as f:
+        f.write(dumps_compiled(compiled))
+
+def load_compiled(path: str) -> CompiledDFA:
+    """Map `path` read-only and load the CompiledDFA stored in it."""
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return loads_compiled(mm)
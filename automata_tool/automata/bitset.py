@@ -0,0 +1,213 @@
+
+from typing import Dict, List, Set, Tuple
+
+from .nfa import NFA
+from .charset import split_labels, equivalence_classes, class_members, char_lookup
+
+class BitsetNFA:
+    """NFA execution mode with dense integer states and int bitmask state sets.
+
+    Bit ``i`` of a mask stands for ``state_names[i]``. The epsilon closure of
+    every state is computed once, and for every symbol the states that can
+    move on it are stored with the (already closed) mask they lead to, so one
+    simulation step is a handful of AND/OR operations on Python ints.
+
+    Character-class labels are split into disjoint atoms first (see
+    :func:`~automata_tool.automata.charset.split_labels`), and atoms that
+    move every state to the same place are then merged into one
+    equivalence class (``classes`` maps each atom to its class). So
+    ``alphabet`` and the keys of ``sources`` are classes and every input
+    character reads as at most one of them (``lookup``); ``members`` maps
+    each class back to its atoms.
+    """
+
+    def __init__(self, nfa: NFA) -> None:
+        self.nfa = nfa
+        names = set(nfa.states) | {nfa.initial_state}
+        for state, inner in nfa.transitions.items():
+            names.add(state)
+            for dests in inner.values():
+                names.update(dests)
+        self.state_names: List[str] = sorted(names)
+        index = {name: i for i, name in enumerate(self.state_names)}
+        self.index = index
+        atoms = split_labels(sym for sym in nfa.alphabet if sym is not None)
+
+        n = len(self.state_names)
+        eps: List[List[int]] = [[] for _ in range(n)]
+        for state, inner in nfa.transitions.items():
+            for dest in inner.get(NFA.EPSILON, ()):
+                eps[index[state]].append(index[dest])
+
+        self.closures: List[int] = epsilon_closures(eps)
+
+        # symbol -> [(source bit, closure of its destinations), ...]
+        sources: Dict[str, Dict[int, int]] = {}
+        for state, inner in nfa.transitions.items():
+            bit = 1 << index[state]
+            for symbol, dests in inner.items():
+                if symbol not in atoms or not dests:
+                    continue
+                target = 0
+                for dest in dests:
+                    target |= self.closures[index[dest]]
+                for atom in atoms[symbol]:
+                    per_symbol = sources.setdefault(atom, {})
+                    per_symbol[bit] = per_symbol.get(bit, 0) | target
+        self.classes = equivalence_classes(
+            {atom: frozenset(per_symbol.items()) for atom, per_symbol in sources.items()})
+        self.members: Dict[str, List[str]] = class_members(self.classes)
+        sources = {self.classes[atom]: per_symbol for atom, per_symbol in sources.items()}
+        self.alphabet = set(sources)
+        self.sources: Dict[str, List[Tuple[int, int]]] = {
+            symbol: list(per_symbol.items()) for symbol, per_symbol in sources.items()
+        }
+        # input character (or atom) -> its entry of `sources`
+        self.lookup = char_lookup(self.sources)
+        # state index -> [(symbol, closure of its destinations), ...]
+        self.out_moves: List[List[Tuple[str, int]]] = [[] for _ in range(n)]
+        for symbol, per_symbol in sources.items():
+            for bit, target in per_symbol.items():
+                self.out_moves[bit.bit_length() - 1].append((symbol, target))
+
+        self.start: int = self.closures[index[nfa.initial_state]]
+        self.final_mask = 0
+        for name in nfa.final_states:
+            if name in index:
+                self.final_mask |= 1 << index[name]
+
+    def __getstate__(self) -> dict:
+        # `lookup` is a closure, which cannot be pickled (e.g. to ship the
+        # matcher to worker processes): rebuild it from `sources`.
+        state = self.__dict__.copy()
+        del state["lookup"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.lookup = char_lookup(self.sources)
+
+    def step(self, mask: int, symbol: str) -> int:
+        """Closed set of states reachable from `mask` by reading `symbol`."""
+        result = 0
+        for bit, target in self.lookup(symbol) or ():
+            if mask & bit:
+                result |= target
+        return result
+
+    def moves(self, mask: int) -> Dict[str, int]:
+        """All non-empty steps out of `mask`, keyed by symbol.
+
+        Only the symbols that leave some state of `mask` are visited.
+        """
+        out_moves = self.out_moves
+        result: Dict[str, int] = {}
+        for i in set_bits(mask):
+            for symbol, target in out_moves[i]:
+                result[symbol] = result.get(symbol, 0) | target
+        return result
+
+    def is_final(self, mask: int) -> bool:
+        return bool(mask & self.final_mask)
+
+    def to_states(self, mask: int) -> Set[str]:
+        names = self.state_names
+        return {names[i] for i in set_bits(mask)}
+
+    def accepts(self, input_str: str) -> bool:
+        lookup = self.lookup
+        mask = self.start
+        for ch in input_str:
+            moves = lookup(ch)
+            if moves is None:
+                return False
+            nxt = 0
+            for bit, target in moves:
+                if mask & bit:
+                    nxt |= target
+            if not nxt:
+                return False
+            mask = nxt
+        return bool(mask & self.final_mask)
+
+def set_bits(mask: int) -> List[int]:
+    """Indexes of the bits set in `mask`, in increasing order."""
+    if mask.bit_length() <= 1024:
+        # Peeling off the lowest bit costs a pass over the whole int, which
+        # is cheap while it is a few machine words long.
+        result = []
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            result.append(low.bit_length() - 1)
+        return result
+    # Long masks: find the 1s in the binary string (least significant first).
+    digits = bin(mask)[:1:-1]
+    result = []
+    i = digits.find("1")
+    while i >= 0:
+        result.append(i)
+        i = digits.find("1", i + 1)
+    return result
+
+def epsilon_closures(eps: List[List[int]]) -> List[int]:
+    """Closure mask of every state, given each state's epsilon successors.
+
+    Each closure is built once from those of its successors,
+    ``closure[i] = bit_i | closure[j] | ...``, visiting the strongly
+    connected components of the epsilon graph in reverse topological order
+    (Tarjan's algorithm, iterative); the states of a cycle share one
+    closure. That is one OR per epsilon edge, where a search from every
+    state revisits the shared tails of long epsilon chains again and again.
+    """
+    n = len(eps)
+    order = [-1] * n          # visit number
+    low = [0] * n
+    on_stack = [False] * n
+    stack: List[int] = []
+    closures = [0] * n
+    counter = 0
+    for root in range(n):
+        if order[root] >= 0:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+        while work:
+            v, i = work[-1]
+            if i < len(eps[v]):
+                work[-1] = (v, i + 1)
+                w = eps[v][i]
+                if order[w] < 0:
+                    order[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, 0))
+                elif on_stack[w] and order[w] < low[v]:
+                    low[v] = order[w]
+                continue
+            work.pop()
+            if work and low[v] < low[work[-1][0]]:
+                low[work[-1][0]] = low[v]
+            if low[v] != order[v]:
+                continue
+            # v roots a component; every successor outside it is done.
+            members = []
+            while True:
+                w = stack.pop()
+                on_stack[w] = False
+                members.append(w)
+                if w == v:
+                    break
+            mask = 0
+            for w in members:
+                mask |= 1 << w
+                for x in eps[w]:
+                    mask |= closures[x]
+            for w in members:
+                closures[w] = mask
+    return closures
+
@@ -0,0 +1,286 @@
+
+import bisect
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+# Character classes are carried through every automaton as ordinary symbol
+# labels: a label of one character matches that character, and a label of
+# the form "[...]" (the canonical spelling produced by `class_label`)
+# matches every character of the class. Any other multi-character label is
+# an opaque symbol that no single character matches.
+
+MAX_CODE_POINT = 0x10FFFF
+
+Interval = Tuple[int, int]  # inclusive code point range
+Intervals = Tuple[Interval, ...]
+
+T = TypeVar("T")
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "f": "\f", "v": "\v", "0": "\0"}
+_HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+
+def normalize(intervals: Iterable[Interval]) -> Intervals:
+    """Sort and merge overlapping or adjacent intervals."""
+    merged: List[List[int]] = []
+    for lo, hi in sorted(intervals):
+        if merged and lo <= merged[-1][1] + 1:
+            if hi > merged[-1][1]:
+                merged[-1][1] = hi
+        else:
+            merged.append([lo, hi])
+    return tuple((lo, hi) for lo, hi in merged)
+
+def complement(intervals: Intervals) -> Intervals:
+    result: List[Interval] = []
+    nxt = 0
+    for lo, hi in intervals:
+        if lo > nxt:
+            result.append((nxt, lo - 1))
+        nxt = hi + 1
+    if nxt <= MAX_CODE_POINT:
+        result.append((nxt, MAX_CODE_POINT))
+    return tuple(result)
+
+def read_escape(text: str, pos: int) -> Tuple[str, int]:
+    """Decode the escape whose backslash is at `pos`; return (char, next pos)."""
+    if pos + 1 >= len(text):
+        raise SyntaxError("Escape incompleto al final de la expresión regular")
+    ch = text[pos + 1]
+    if ch in _HEX_ESCAPES:
+        digits = text[pos + 2:pos + 2 + _HEX_ESCAPES[ch]]
+        try:
+            if len(digits) != _HEX_ESCAPES[ch]:
+                raise ValueError
+            return chr(int(digits, 16)), pos + 2 + len(digits)
+        except ValueError:
+            raise SyntaxError(f"Escape inválido: \\{ch}{digits}") from None
+    return _ESCAPES.get(ch, ch), pos + 2
+
+def parse_class(text: str, pos: int) -> Tuple[Intervals, int]:
+    """Parse the class whose ``[`` is at `pos`; return (intervals, next pos).
+
+    Supports negation (``[^...]``), ranges (``a-z``) and backslash escapes;
+    ``-`` is literal at the start or end of the class, ``]`` must be
+    escaped.
+    """
+    i = pos + 1
+    negated = i < len(text) and text[i] == "^"
+    if negated:
+        i += 1
+    items: List[Interval] = []
+    while True:
+        if i >= len(text):
+            raise SyntaxError("Clase de caracteres sin cerrar: falta ']'")
+        ch = text[i]
+        if ch == "]":
+            i += 1
+            break
+        if ch == "\\":
+            lo, i = read_escape(text, i)
+        else:
+            lo, i = ch, i + 1
+        hi = lo
+        if i + 1 < len(text) and text[i] == "-" and text[i + 1] != "]":
+            if text[i + 1] == "\\":
+                hi, i = read_escape(text, i + 1)
+            else:
+                hi, i = text[i + 1], i + 2
+            if ord(hi) < ord(lo):
+                raise SyntaxError(f"Rango inválido en clase de caracteres: {lo}-{hi}")
+        items.append((ord(lo), ord(hi)))
+    intervals = normalize(items)
+    if negated:
+        intervals = complement(intervals)
+    return intervals, i
+
+def _render(cp: int) -> str:
+    ch = chr(cp)
+    if ch in "\\[]-^":
+        return "\\" + ch
+    for key, value in _ESCAPES.items():
+        if ch == value:
+            return "\\" + key
+    if ch.isprintable() and not ch.isspace() or ch == " ":
+        return ch
+    if cp < 0x100:
+        return f"\\x{cp:02x}"
+    if cp < 0x10000:
+        return f"\\u{cp:04x}"
+    return f"\\U{cp:08x}"
+
+def class_label(intervals: Intervals) -> str:
+    """Canonical label of a non-empty class (the character itself if it has one)."""
+    if not intervals:
+        raise ValueError("Una clase de caracteres no puede ser vacía")
+    if len(intervals) == 1 and intervals[0][0] == intervals[0][1]:
+        return chr(intervals[0][0])
+    negated = intervals[-1][1] == MAX_CODE_POINT
+    body = complement(intervals) if negated else intervals
+    parts = []
+    for lo, hi in body:
+        if lo == hi:
+            parts.append(_render(lo))
+        elif hi == lo + 1:
+            parts.append(_render(lo) + _render(hi))
+        else:
+            parts.append(f"{_render(lo)}-{_render(hi)}")
+    return "[" + ("^" if negated else "") + "".join(parts) + "]"
+
+# "." matches any character except a newline.
+DOT_LABEL = class_label(complement(((10, 10),)))
+
+def is_class_label(label: Optional[str]) -> bool:
+    return (label is not None and len(label) > 1
+            and label[0] == "[" and label[-1] == "]")
+
+@lru_cache(maxsize=4096)
+def label_intervals(label: str) -> Intervals:
+    if len(label) == 1:
+        cp = ord(label)
+        return ((cp, cp),)
+    if is_class_label(label):
+        intervals, end = parse_class(label, 0)
+        if end == len(label):
+            return intervals
+    return ()
+
+def label_contains(label: str, ch: str) -> bool:
+    if len(label) == 1:
+        return label == ch
+    intervals = label_intervals(label)
+    cp = ord(ch)
+    i = bisect.bisect_right(intervals, (cp, MAX_CODE_POINT)) - 1
+    return i >= 0 and intervals[i][0] <= cp <= intervals[i][1]
+
+def has_classes(labels: Iterable[Optional[str]]) -> bool:
+    return any(is_class_label(label) for label in labels)
+
+def split_labels(labels: Iterable[str]) -> Dict[str, List[str]]:
+    """Split possibly overlapping labels into disjoint atoms.
+
+    Returns, for every label, the labels of the atoms it is the union of:
+    characters covered by exactly the same labels fall in the same atom.
+    When no label is a class the labels are already disjoint and each one
+    maps to itself; opaque labels always map to themselves.
+    """
+    labels = [label for label in labels if label is not None]
+    if not has_classes(labels):
+        return {label: [label] for label in labels}
+    events: Dict[int, List[Tuple[int, str]]] = {}
+    result: Dict[str, List[str]] = {}
+    for label in labels:
+        intervals = label_intervals(label)
+        result[label] = [] if intervals else [label]
+        for lo, hi in intervals:
+            events.setdefault(lo, []).append((1, label))
+            events.setdefault(hi + 1, []).append((-1, label))
+    active: Dict[str, int] = {}
+    pieces: Dict[frozenset, List[Interval]] = {}
+    points = sorted(events)
+    for k, point in enumerate(points):
+        for delta, label in events[point]:
+            count = active.get(label, 0) + delta
+            if count:
+                active[label] = count
+            else:
+                active.pop(label, None)
+        if active and k + 1 < len(points):
+            pieces.setdefault(frozenset(active), []).append((point, points[k + 1] - 1))
+    for members, intervals in pieces.items():
+        atom = class_label(normalize(intervals))
+        for label in members:
+            result[label].append(atom)
+    return result
+
+def equivalence_classes(signatures: Dict[str, Hashable]) -> Dict[str, str]:
+    """Merge disjoint labels that behave the same into one class label each.
+
+    `signatures` maps every label to a description of all the transitions
+    it takes (e.g. the destination of each state); labels with equal
+    signatures are interchangeable and are replaced by the label of their
+    union. Returns label -> class label. Opaque labels are never merged.
+    """
+    result: Dict[str, str] = {}
+    groups: Dict[Hashable, List[str]] = {}
+    for label, signature in signatures.items():
+        if label_intervals(label):
+            groups.setdefault(signature, []).append(label)
+        else:
+            result[label] = label
+    for members in groups.values():
+        if len(members) == 1:
+            result[members[0]] = members[0]
+            continue
+        merged = class_label(normalize(iv for m in members for iv in label_intervals(m)))
+        for label in members:
+            result[label] = merged
+    return result
+
+def class_members(classes: Dict[str, str]) -> Dict[str, List[str]]:
+    """Invert the result of `equivalence_classes`: class label -> its labels."""
+    members: Dict[str, List[str]] = {}
+    for label in sorted(classes):
+        members.setdefault(classes[label], []).append(label)
+    return members
+
+class SymbolClassifier:
+    """Map a character to the label covering it among disjoint labels."""
+
+    def __init__(self, labels: Iterable[str]) -> None:
+        self.singles = set()
+        ranges: List[Tuple[int, int, str]] = []
+        for label in labels:
+            if label is None:
+                continue
+            if len(label) == 1:
+                self.singles.add(label)
+            else:
+                ranges.extend((lo, hi, label) for lo, hi in label_intervals(label))
+        ranges.sort()
+        self._starts = [lo for lo, _, _ in ranges]
+        self._ranges = ranges
+
+    def __call__(self, ch: str) -> Optional[str]:
+        if ch in self.singles:
+            return ch
+        cp = ord(ch)
+        i = bisect.bisect_right(self._starts, cp) - 1
+        if i >= 0 and cp <= self._ranges[i][1]:
+            return self._ranges[i][2]
+        return None
+
+def char_lookup(table: Dict[str, T], max_memo: int = 65536) -> Callable[[str], Optional[T]]:
+    """``table.get`` extended to single characters covered by class labels.
+
+    `table` is keyed by disjoint labels. Without class labels this is just
+    ``table.get``; otherwise the value of every character looked up is
+    memoized (up to `max_memo` characters).
+    """
+    if not has_classes(table):
+        return table.get
+    classify = SymbolClassifier(table)
+    memo: Dict[str, Optional[T]] = dict(table)
+    limit = len(memo) + max_memo
+
+    def lookup(ch: str) -> Optional[T]:
+        try:
+            return memo[ch]
+        except KeyError:
+            pass
+        label = classify(ch) if len(ch) == 1 else None
+        value = table.get(label) if label is not None else None
+        if len(memo) < limit:
+            memo[ch] = value
+        return value
+
+    return lookup
+
+def byte_lookup_table(table: Dict[str, T]) -> Dict[int, T]:
+    """Entries of `table` for the 256 bytes, byte b read as the character chr(b)."""
+    lookup = char_lookup(table)
+    result: Dict[int, T] = {}
+    for b in range(256):
+        value = lookup(chr(b))
+        if value is not None:
+            result[b] = value
+    return result
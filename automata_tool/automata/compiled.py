@@ -0,0 +1,194 @@
+
+import mmap
+from array import array
+from operator import length_hint
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from .dfa import DFA
+from .charset import (split_labels, equivalence_classes, char_lookup, byte_lookup_table,
+                      label_intervals, normalize, MAX_CODE_POINT)
+
+Input = Union[str, bytes, bytearray, memoryview, mmap.mmap]
+
+class CompiledDFA:
+    """DFA compiled to a flat integer transition table.
+
+    States are renumbered densely with 0 as an explicit dead state and 1 as
+    the initial state; symbols are mapped to column indexes. The table is a
+    row-major ``array('l')`` and states are stored as row offsets
+    (``index * num_columns``), so a step is one dict lookup for the column
+    plus one array index: ``state = table[state + column]``. Missing
+    transitions and unknown symbols lead to the dead state.
+
+    Columns are alphabet equivalence classes: symbols (character-class
+    labels split into disjoint atoms) whose column would be identical in
+    every state share one column, labelled by their union. ``lookup`` maps
+    an input character to its column (it is ``columns.get`` when no column
+    is a class), and ``byte_columns`` an input byte ``b`` to the column of
+    ``chr(b)``: bytes-like input is matched byte by byte, which is UTF-8
+    matching for a DFA built with ``AutomatonFactory(byte_mode=True)``.
+
+    Matching stops as soon as the answer is decided. Transitions into
+    states that cannot reach a final state are compiled as moves to the dead
+    state, and ``accept_rows`` (``byte_accept_rows`` for bytes-like input)
+    holds the accept-forever rows: accepting rows whose every character
+    leads back into the set, so that any continuation is accepted. They are
+    only found when the columns cover every character (every byte).
+    """
+
+    DEAD = 0
+
+    def __init__(self, table: array, num_columns: int, columns: Dict[str, int],
+                 accepting: bytearray, state_names: List[str]) -> None:
+        self.table = table
+        self.num_columns = num_columns
+        self.columns = columns
+        self.accepting = accepting          # indexed by dense state number
+        self.state_names = state_names      # dense state number -> DFA name
+        self.start = num_columns            # row offset of state 1
+        self.final_rows = frozenset(i * num_columns
+                                    for i, acc in enumerate(accepting) if acc)
+        # Backing buffer (e.g. an mmap) when loaded from the binary format
+        self.buffer: Optional[object] = None
+        self._init_lookups()
+
+    def _init_lookups(self) -> None:
+        self.lookup = char_lookup(self.columns)
+        # Column lookup for bytes-like input: byte b reads as the symbol chr(b).
+        self.byte_columns: Dict[int, int] = byte_lookup_table(self.columns)
+        covered = normalize(iv for symbol in self.columns for iv in label_intervals(symbol))
+        self.accept_rows = (self._accept_forever(self.columns.values())
+                            if covered == ((0, MAX_CODE_POINT),) else frozenset())
+        self.byte_accept_rows = (self._accept_forever(self.byte_columns.values())
+                                 if len(self.byte_columns) == 256 else frozenset())
+
+    def _accept_forever(self, columns: Iterable[int]) -> FrozenSet[int]:
+        """Greatest set of accepting rows that `columns` never lead out of."""
+        table = self.table
+        columns = sorted(set(columns))
+        rows = set(self.final_rows)
+        changed = True
+        while changed:
+            changed = False
+            for row in list(rows):
+                if any(table[row + col] not in rows for col in columns):
+                    rows.discard(row)
+                    changed = True
+        return frozenset(rows)
+
+    @classmethod
+    def from_dfa(cls, dfa: DFA) -> "CompiledDFA":
+        atoms = split_labels(dfa.alphabet)
+        dead = dfa.dead_states()
+        others = sorted(s for s in dfa.states if s != dfa.initial_state)
+        state_names = [""] + [dfa.initial_state] + others
+        number = {name: i for i, name in enumerate(state_names) if i}
+
+        # Destination of every state on every atom, then one column per class
+        by_atom: Dict[str, Dict[int, int]] = {
+            atom: {} for parts in atoms.values() for atom in parts}
+        for name, inner in dfa.transitions.items():
+            if name not in number:
+                continue
+            src = number[name]
+            # Classes first, so that a single-character label overlapping a
+            # class (only possible in hand-written DFAs) takes precedence.
+            for symbol, dest in sorted(inner.items(), key=lambda kv: len(kv[0]) == 1):
+                if dest not in number or dest in dead:
+                    continue
+                for atom in atoms.get(symbol, ()):
+                    by_atom[atom][src] = number[dest]
+        classes = equivalence_classes(
+            {atom: frozenset(moves.items()) for atom, moves in by_atom.items()})
+        symbols = sorted(set(classes.values()))
+        columns = {sym: i for i, sym in enumerate(symbols)}
+        # Keep at least one column so that every state has a distinct offset.
+        num_columns = max(1, len(symbols))
+
+        table = array("l", [0]) * (num_columns * len(state_names))
+        for atom, moves in by_atom.items():
+            col = columns[classes[atom]]
+            for src, dest in moves.items():
+                table[src * num_columns + col] = dest * num_columns
+
+        accepting = bytearray(len(state_names))
+        for name in dfa.final_states:
+            if name in number:
+                accepting[number[name]] = 1
+        return cls(table, num_columns, columns, accepting, state_names)
+
+    def __getstate__(self) -> dict:
+        # A table loaded from the binary format is a view over an mmap, which
+        # cannot be pickled (e.g. to ship it to worker processes): copy it.
+        state = self.__dict__.copy()
+        if not isinstance(self.table, array):
+            state["table"] = array("l", self.table)
+        state["buffer"] = None
+        del state["lookup"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.lookup = char_lookup(self.columns)
+
+    @property
+    def num_states(self) -> int:
+        """Number of states, including the dead state."""
+        return len(self.state_names)
+
+    def accepts(self, input_str: Input) -> bool:
+        return self.scan(input_str)[0] in self.final_rows
+
+    def decide(self, input_str: Input) -> Tuple[bool, int]:
+        """Whether `input_str` is accepted, and how much of it was read to know."""
+        state, read = self.scan(input_str)
+        return state in self.final_rows, read
+
+    def scan(self, data: Input, state: Optional[int] = None) -> Tuple[int, int]:
+        """Step from `state` (the start row by default) through `data`.
+
+        Returns the row reached and the number of characters (bytes for
+        bytes-like data) read, which is less than ``len(data)`` when the
+        dead state or an accept-forever row was reached before the end.
+        """
+        if isinstance(data, mmap.mmap):
+            # Iterating an mmap yields 1-byte strings; a view yields ints.
+            with memoryview(data) as view:
+                return self.scan(view, state)
+        if state is None:
+            state = self.start
+        if isinstance(data, str):
+            lookup, forever = self.lookup, self.accept_rows
+        else:
+            lookup, forever = self.byte_columns.get, self.byte_accept_rows
+        if not state or state in forever:
+            return state, 0
+        table = self.table
+        if isinstance(data, memoryview):
+            # A memoryview iterator has no length hint: count the items read.
+            for i, ch in enumerate(data):
+                col = lookup(ch)
+                state = table[state + col] if col is not None else self.DEAD
+                if not state or state in forever:
+                    return state, i + 1
+            return state, len(data)
+        items = iter(data)
+        if forever:
+            for ch in items:
+                col = lookup(ch)
+                if col is None:
+                    state = self.DEAD
+                    break
+                state = table[state + col]
+                if not state or state in forever:
+                    break
+        else:
+            for ch in items:
+                col = lookup(ch)
+                if col is None:
+                    state = self.DEAD
+                    break
+                state = table[state + col]
+                if not state:
+                    break
+        return state, len(data) - length_hint(items)
@@ -1,25 +1,98 @@
 
-from typing import Dict, Set
+from operator import length_hint
+from typing import Dict, Optional, Set, Tuple
 from .base import Automaton
+from .charset import (has_classes, is_class_label, label_contains, label_intervals,
+                      normalize, MAX_CODE_POINT)
 
 class DFA(Automaton):
-    """Deterministic finite automaton."""
+    """Deterministic finite automaton.
+
+    :meth:`decide` stops reading as soon as the answer is known: in a dead
+    state (no final state reachable) or an accept-forever state (final, and
+    every character leads to another such state). Both sets, with whether
+    the alphabet has class labels, are computed on first use and cached, so
+    the transitions should not be changed after that.
+    """
 
     def __init__(self, states: Set[str], alphabet: Set[str],
                  initial_state: str, final_states: Set[str],
                  transitions: Dict[str, Dict[str, str]]) -> None:
         super().__init__(states, alphabet, initial_state, final_states)
         self.transitions = transitions  # state -> symbol -> state
+        # (dead, accept-forever, their union, alphabet has classes)
+        self._stop_states: Optional[Tuple[Set[str], Set[str], Set[str], bool]] = None
+
+    def dead_states(self) -> Set[str]:
+        """States from which no final state can be reached."""
+        return self._stops()[0]
+
+    def accept_forever_states(self) -> Set[str]:
+        """Final states from which every continuation is accepted."""
+        return self._stops()[1]
+
+    def _stops(self) -> Tuple[Set[str], Set[str], Set[str], bool]:
+        if self._stop_states is None:
+            dead, forever = self._find_dead(), self._find_accept_forever()
+            self._stop_states = (dead, forever, dead | forever, has_classes(self.alphabet))
+        return self._stop_states
+
+    def _find_dead(self) -> Set[str]:
+        predecessors: Dict[str, Set[str]] = {}
+        for state, inner in self.transitions.items():
+            for dest in inner.values():
+                predecessors.setdefault(dest, set()).add(state)
+        live = set(self.final_states)
+        stack = list(live)
+        while stack:
+            for pred in predecessors.get(stack.pop(), ()):
+                if pred not in live:
+                    live.add(pred)
+                    stack.append(pred)
+        return (set(self.states) | set(self.transitions)) - live
+
+    def _find_accept_forever(self) -> Set[str]:
+        # Greatest fixpoint: start from the final states whose labels cover
+        # every character, then drop those with an edge leaving the set.
+        full = ((0, MAX_CODE_POINT),)
+        candidates = {state for state in self.final_states
+                      if normalize(iv for label in self.transitions.get(state, {})
+                                   for iv in label_intervals(label)) == full}
+        changed = True
+        while changed:
+            changed = False
+            for state in list(candidates):
+                if any(dest not in candidates
+                       for label, dest in self.transitions[state].items()
+                       if label_intervals(label)):
+                    candidates.discard(state)
+                    changed = True
+        return candidates
 
     def transition(self, state: str, symbol: str):
         return self.transitions.get(state, {}).get(symbol)
 
+    def class_transition(self, state: str, ch: str):
+        """Target of the character-class edge of `state` that contains `ch`."""
+        for label, dest in self.transitions.get(state, {}).items():
+            if is_class_label(label) and label_contains(label, ch):
+                return dest
+        return None
+
     def accepts(self, input_str: str) -> bool:
+        return self.decide(input_str)[0]
+
+    def decide(self, input_str: str) -> Tuple[bool, int]:
+        """Whether `input_str` is accepted, and how many characters were read to know."""
         current = self.initial_state
-        for ch in input_str:
-            if ch not in self.alphabet:
-                return False
-            current = self.transition(current, ch)
-            if current is None:
-                return False
-        return current in self.final_states
+        _, _, stops, classes = self._stops()
+        items = iter(input_str)
+        if current not in stops:
+            for ch in items:
+                nxt = self.transition(current, ch) if ch in self.alphabet else None
+                if nxt is None and classes:
+                    nxt = self.class_transition(current, ch)
+                current = nxt
+                if current is None or current in stops:
+                    break
+        return current in self.final_states, len(input_str) - length_hint(items)
@@ -0,0 +1,95 @@
+
+from typing import Dict, Optional
+
+from .nfa import NFA
+from .bitset import BitsetNFA
+
+DEFAULT_MAX_STATES = 4096
+
+class _LazyState:
+    __slots__ = ("mask", "final", "next")
+
+    def __init__(self, mask: int, final: bool) -> None:
+        self.mask = mask
+        self.final = final
+        self.next: Dict[str, "_LazyState"] = {}
+
+class LazyDFA:
+    """DFA whose states are built from an NFA only when input reaches them.
+
+    Each DFA state (an epsilon-closed set of NFA states, kept as a
+    :class:`BitsetNFA` bitmask) is created on the
+    first transition that needs it and memoized together with its outgoing
+    edges, so repeated inputs run at DFA speed. When the cache holds
+    ``max_states`` states it is flushed and rebuilt from the current state
+    on, which keeps memory bounded no matter how large the full DFA would be
+    while each input character still costs O(1) amortized cache work plus at
+    most one NFA step.
+    """
+
+    def __init__(self, nfa: NFA, max_states: int = DEFAULT_MAX_STATES) -> None:
+        if max_states < 2:
+            raise ValueError("max_states debe ser al menos 2")
+        self.nfa = nfa
+        self.bits = BitsetNFA(nfa)
+        self.max_states = max_states
+        self.alphabet = self.bits.alphabet
+        self._dead = _LazyState(0, False)
+        self._states: Dict[int, _LazyState] = {}
+        self._start: Optional[_LazyState] = None
+        self.states_built = 0
+        self.flushes = 0
+
+    @property
+    def cached_states(self) -> int:
+        return len(self._states)
+
+    def flush(self) -> None:
+        """Drop every cached state (the next input rebuilds what it needs)."""
+        self._states = {}
+        self._start = None
+        self.flushes += 1
+
+    def _intern(self, mask: int) -> _LazyState:
+        state = self._states.get(mask)
+        if state is None:
+            state = _LazyState(mask, self.bits.is_final(mask))
+            self._states[mask] = state
+            self.states_built += 1
+        return state
+
+    def _start_state(self) -> _LazyState:
+        if self._start is None:
+            if len(self._states) >= self.max_states:
+                self.flush()
+            self._start = self._intern(self.bits.start)
+        return self._start
+
+    def _step(self, state: _LazyState, symbol: str) -> _LazyState:
+        """Compute (and cache) the transition that was missing from `state`."""
+        target_mask = self.bits.step(state.mask, symbol)
+        if not target_mask:
+            state.next[symbol] = self._dead
+            return self._dead
+        target = self._states.get(target_mask)
+        if target is None:
+            if len(self._states) >= self.max_states:
+                self.flush()
+                # Re-enter the current state in the fresh cache so the edge
+                # we are about to record is not attached to a dropped state.
+                state = self._intern(state.mask)
+            target = self._intern(target_mask)
+        state.next[symbol] = target
+        return target
+
+    def accepts(self, input_str: str) -> bool:
+        dead = self._dead
+        state = self._start_state()
+        for ch in input_str:
+            nxt = state.next.get(ch)
+            if nxt is None:
+                nxt = self._step(state, ch)
+            if nxt is dead:
+                return False
+            state = nxt
+        return state.final
@@ -1,6 +1,7 @@
 
 from typing import Dict, Set, Optional
 from .base import Automaton
+from .charset import is_class_label, label_contains
 
 Symbol = Optional[str]  # None will represent epsilon
 
@@ -41,10 +42,17 @@ class NFA(Automaton):
     def accepts(self, input_str: str) -> bool:
         """Simulate NFA on the given input string."""
         current_states = self.epsilon_closure({self.initial_state})
+        classes = [sym for sym in self.alphabet if is_class_label(sym)]
         for ch in input_str:
-            if ch not in self.alphabet:
+            # Every label that reads `ch`: the character itself and the classes containing it
+            labels = [ch] if ch in self.alphabet else []
+            labels.extend(c for c in classes if label_contains(c, ch))
+            if not labels:
                 return False
-            current_states = self.epsilon_closure(self.move(current_states, ch))
+            moved: Set[str] = set()
+            for label in labels:
+                moved |= self.move(current_states, label)
+            current_states = self.epsilon_closure(moved)
             if not current_states:
                 return False
         return any(s in self.final_states for s in current_states)
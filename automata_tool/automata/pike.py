@@ -0,0 +1,138 @@
+
+from dataclasses import dataclass, field
+from typing import FrozenSet, List, Optional, Tuple
+
+from .charset import split_labels, char_lookup
+
+# Instruction opcodes of a PikeProgram
+CHAR = 0   # read a character contained in `args[pc]`, go to `xs[pc]`
+SPLIT = 1  # go to `xs[pc]` (preferred) and to `ys[pc]`
+JMP = 2    # go to `xs[pc]`
+SAVE = 3   # record the current input position in slot `args[pc]`, go to `xs[pc]`
+MATCH = 4
+
+Span = Tuple[int, int]
+
+@dataclass
+class PikeProgram:
+    """Thompson NFA of a regex as a flat instruction list.
+
+    Instruction ``pc`` is ``ops[pc]`` with operand ``args[pc]`` (a label
+    for CHAR, a capture slot for SAVE) and successors ``xs[pc]`` /
+    ``ys[pc]``. Group ``k`` (0 is the whole match) saves its start in slot
+    ``2k`` and its end in slot ``2k + 1``. SPLIT successors are ordered:
+    ``xs`` is the branch a backtracking engine would try first.
+    """
+
+    ops: List[int] = field(default_factory=list)
+    args: List[object] = field(default_factory=list)
+    xs: List[Optional[int]] = field(default_factory=list)
+    ys: List[Optional[int]] = field(default_factory=list)
+    start: int = 0
+    num_groups: int = 0
+
+    def emit(self, op: int, arg: object = None, x: Optional[int] = None,
+             y: Optional[int] = None) -> int:
+        self.ops.append(op)
+        self.args.append(arg)
+        self.xs.append(x)
+        self.ys.append(y)
+        return len(self.ops) - 1
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+class PikeVM:
+    """Pike's NFA simulation with capture slots.
+
+    All threads advance in lockstep over the input, one list per position,
+    in priority order; a thread reaching an instruction already taken at
+    this position is dropped, since a higher-priority thread got there
+    first with the captures that win. Each character costs at most one
+    visit per instruction, so matching is O(len(text) * len(program)) (times
+    the number of slots copied on SAVE) whatever the pattern: no
+    backtracking blow-up. Submatches follow the leftmost-first rules of
+    Python's ``re``: the highest-priority path wins and a group repeated
+    several times reports its last iteration. The one difference is a loop
+    whose body can match the empty string, as in ``(a*)*``: ``re`` may run
+    one more, empty, iteration and report it, while here a loop never
+    re-enters itself without reading a character.
+
+    Character-class labels are split into disjoint atoms, so every input
+    character is looked up once per step (``lookup``) and each CHAR
+    instruction tests membership of that atom.
+    """
+
+    def __init__(self, program: PikeProgram) -> None:
+        self.program = program
+        labels = {arg for op, arg in zip(program.ops, program.args) if op == CHAR}
+        atoms = split_labels(labels)
+        self.lookup = char_lookup({atom: atom for parts in atoms.values() for atom in parts})
+        self._reads: List[FrozenSet[str]] = [
+            frozenset(atoms[arg]) if op == CHAR else frozenset()
+            for op, arg in zip(program.ops, program.args)]
+
+    @property
+    def num_groups(self) -> int:
+        return self.program.num_groups
+
+    def match(self, text: str) -> Optional[List[Optional[Span]]]:
+        """Spans of the whole match and of each group if `text` matches entirely.
+
+        Returns None when `text` does not match; otherwise a list whose item
+        ``k`` is the ``(start, end)`` of group ``k`` (item 0 is
+        ``(0, len(text))``), or None for a group that took no part.
+        """
+        program = self.program
+        ops, xs, reads = program.ops, program.xs, self._reads
+        lookup = self.lookup
+        marks = [-1] * len(program)
+        threads = self._follow(program.start, (None,) * (2 * program.num_groups + 2), 0, marks)
+        for i, ch in enumerate(text):
+            if not threads:
+                return None
+            atom = lookup(ch)
+            step: List[Tuple[int, tuple]] = []
+            if atom is not None:
+                for pc, slots in threads:
+                    if ops[pc] == CHAR and atom in reads[pc]:
+                        step.extend(self._follow(xs[pc], slots, i + 1, marks))
+            threads = step
+        for pc, slots in threads:
+            if ops[pc] == MATCH:
+                return [(slots[k], slots[k + 1]) if slots[k] is not None and slots[k + 1] is not None
+                        else None for k in range(0, len(slots), 2)]
+        return None
+
+    def accepts(self, text: str) -> bool:
+        return self.match(text) is not None
+
+    def _follow(self, pc: int, slots: tuple, pos: int,
+                marks: List[int]) -> List[Tuple[int, tuple]]:
+        """Threads reached from `pc` without reading, in priority order.
+
+        Only CHAR and MATCH instructions are returned; `marks[pc] == pos`
+        records the instructions already reached at input position `pos`.
+        """
+        program = self.program
+        ops, args, xs, ys = program.ops, program.args, program.xs, program.ys
+        found: List[Tuple[int, tuple]] = []
+        stack = [(pc, slots)]
+        while stack:
+            pc, slots = stack.pop()
+            if marks[pc] == pos:
+                continue
+            marks[pc] = pos
+            op = ops[pc]
+            if op == SPLIT:
+                stack.append((ys[pc], slots))
+                stack.append((xs[pc], slots))
+            elif op == JMP:
+                stack.append((xs[pc], slots))
+            elif op == SAVE:
+                saved = list(slots)
+                saved[args[pc]] = pos
+                stack.append((xs[pc], tuple(saved)))
+            else:
+                found.append((pc, slots))
+        return found
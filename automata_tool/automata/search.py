@@ -0,0 +1,115 @@
+
+import mmap
+from typing import Iterator, List, Tuple, Union
+
+from .dfa import DFA
+from .compiled import CompiledDFA
+
+Span = Tuple[int, int]
+Searchable = Union[str, bytes, bytearray, memoryview, mmap.mmap]
+
+class DFASearcher:
+    """Find every occurrence of a DFA's language inside a larger text.
+
+    The scan runs the unanchored automaton Σ*R as a set of "threads": a
+    thread is started at each position and all live threads are stepped
+    together through the compiled DFA table, keeping per DFA state only the
+    thread with the earliest start. Matches are reported leftmost-longest
+    and non-overlapping, as ``(start, end)`` spans; empty matches are not
+    reported. Positions that cannot start a match are skipped without
+    starting a thread.
+
+    ``str`` inputs are indexed by character. ``bytes``, ``bytearray``,
+    ``memoryview`` and ``mmap`` inputs are read one byte at a time without
+    copying, each byte being looked up as the character with the same code
+    point (Latin-1), and the spans are byte offsets.
+
+    When the earliest thread reaches an accept-forever row of the compiled
+    DFA (``accept_rows``), its match runs to the end of the text and the
+    scan stops there instead of stepping the remaining input.
+    """
+
+    def __init__(self, compiled: CompiledDFA) -> None:
+        self.compiled = compiled
+
+    @classmethod
+    def from_dfa(cls, dfa: DFA) -> "DFASearcher":
+        return cls(CompiledDFA.from_dfa(dfa))
+
+    def finditer(self, text: Searchable, pos: int = 0) -> Iterator[Span]:
+        compiled = self.compiled
+        table = compiled.table
+        start_state = compiled.start
+        finals = compiled.final_rows
+        if isinstance(text, str):
+            lookup, forever = compiled.lookup, compiled.accept_rows
+        else:
+            lookup, forever = compiled.byte_columns.get, compiled.byte_accept_rows
+        n = len(text)
+
+        while pos < n:
+            # Skip positions where no match can start.
+            while pos < n:
+                col = lookup(text[pos])
+                if col is not None and table[start_state + col]:
+                    break
+                pos += 1
+            if pos >= n:
+                return
+
+            threads: List[Tuple[int, int]] = []   # (state, start), by start
+            best_start = best_end = -1
+            i = pos
+            while i < n:
+                if best_start < 0:
+                    threads.append((start_state, i))
+                col = lookup(text[i])
+                i += 1
+                if col is None:
+                    threads = []
+                else:
+                    stepped: List[Tuple[int, int]] = []
+                    seen = set()
+                    for state, start in threads:
+                        nxt = table[state + col]
+                        if nxt and nxt not in seen:
+                            seen.add(nxt)
+                            stepped.append((nxt, start))
+                    threads = stepped
+                    # Threads are ordered by start: the first final one is
+                    # the leftmost match ending here.
+                    for state, start in threads:
+                        if state in finals:
+                            if best_start < 0 or start <= best_start:
+                                best_start, best_end = start, i
+                            break
+                    if threads and threads[0][0] in forever:
+                        # The leftmost match can only end at the end of the text.
+                        best_start, best_end = threads[0][1], n
+                        break
+                if best_start >= 0:
+                    threads = [t for t in threads if t[1] <= best_start]
+                    if not threads:
+                        break
+                elif not threads:
+                    break
+
+            if best_start < 0:
+                pos = i
+                continue
+            yield best_start, best_end
+            pos = best_end
+
+    def findall(self, text: Searchable) -> List[Span]:
+        return list(self.finditer(text))
+
+    def search_file(self, path: str) -> Iterator[Span]:
+        """Scan a file through ``mmap`` without loading it into memory."""
+        with open(path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped and contain no matches.
+                return
+            with mm:
+                yield from self.finditer(mm)
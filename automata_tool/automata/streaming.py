@@ -0,0 +1,84 @@
+
+from typing import Optional, Tuple, Union
+
+from .bitset import BitsetNFA
+from .compiled import CompiledDFA
+from .charset import byte_lookup_table
+
+Chunk = Union[str, bytes, bytearray, memoryview]
+
+class StreamMatcher:
+    """Resumable whole-input matcher that is fed the input in chunks.
+
+    Only the current state (a row offset of a :class:`CompiledDFA`, or the
+    state bitmask of a :class:`BitsetNFA`) is carried between chunks, and
+    ``feed`` allocates nothing besides the chunk it is given. Text chunks
+    are read per character; bytes-like chunks per byte, with byte ``b``
+    read as the symbol ``chr(b)``. Once no continuation can be accepted
+    (:meth:`is_dead`) further chunks are ignored. The same holds with a
+    :class:`CompiledDFA` in an accept-forever row, where every continuation
+    is accepted (see ``CompiledDFA.scan``). Either way ``decided_at`` is the
+    stream offset, in characters or bytes, at which the answer was decided.
+    """
+
+    def __init__(self, automaton: Union[CompiledDFA, BitsetNFA]) -> None:
+        if not isinstance(automaton, (CompiledDFA, BitsetNFA)):
+            raise TypeError("StreamMatcher necesita un CompiledDFA o un BitsetNFA")
+        self.automaton = automaton
+        self._is_dfa = isinstance(automaton, CompiledDFA)
+        if not self._is_dfa:
+            self._byte_sources = byte_lookup_table(automaton.sources)
+        self.state = automaton.start
+        self.consumed = 0
+        self.decided_at: Optional[int] = None
+
+    def reset(self) -> None:
+        self.state = self.automaton.start
+        self.consumed = 0
+        self.decided_at = None
+
+    def is_dead(self) -> bool:
+        return not self.state
+
+    def is_accepting(self) -> bool:
+        if self._is_dfa:
+            return self.state in self.automaton.final_rows
+        return self.automaton.is_final(self.state)
+
+    def is_decided(self) -> bool:
+        """True once further input can no longer change the answer."""
+        return self.decided_at is not None
+
+    def feed(self, chunk: Chunk) -> None:
+        state = self.state
+        if state:
+            if self._is_dfa:
+                state, read = self.automaton.scan(chunk, state)
+            else:
+                state, read = self._feed_nfa(state, chunk)
+            if self.decided_at is None and (not state or self._accepts_forever(state, chunk)):
+                self.decided_at = self.consumed + read
+            self.state = state
+        self.consumed += len(chunk)
+
+    def _accepts_forever(self, state: int, chunk: Chunk) -> bool:
+        if not self._is_dfa:
+            return False
+        compiled = self.automaton
+        return state in (compiled.accept_rows if isinstance(chunk, str)
+                         else compiled.byte_accept_rows)
+
+    def _feed_nfa(self, mask: int, chunk: Chunk) -> Tuple[int, int]:
+        lookup = self.automaton.lookup if isinstance(chunk, str) else self._byte_sources.get
+        for i, ch in enumerate(chunk):
+            moves = lookup(ch)
+            if moves is None:
+                return 0, i + 1
+            nxt = 0
+            for bit, target in moves:
+                if mask & bit:
+                    nxt |= target
+            if not nxt:
+                return 0, i + 1
+            mask = nxt
+        return mask, len(chunk)
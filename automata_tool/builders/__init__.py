@@ -1,5 +1,31 @@
+from importlib import import_module
 
 from .thompson import ThompsonBuilder
-from .subset import SubsetConstruction
+from .subset import SubsetConstruction, StateExplosionError
 
-__all__ = ["ThompsonBuilder", "SubsetConstruction"]
+# The other builders are imported on first access (see automata_tool.core).
+_LAZY = {
+    "GlushkovBuilder": ".glushkov",
+    "HopcroftMinimizer": ".minimize",
+    "DirectDFABuilder": ".direct",
+    "DafsaBuilder": ".dafsa",
+    "PikeCompiler": ".pike",
+}
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(import_module(module, __name__), name)
+    return value
+
+__all__ = [
+    "ThompsonBuilder",
+    "GlushkovBuilder",
+    "SubsetConstruction",
+    "StateExplosionError",
+    "HopcroftMinimizer",
+    "DirectDFABuilder",
+    "DafsaBuilder",
+    "PikeCompiler",
+]
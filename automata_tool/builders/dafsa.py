@@ -0,0 +1,99 @@
+
+from typing import Dict, Iterable, List, Set, Tuple
+
+from automata_tool.automata.dfa import DFA
+
+class DafsaBuilder:
+    """Build the minimal acyclic DFA of a finite set of keywords.
+
+    Uses Daciuk et al.'s incremental construction for sorted input: words
+    are added in lexicographic order as a trie branch hanging off the
+    common prefix with the previous word, and the previous word's suffix
+    below that prefix can no longer change, so it is minimized right away by
+    looking each node up in a register of (final, edges) signatures. Only
+    that one unminimized path is ever kept, so time and memory grow with
+    the total keyword length (plus the sort) instead of going through a
+    ``kw1|kw2|...`` NFA and subset construction.
+
+    Every keyword character is a one-character literal label. States are
+    named "D0" (the start), "D1", ... in breadth-first order. ``stats``
+    holds the number of distinct keywords and their total length.
+    """
+
+    def __init__(self) -> None:
+        self.stats: Dict[str, int] = {}
+
+    def build(self, keywords: Iterable[str]) -> DFA:
+        words = sorted(set(keywords))
+        # Node 0 is the root; edges[i] maps a character to a node id.
+        edges: List[Dict[str, int]] = [{}]
+        final: List[bool] = [False]
+        free: List[int] = []
+        register: Dict[Tuple[bool, Tuple[Tuple[str, int], ...]], int] = {}
+        path: List[int] = [0]  # nodes along the previous word
+        previous = ""
+
+        def new_node() -> int:
+            if free:
+                node = free.pop()
+                edges[node] = {}
+                final[node] = False
+                return node
+            edges.append({})
+            final.append(False)
+            return len(edges) - 1
+
+        def minimize_down_to(depth: int) -> None:
+            # Replace the nodes of `path` below `depth` by registered equivalents.
+            for i in range(len(path) - 1, depth, -1):
+                node = path[i]
+                signature = (final[node], tuple(sorted(edges[node].items())))
+                existing = register.get(signature)
+                if existing is None:
+                    register[signature] = node
+                else:
+                    edges[path[i - 1]][previous[i - 1]] = existing
+                    free.append(node)
+            del path[depth + 1:]
+
+        total_length = 0
+        for word in words:
+            total_length += len(word)
+            prefix = 0
+            limit = min(len(word), len(previous))
+            while prefix < limit and word[prefix] == previous[prefix]:
+                prefix += 1
+            minimize_down_to(prefix)
+            node = path[-1]
+            for ch in word[prefix:]:
+                child = new_node()
+                edges[node][ch] = child
+                path.append(child)
+                node = child
+            final[node] = True
+            previous = word
+        minimize_down_to(0)
+
+        self.stats = {"keywords": len(words), "total_length": total_length}
+        return self._to_dfa(edges, final)
+
+    @staticmethod
+    def _to_dfa(edges: List[Dict[str, int]], final: List[bool]) -> DFA:
+        names: Dict[int, str] = {0: "D0"}
+        order = [0]
+        transitions: Dict[str, Dict[str, str]] = {}
+        alphabet: Set[str] = set()
+        for node in order:
+            inner = transitions[names[node]] = {}
+            for ch, child in edges[node].items():
+                name = names.get(child)
+                if name is None:
+                    name = names[child] = f"D{len(names)}"
+                    order.append(child)
+                inner[ch] = name
+                alphabet.add(ch)
+        return DFA(states=set(names.values()),
+                   alphabet=alphabet,
+                   initial_state="D0",
+                   final_states={names[node] for node in order if final[node]},
+                   transitions=transitions)
@@ -0,0 +1,116 @@
+
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set
+
+from automata_tool.regex.ast import RegexNode
+from automata_tool.automata.dfa import DFA
+from automata_tool.automata.charset import split_labels, equivalence_classes, class_members
+from .positions import analyze_positions
+from .subset import StateExplosionError
+
+class DirectDFABuilder:
+    """Build a DFA straight from a Regex AST with followpos (no NFA).
+
+    DFA states are sets of regex positions (see
+    :func:`~automata_tool.builders.positions.analyze_positions`), kept as
+    int bitmasks; position 0 stands for "nothing read yet" and leads to the
+    ``first`` positions. Reading a symbol from a set of positions leads to
+    the positions that can follow one of them and whose label contains the
+    symbol, so no epsilon closure is ever computed. Labels are split into
+    disjoint atoms, and atoms read by exactly the same positions are merged
+    into one alphabet class while building; as in :class:`SubsetConstruction`
+    the DFA itself is spelled with the atoms.
+
+    States are named "D0", "D1", ... in breadth-first order, and
+    ``max_states`` / ``max_time`` raise :class:`StateExplosionError` like the
+    subset construction. ``stats`` holds the same work counters.
+    """
+
+    def __init__(self, max_states: Optional[int] = None,
+                 max_time: Optional[float] = None) -> None:
+        self.max_states = max_states
+        self.max_time = max_time
+        self.stats: Dict[str, int] = {}
+
+    def build(self, root: RegexNode) -> DFA:
+        started = time.perf_counter()
+        info = analyze_positions(root)
+        n = info.num_positions
+
+        # follow_masks[p]: positions that may come after p (p = 0: first)
+        follow_masks: List[int] = [info.first] + info.follow[1:]
+        last_mask = info.last
+
+        # position -> alphabet classes of its label
+        atoms = split_labels(set(info.symbols[1:]))
+        readers: Dict[str, Set[int]] = {}
+        for p in range(1, n + 1):
+            for atom in atoms[info.symbols[p]]:
+                readers.setdefault(atom, set()).add(p)
+        classes = equivalence_classes({atom: frozenset(ps) for atom, ps in readers.items()})
+        pos_classes: List[List[str]] = [[]] + [
+            sorted({classes[atom] for atom in atoms[info.symbols[p]]}) for p in range(1, n + 1)]
+        members = class_members(classes)
+
+        budgeted = self.max_states is not None or self.max_time is not None
+        start = 1  # the set {0}
+        state_map: Dict[int, str] = {start: "D0"}
+        dfa_transitions: Dict[str, Dict[str, str]] = {}
+        dfa_final_states: Set[str] = set()
+        queue: Deque[int] = deque([start])
+        worklist_peak = 1
+
+        while queue:
+            current = queue.popleft()
+            current_name = state_map[current]
+            inner = dfa_transitions[current_name] = {}
+            if current & last_mask or (current & 1 and info.nullable):
+                dfa_final_states.add(current_name)
+
+            follow = 0
+            mask = current
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                follow |= follow_masks[low.bit_length() - 1]
+
+            moves: Dict[str, int] = {}
+            while follow:
+                low = follow & -follow
+                follow ^= low
+                for cls in pos_classes[low.bit_length() - 1]:
+                    moves[cls] = moves.get(cls, 0) | low
+
+            for cls, nxt in moves.items():
+                next_name = state_map.get(nxt)
+                if next_name is None:
+                    next_name = state_map[nxt] = f"D{len(state_map)}"
+                    queue.append(nxt)
+                    if len(queue) > worklist_peak:
+                        worklist_peak = len(queue)
+                    if budgeted:
+                        self._check_budget(len(state_map), started)
+                for atom in members[cls]:
+                    inner[atom] = next_name
+
+        self.stats = {"worklist_peak": worklist_peak,
+                      "subsets_expanded": len(state_map),
+                      "closures_computed": 0}
+        return DFA(states=set(state_map.values()),
+                   alphabet=set(classes),
+                   initial_state="D0",
+                   final_states=dfa_final_states,
+                   transitions=dfa_transitions)
+
+    def _check_budget(self, states_built: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        if self.max_states is not None and states_built > self.max_states:
+            raise StateExplosionError(
+                f"La construcción directa del DFA superó el límite de "
+                f"{self.max_states} estados", states_built, elapsed)
+        if self.max_time is not None and elapsed > self.max_time:
+            raise StateExplosionError(
+                f"La construcción directa del DFA superó el límite de "
+                f"{self.max_time} s ({states_built} estados construidos)",
+                states_built, elapsed)
@@ -0,0 +1,129 @@
+
+from typing import Dict, List, Set
+from automata_tool.automata.dfa import DFA
+
+class HopcroftMinimizer:
+    """Minimize a DFA with Hopcroft's partition refinement, O(n·|Σ|·log n).
+
+    Missing transitions are treated as going to an implicit dead state, which
+    is removed again from the result, so the output is the minimal *partial*
+    DFA: unreachable and dead states disappear and the remaining states are
+    renamed D0, D1, ... in breadth-first order from the initial state.
+    """
+
+    def build(self, dfa: DFA) -> DFA:
+        alphabet = sorted(dfa.alphabet)
+
+        # Number the reachable states densely; index n is the dead state.
+        index: Dict[str, int] = {dfa.initial_state: 0}
+        order: List[str] = [dfa.initial_state]
+        i = 0
+        while i < len(order):
+            inner = dfa.transitions.get(order[i], {})
+            for symbol in alphabet:
+                dest = inner.get(symbol)
+                if dest is not None and dest not in index:
+                    index[dest] = len(order)
+                    order.append(dest)
+            i += 1
+        n = len(order)
+        dead = n
+
+        # inverse[c][q] = states p with delta(p, c) == q
+        inverse: List[List[List[int]]] = [[[] for _ in range(n + 1)] for _ in alphabet]
+        for c, symbol in enumerate(alphabet):
+            inv = inverse[c]
+            for p, name in enumerate(order):
+                dest = dfa.transitions.get(name, {}).get(symbol)
+                inv[dead if dest is None else index[dest]].append(p)
+            inv[dead].append(dead)
+
+        finals = {index[s] for s in dfa.final_states if s in index}
+        non_finals = set(range(n + 1)) - finals
+
+        blocks: List[Set[int]] = []
+        block_of: List[int] = [0] * (n + 1)
+        for part in (finals, non_finals):
+            if part:
+                for q in part:
+                    block_of[q] = len(blocks)
+                blocks.append(part)
+
+        worklist: Set[int] = set()
+        if len(blocks) == 2:
+            worklist.add(0 if len(blocks[0]) <= len(blocks[1]) else 1)
+
+        while worklist:
+            splitter = list(blocks[worklist.pop()])
+            for inv in inverse:
+                touched: Dict[int, Set[int]] = {}
+                for q in splitter:
+                    for p in inv[q]:
+                        touched.setdefault(block_of[p], set()).add(p)
+                for b, inside in touched.items():
+                    block = blocks[b]
+                    if len(inside) == len(block):
+                        continue
+                    # Move the touched states out, in O(|inside|): the rest
+                    # of the block stays in place under the same index.
+                    block -= inside
+                    new_b = len(blocks)
+                    blocks.append(inside)
+                    for q in inside:
+                        block_of[q] = new_b
+                    # A pending block stays pending and its new half joins
+                    # it; otherwise only the smaller half needs processing.
+                    if b in worklist or len(inside) <= len(block):
+                        worklist.add(new_b)
+                    else:
+                        worklist.add(b)
+
+        return self._rebuild(dfa, alphabet, order, index, blocks, block_of, dead)
+
+    def _rebuild(self, dfa: DFA, alphabet: List[str], order: List[str],
+                 index: Dict[str, int], blocks: List[Set[int]],
+                 block_of: List[int], dead: int) -> DFA:
+        dead_block = block_of[dead]
+        names: Dict[int, str] = {}
+        queue: List[int] = []
+
+        start_block = block_of[0]
+        states: Set[str] = set()
+        transitions: Dict[str, Dict[str, str]] = {}
+        final_states: Set[str] = set()
+
+        def name_of(b: int) -> str:
+            if b not in names:
+                names[b] = f"D{len(names)}"
+                queue.append(b)
+            return names[b]
+
+        name_of(start_block)
+        i = 0
+        while i < len(queue):
+            b = queue[i]
+            i += 1
+            name = names[b]
+            states.add(name)
+            transitions[name] = {}
+            rep = next(iter(blocks[b]))
+            if rep == dead:
+                # Only reachable when the language is empty.
+                continue
+            if order[rep] in dfa.final_states:
+                final_states.add(name)
+            inner = dfa.transitions.get(order[rep], {})
+            for symbol in alphabet:
+                dest = inner.get(symbol)
+                if dest is None:
+                    continue
+                dest_block = block_of[index[dest]]
+                if dest_block == dead_block:
+                    continue
+                transitions[name][symbol] = name_of(dest_block)
+
+        return DFA(states=states,
+                   alphabet=set(dfa.alphabet),
+                   initial_state=names[start_block],
+                   final_states=final_states,
+                   transitions=transitions)
@@ -0,0 +1,158 @@
+
+from typing import List, Tuple
+
+from automata_tool.regex.ast import (
+    RegexNode,
+    Literal,
+    Concat,
+    Union,
+    Star,
+    Plus,
+    Optional as OptNode,
+    Repeat,
+    Group,
+)
+from automata_tool.automata.pike import PikeProgram, CHAR, SPLIT, JMP, SAVE, MATCH
+
+# A fragment under construction: its entry instruction and the successor
+# fields still to patch, as (pc, 0 for xs / 1 for ys).
+Hole = Tuple[int, int]
+Fragment = Tuple[int, List[Hole]]
+
+class PikeCompiler:
+    """Compile a Regex AST (parsed with ``captures=True``) into a PikeProgram.
+
+    This is Thompson's construction emitted as instructions: every literal
+    is a CHAR, alternation and the quantifiers are SPLITs whose preferred
+    branch is the greedy one, and group ``k`` is bracketed by SAVE
+    ``2k`` / ``2k + 1``. The whole regex is group 0. As in
+    :class:`ThompsonBuilder`, the AST is walked iteratively and a counted
+    repetition compiles its child once and copies the child's contiguous
+    block of instructions for the other iterations.
+
+    ``num_groups`` (the parser's ``groups``) keeps slots for groups that
+    were compiled away, such as the one in ``(a){0}``.
+    """
+
+    def build(self, root: RegexNode, num_groups: int = 0) -> PikeProgram:
+        program = PikeProgram()
+        frags: List[Fragment] = []
+        stack: List[Tuple[RegexNode, bool]] = [(root, False)]
+        repeat_starts: List[int] = []
+        groups = 0
+
+        while stack:
+            node, expanded = stack.pop()
+
+            if isinstance(node, Literal):
+                pc = program.emit(CHAR, node.symbol)
+                frags.append((pc, [(pc, 0)]))
+                continue
+
+            if isinstance(node, (Concat, Union)):
+                if not expanded:
+                    stack.append((node, True))
+                    stack.append((node.right, False))
+                    stack.append((node.left, False))
+                    continue
+                right_start, right_holes = frags.pop()
+                left_start, left_holes = frags.pop()
+                if isinstance(node, Concat):
+                    self._patch(program, left_holes, right_start)
+                    frags.append((left_start, right_holes))
+                else:
+                    pc = program.emit(SPLIT, x=left_start, y=right_start)
+                    frags.append((pc, left_holes + right_holes))
+                continue
+
+            if not expanded:
+                stack.append((node, True))
+                stack.append((node.child, False))
+                if isinstance(node, Repeat):
+                    repeat_starts.append(len(program))
+                continue
+            child_start, child_holes = frags.pop()
+
+            if isinstance(node, Star):
+                pc = program.emit(SPLIT, x=child_start)
+                self._patch(program, child_holes, pc)
+                frags.append((pc, [(pc, 1)]))
+            elif isinstance(node, Plus):
+                pc = program.emit(SPLIT, x=child_start)
+                self._patch(program, child_holes, pc)
+                frags.append((child_start, [(pc, 1)]))
+            elif isinstance(node, OptNode):
+                pc = program.emit(SPLIT, x=child_start)
+                frags.append((pc, child_holes + [(pc, 1)]))
+            elif isinstance(node, Group):
+                groups = max(groups, node.index)
+                end = program.emit(SAVE, 2 * node.index + 1)
+                self._patch(program, child_holes, end)
+                begin = program.emit(SAVE, 2 * node.index, x=child_start)
+                frags.append((begin, [(end, 0)]))
+            elif isinstance(node, Repeat):
+                frags.append(self._repeat(program, node, child_start, child_holes,
+                                          repeat_starts.pop()))
+            else:
+                raise TypeError(f"Tipo de nodo de regex no soportado: {type(node)}")
+
+        start, holes = frags.pop()
+        match = program.emit(MATCH)
+        end = program.emit(SAVE, 1, x=match)
+        self._patch(program, holes, end)
+        program.start = program.emit(SAVE, 0, x=start)
+        program.num_groups = max(groups, num_groups)
+        return program
+
+    @staticmethod
+    def _patch(program: PikeProgram, holes: List[Hole], target: int) -> None:
+        for pc, which in holes:
+            if which:
+                program.ys[pc] = target
+            else:
+                program.xs[pc] = target
+
+    def _repeat(self, program: PikeProgram, node: Repeat, child_start: int,
+                child_holes: List[Hole], lo: int) -> Fragment:
+        """Fragment of ``child{min,max}`` from the child block ``lo`` ... end."""
+        hi = len(program)
+        count = node.max if node.max is not None else max(node.min, 1)
+        if count == 0:
+            # x{0}: only the empty string; drop the child's instructions.
+            for column in (program.ops, program.args, program.xs, program.ys):
+                del column[lo:]
+            pc = program.emit(JMP)
+            return (pc, [(pc, 0)])
+
+        copies: List[Fragment] = [(child_start, child_holes)]
+        for _ in range(count - 1):
+            shift = len(program) - lo
+            for pc in range(lo, hi):
+                x, y = program.xs[pc], program.ys[pc]
+                program.emit(program.ops[pc], program.args[pc],
+                             None if x is None else x + shift,
+                             None if y is None else y + shift)
+            copies.append((child_start + shift,
+                           [(pc + shift, which) for pc, which in child_holes]))
+
+        if node.max is None:
+            last_start, last_holes = copies[-1]
+            loop = program.emit(SPLIT, x=last_start)
+            self._patch(program, last_holes, loop)
+            copies[-1] = (last_start, [(loop, 1)])
+
+        # x{m,n} = x...x (x (x ...)?)? with m mandatory copies
+        start = None
+        holes: List[Hole] = []
+        skips: List[Hole] = []
+        for i, (copy_start, copy_holes) in enumerate(copies):
+            entry = copy_start
+            if i >= node.min:
+                entry = program.emit(SPLIT, x=copy_start)
+                skips.append((entry, 1))
+            if start is None:
+                start = entry
+            else:
+                self._patch(program, holes, entry)
+            holes = copy_holes
+        return (start, holes + skips)
@@ -0,0 +1,152 @@
+
+from dataclasses import dataclass, field
+from typing import Iterator, List, Tuple
+
+from automata_tool.regex.ast import (
+    RegexNode,
+    Literal,
+    Concat,
+    Union,
+    Star,
+    Plus,
+    Optional as OptNode,
+    Repeat,
+    Group,
+)
+
+@dataclass
+class PositionInfo:
+    """Position analysis of a regex (the basis of Glushkov/followpos DFAs).
+
+    Every literal occurrence in the regex is a *position*, numbered from 1
+    in left-to-right order; ``symbols[i]`` is the label read at position
+    ``i`` (``symbols[0]`` is unused). ``first`` / ``last`` are the positions
+    that can start / end a match, ``nullable`` tells whether the empty
+    string matches, and ``follow[i]`` the positions that can come right
+    after position ``i``. Position sets are int bitmasks (bit ``i`` for
+    position ``i``), which keeps the quadratic follow relation of patterns
+    like ``(w1|...|wn)*`` compact.
+    """
+
+    symbols: List[str] = field(default_factory=lambda: [""])
+    nullable: bool = False
+    first: int = 0
+    last: int = 0
+    follow: List[int] = field(default_factory=lambda: [0])
+
+    @property
+    def num_positions(self) -> int:
+        return len(self.symbols) - 1
+
+def positions_of(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        mask ^= low
+        yield low.bit_length() - 1
+
+# (nullable, first, last) of a finished subexpression
+_Summary = Tuple[bool, int, int]
+
+def analyze_positions(root: RegexNode) -> PositionInfo:
+    """Compute nullable/first/last/follow for `root` in one iterative pass.
+
+    The AST is walked post-order with an explicit stack, so deep ASTs do not
+    hit the recursion limit; a node reached twice (a shared subtree) gets
+    fresh positions on each visit. A counted repetition analyzes its child
+    once and copies the child's positions (a contiguous block) with their
+    follow sets shifted.
+    """
+    info = PositionInfo()
+    follow = info.follow
+    symbols = info.symbols
+    done: List[_Summary] = []
+    stack: List[Tuple[RegexNode, bool]] = [(root, False)]
+    # First position of each pending Repeat's child
+    repeat_starts: List[int] = []
+
+    def concat(left: _Summary, right: _Summary) -> _Summary:
+        l_null, l_first, l_last = left
+        r_null, r_first, r_last = right
+        for i in positions_of(l_last):
+            follow[i] |= r_first
+        first = l_first | r_first if l_null else l_first
+        last = r_last | l_last if r_null else r_last
+        return (l_null and r_null, first, last)
+
+    while stack:
+        node, expanded = stack.pop()
+        while isinstance(node, Group):  # captures play no part in positions
+            node = node.child
+
+        if isinstance(node, Literal):
+            symbols.append(node.symbol)
+            follow.append(0)
+            bit = 1 << (len(symbols) - 1)
+            done.append((False, bit, bit))
+            continue
+
+        if isinstance(node, (Concat, Union)):
+            if not expanded:
+                stack.append((node, True))
+                stack.append((node.right, False))
+                stack.append((node.left, False))
+                continue
+            right = done.pop()
+            left = done.pop()
+            if isinstance(node, Union):
+                done.append((left[0] or right[0], left[1] | right[1], left[2] | right[2]))
+                continue
+            done.append(concat(left, right))
+            continue
+
+        if isinstance(node, (Star, Plus, OptNode)):
+            if not expanded:
+                stack.append((node, True))
+                stack.append((node.child, False))
+                continue
+            c_null, c_first, c_last = done.pop()
+            if not isinstance(node, OptNode):
+                for i in positions_of(c_last):
+                    follow[i] |= c_first
+            done.append((c_null or not isinstance(node, Plus), c_first, c_last))
+            continue
+
+        if isinstance(node, Repeat):
+            if not expanded:
+                stack.append((node, True))
+                stack.append((node.child, False))
+                repeat_starts.append(len(symbols))
+                continue
+            child = done.pop()
+            lo, hi = repeat_starts.pop(), len(symbols)
+            count = node.max if node.max is not None else max(node.min, 1)
+            if count == 0:
+                del symbols[lo:], follow[lo:]
+                done.append((True, 0, 0))
+                continue
+            copies = [child]
+            for k in range(1, count):
+                shift = k * (hi - lo)
+                symbols.extend(symbols[lo:hi])
+                follow.extend(follow[i] << shift for i in range(lo, hi))
+                copies.append((child[0], child[1] << shift, child[2] << shift))
+            if node.max is None:
+                l_null, l_first, l_last = copies[-1]
+                for i in positions_of(l_last):
+                    follow[i] |= l_first
+                if node.min == 0:
+                    copies[-1] = (True, l_first, l_last)
+            # x{m,n} = x...x (x (x ...)?)? with m mandatory copies
+            summary = None
+            for copy in reversed(copies[node.min:]):
+                summary = copy if summary is None else concat(copy, summary)
+                summary = (True, summary[1], summary[2])
+            for copy in reversed(copies[:node.min]):
+                summary = copy if summary is None else concat(copy, summary)
+            done.append(summary)
+            continue
+
+        raise TypeError(f"Tipo de nodo de regex no soportado: {type(node)}")
+
+    info.nullable, info.first, info.last = done.pop()
+    return info
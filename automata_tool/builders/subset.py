@@ -1,57 +1,189 @@
 
-from typing import Dict, Set, FrozenSet, List
+import time
+from collections import deque
+from typing import Deque, Dict, Set, FrozenSet, Optional, Union
 from automata_tool.automata.nfa import NFA
 from automata_tool.automata.dfa import DFA
+from automata_tool.automata.bitset import BitsetNFA
+from automata_tool.automata.charset import split_labels, equivalence_classes, class_members
+
+class StateExplosionError(RuntimeError):
+    """Raised when subset construction exceeds its state or time budget."""
+
+    def __init__(self, message: str, states_built: int, elapsed: float) -> None:
+        super().__init__(message)
+        self.states_built = states_built
+        self.elapsed = elapsed
 
 class SubsetConstruction:
-    """Convert an NFA to an equivalent DFA (subset construction)."""
+    """Convert an NFA to an equivalent DFA (subset construction).
+
+    With ``use_bitsets=True`` (the default) the NFA is first converted to a
+    :class:`BitsetNFA` and DFA states are keyed by int bitmasks with
+    precomputed epsilon closures; ``use_bitsets=False`` works on frozensets
+    of state names and memoizes the closure of every move set it sees.
+    Either way the worklist is a FIFO deque and, for each subset, only the
+    symbols that actually leave one of its NFA states are tried. Character
+    classes are split into disjoint atoms first, and atoms that take every
+    NFA state to the same destinations are merged into one alphabet
+    equivalence class, so symbols that behave alike cost one move set per
+    DFA state. The classes stay internal: the DFA alphabet and transitions
+    are spelled with the atoms, i.e. the original symbols when no class
+    overlaps another label.
+
+    ``max_states`` and ``max_time`` (seconds) bound the construction; when
+    either is exceeded a :class:`StateExplosionError` is raised.
+
+    After ``build`` the subset behind every DFA state can be recovered with
+    :meth:`nfa_states` (used to tag DFA states, e.g. by ``RegexSet``), and
+    ``stats`` holds the work counters of the run: the peak worklist size,
+    the subsets expanded (``subsets_expanded``, one per DFA state) and the
+    epsilon closures computed (``closures_computed``: one per NFA state,
+    precomputed, with bitsets; one per distinct move set otherwise).
+    """
+
+    def __init__(self, use_bitsets: bool = True,
+                 max_states: Optional[int] = None,
+                 max_time: Optional[float] = None) -> None:
+        self.use_bitsets = use_bitsets
+        self.max_states = max_states
+        self.max_time = max_time
+        self._started = 0.0
+        self._bits: Optional[BitsetNFA] = None
+        self._subsets: Dict[str, Union[int, FrozenSet[str]]] = {}
+        self.stats: Dict[str, int] = {}
 
     def build(self, nfa: NFA) -> DFA:
-        # Initial DFA state is epsilon-closure of NFA initial state
-        start_closure = nfa.epsilon_closure({nfa.initial_state})
-        state_map: Dict[FrozenSet[str], str] = {}
-        dfa_states: Set[str] = set()
-        dfa_transitions: Dict[str, Dict[str, str]] = {}
-        queue: List[FrozenSet[str]] = []
+        self._started = time.perf_counter()
+        if self.use_bitsets:
+            return self._build_bitset(nfa)
+        return self._build_sets(nfa)
 
-        def get_name(state_set: FrozenSet[str]) -> str:
-            if state_set not in state_map:
-                name = f"D{len(state_map)}"
-                state_map[state_set] = name
-            return state_map[state_set]
+    def nfa_states(self, dfa_state: str) -> Set[str]:
+        """NFA states making up `dfa_state` in the last DFA built."""
+        subset = self._subsets[dfa_state]
+        if self._bits is not None:
+            return self._bits.to_states(subset)
+        return set(subset)
 
-        start_set = frozenset(start_closure)
-        start_name = get_name(start_set)
-        queue.append(start_set)
-        dfa_states.add(start_name)
+    def _check_budget(self, states_built: int) -> None:
+        elapsed = time.perf_counter() - self._started
+        if self.max_states is not None and states_built > self.max_states:
+            raise StateExplosionError(
+                f"La construcción de subconjuntos superó el límite de "
+                f"{self.max_states} estados del DFA", states_built, elapsed)
+        if self.max_time is not None and elapsed > self.max_time:
+            raise StateExplosionError(
+                f"La construcción de subconjuntos superó el límite de "
+                f"{self.max_time} s ({states_built} estados construidos)",
+                states_built, elapsed)
 
+    def _build_bitset(self, nfa: NFA) -> DFA:
+        bits = self._bits = BitsetNFA(nfa)
+        budgeted = self.max_states is not None or self.max_time is not None
+        state_map: Dict[int, str] = {bits.start: "D0"}
+        dfa_transitions: Dict[str, Dict[str, str]] = {}
         dfa_final_states: Set[str] = set()
+        queue: Deque[int] = deque([bits.start])
+        worklist_peak = 1
+
+        while queue:
+            current = queue.popleft()
+            current_name = state_map[current]
+            inner = dfa_transitions[current_name] = {}
+            if bits.is_final(current):
+                dfa_final_states.add(current_name)
+
+            for cls, nxt in bits.moves(current).items():
+                next_name = state_map.get(nxt)
+                if next_name is None:
+                    next_name = state_map[nxt] = f"D{len(state_map)}"
+                    queue.append(nxt)
+                    if len(queue) > worklist_peak:
+                        worklist_peak = len(queue)
+                    if budgeted:
+                        self._check_budget(len(state_map))
+                for atom in bits.members[cls]:
+                    inner[atom] = next_name
+
+        self._subsets = {name: mask for mask, name in state_map.items()}
+        self.stats = {"worklist_peak": worklist_peak,
+                      "subsets_expanded": len(state_map),
+                      "closures_computed": len(bits.closures)}
+        return DFA(states=set(state_map.values()),
+                   alphabet=set(bits.classes),
+                   initial_state="D0",
+                   final_states=dfa_final_states,
+                   transitions=dfa_transitions)
 
-        alphabet = {sym for sym in nfa.alphabet if sym is not None}
+    def _build_sets(self, nfa: NFA) -> DFA:
+        budgeted = self.max_states is not None or self.max_time is not None
+        closure_memo: Dict[FrozenSet[str], FrozenSet[str]] = {}
+
+        def closure_of(move_set: FrozenSet[str]) -> FrozenSet[str]:
+            closure = closure_memo.get(move_set)
+            if closure is None:
+                closure = closure_memo[move_set] = frozenset(nfa.epsilon_closure(move_set))
+            return closure
+
+        atoms = split_labels(sym for sym in nfa.alphabet if sym is not None)
+        # atom -> state -> destinations, to find the atoms that behave alike
+        behaviour: Dict[str, Dict[str, Set[str]]] = {}
+        for state, inner in nfa.transitions.items():
+            for symbol, dests in inner.items():
+                for atom in atoms.get(symbol, ()):
+                    behaviour.setdefault(atom, {}).setdefault(state, set()).update(dests)
+        classes = equivalence_classes({
+            atom: frozenset((state, frozenset(dests)) for state, dests in per_state.items())
+            for atom, per_state in behaviour.items()})
+        symbol_classes = {symbol: sorted({classes[a] for a in parts if a in classes})
+                          for symbol, parts in atoms.items()}
+        members = class_members(classes)
+        start_set = frozenset(nfa.epsilon_closure({nfa.initial_state}))
+        state_map: Dict[FrozenSet[str], str] = {start_set: "D0"}
+        dfa_transitions: Dict[str, Dict[str, str]] = {}
+        dfa_final_states: Set[str] = set()
+        queue: Deque[FrozenSet[str]] = deque([start_set])
+        worklist_peak = 1
 
         while queue:
-            current_set = queue.pop(0)
+            current_set = queue.popleft()
             current_name = state_map[current_set]
-            dfa_transitions.setdefault(current_name, {})
+            inner = dfa_transitions[current_name] = {}
 
             # Mark as final if any NFA state in the set is final
             if any(s in nfa.final_states for s in current_set):
                 dfa_final_states.add(current_name)
 
-            for symbol in alphabet:
-                move_set = nfa.move(current_set, symbol)
+            # Gather the move set of every symbol leaving the subset at once
+            moves: Dict[str, Set[str]] = {}
+            for state in current_set:
+                for symbol, dests in nfa.transitions.get(state, {}).items():
+                    for cls in symbol_classes.get(symbol, ()):
+                        moves.setdefault(cls, set()).update(dests)
+
+            for cls, move_set in moves.items():
                 if not move_set:
                     continue
-                closure = nfa.epsilon_closure(move_set)
-                closure_fs = frozenset(closure)
-                next_name = get_name(closure_fs)
-                dfa_transitions[current_name][symbol] = next_name
-                if next_name not in dfa_states:
-                    dfa_states.add(next_name)
+                closure_fs = closure_of(frozenset(move_set))
+                next_name = state_map.get(closure_fs)
+                if next_name is None:
+                    next_name = state_map[closure_fs] = f"D{len(state_map)}"
                     queue.append(closure_fs)
+                    if len(queue) > worklist_peak:
+                        worklist_peak = len(queue)
+                    if budgeted:
+                        self._check_budget(len(state_map))
+                for atom in members[cls]:
+                    inner[atom] = next_name
 
-        return DFA(states=dfa_states,
-                   alphabet=alphabet,
-                   initial_state=start_name,
+        self._bits = None
+        self._subsets = {name: subset for subset, name in state_map.items()}
+        self.stats = {"worklist_peak": worklist_peak,
+                      "subsets_expanded": len(state_map),
+                      "closures_computed": len(closure_memo) + 1}
+        return DFA(states=set(state_map.values()),
+                   alphabet={atom for parts in atoms.values() for atom in parts},
+                   initial_state="D0",
                    final_states=dfa_final_states,
                    transitions=dfa_transitions)
@@ -1,6 +1,6 @@
 
 from dataclasses import dataclass
-from typing import Dict, Set, Optional as OptType
+from typing import Dict, List, Set, Tuple, Optional as OptType
 
 from automata_tool.regex.ast import (
     RegexNode,
@@ -10,6 +10,8 @@ from automata_tool.regex.ast import (
     Star,
     Plus,
     Optional as OptNode,
+    Repeat,
+    Group,
 )
 from automata_tool.automata.nfa import NFA
 
@@ -21,12 +23,28 @@ class NFAFragment:
     end: str
     transitions: Dict[str, Dict[Symbol, Set[str]]]
 
+Transitions = Dict[str, Dict[Symbol, Set[str]]]
+
 class ThompsonBuilder:
-    """Builds an NFA from a Regex AST using Thompson's construction."""
+    """Builds an NFA from a Regex AST using Thompson's construction.
+
+    With ``shared_table=True`` (the default) every fragment writes into one
+    append-only transition table and the AST is walked iteratively, so the
+    construction is linear in the size of the regex and deep ASTs cannot hit
+    Python's recursion limit. ``shared_table=False`` keeps the original
+    recursive construction that merges a copy of the children at every node.
+    Both modes number states in the same order and produce the same NFA.
+
+    A counted repetition ``x{m,n}`` builds the fragment of ``x`` once and
+    then copies its states and edges (they are the contiguous block of
+    states created while building it) instead of walking ``x`` again, so
+    the cost is that of the resulting NFA.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, shared_table: bool = True) -> None:
         self._state_counter = 0
         self.alphabet: Set[str] = set()
+        self.shared_table = shared_table
 
     def _new_state(self) -> str:
         s = f"q{self._state_counter}"
@@ -107,10 +125,156 @@ class ThompsonBuilder:
             transitions.setdefault(frag.end, {}).setdefault(NFA.EPSILON, set()).add(end)
             return NFAFragment(start, end, transitions)
 
+        if isinstance(node, Group):
+            return self._build(node.child)
+
+        if isinstance(node, Repeat):
+            lo = self._state_counter
+            frag = self._build(node.child)
+            transitions = self._merge(frag.transitions, {})
+            start, end = self._repeat(transitions, node, frag.start, frag.end, lo)
+            return NFAFragment(start, end, transitions)
+
         raise TypeError(f"Tipo de nodo de regex no soportado: {type(node)}")
 
+    def _repeat(self, table: Transitions, node: Repeat, frag_start: str, frag_end: str,
+                lo: int) -> Tuple[str, str]:
+        """Wire ``child{min,max}`` into `table` from the child fragment built last.
+
+        The child's states are ``q{lo}`` ... up to the current counter; the
+        extra copies are clones of that block. Returns the (start, end) of
+        the repetition.
+        """
+        hi = self._state_counter
+        count = node.max if node.max is not None else max(node.min, 1)
+        if count == 0:
+            # x{0}: only the empty string; drop the child's states.
+            for i in range(lo, hi):
+                table.pop(f"q{i}", None)
+            self._state_counter = lo
+            start = self._new_shared_state(table)
+            end = self._new_shared_state(table)
+            table[start][NFA.EPSILON] = {end}
+            return start, end
+
+        block = [f"q{i}" for i in range(lo, hi)]
+        index = {name: i for i, name in enumerate(block)}
+        start_index, end_index = index[frag_start], index[frag_end]
+        frags = [(frag_start, frag_end)]
+        for _ in range(count - 1):
+            copy = [self._new_state() for _ in block]
+            for name, new in zip(block, copy):
+                table[new] = {sym: {copy[index[d]] for d in dests}
+                              for sym, dests in table.get(name, {}).items()}
+            frags.append((copy[start_index], copy[end_index]))
+
+        start = self._new_shared_state(table)
+        end = self._new_shared_state(table)
+        current = start
+        for i, (copy_start, copy_end) in enumerate(frags):
+            if i >= node.min:
+                table.setdefault(current, {}).setdefault(NFA.EPSILON, set()).add(end)
+            table.setdefault(current, {}).setdefault(NFA.EPSILON, set()).add(copy_start)
+            current = copy_end
+        if node.max is None:
+            last_start, last_end = frags[-1]
+            table.setdefault(last_end, {}).setdefault(NFA.EPSILON, set()).add(last_start)
+        table.setdefault(current, {}).setdefault(NFA.EPSILON, set()).add(end)
+        return start, end
+
+    # ---- shared-table, iterative construction ----
+
+    @staticmethod
+    def _add_epsilon(table: Transitions, from_state: str, to_state: str) -> None:
+        table[from_state].setdefault(NFA.EPSILON, set()).add(to_state)
+
+    def _new_shared_state(self, table: Transitions) -> str:
+        s = self._new_state()
+        table[s] = {}
+        return s
+
+    def _build_shared(self, root: RegexNode) -> NFAFragment:
+        table: Transitions = {}
+        # Post-order walk with an explicit stack; finished fragments are kept
+        # as (start, end) pairs on `frags`, all edges live in `table`.
+        frags: List[Tuple[str, str]] = []
+        stack: List[Tuple[RegexNode, bool]] = [(root, False)]
+        # State counter when each pending Repeat started building its child
+        repeat_starts: List[int] = []
+        add_eps = self._add_epsilon
+
+        while stack:
+            node, expanded = stack.pop()
+            while isinstance(node, Group):  # captures play no part in the NFA
+                node = node.child
+
+            if isinstance(node, Literal):
+                start = self._new_shared_state(table)
+                end = self._new_shared_state(table)
+                table[start][node.symbol] = {end}
+                self.alphabet.add(node.symbol)
+                frags.append((start, end))
+                continue
+
+            if isinstance(node, (Concat, Union)):
+                if not expanded:
+                    stack.append((node, True))
+                    stack.append((node.right, False))
+                    stack.append((node.left, False))
+                    continue
+                right_start, right_end = frags.pop()
+                left_start, left_end = frags.pop()
+                if isinstance(node, Concat):
+                    add_eps(table, left_end, right_start)
+                    frags.append((left_start, right_end))
+                    continue
+                start = self._new_shared_state(table)
+                end = self._new_shared_state(table)
+                add_eps(table, start, left_start)
+                add_eps(table, start, right_start)
+                add_eps(table, left_end, end)
+                add_eps(table, right_end, end)
+                frags.append((start, end))
+                continue
+
+            if isinstance(node, (Star, Plus, OptNode)):
+                if not expanded:
+                    stack.append((node, True))
+                    stack.append((node.child, False))
+                    continue
+                frag_start, frag_end = frags.pop()
+                start = self._new_shared_state(table)
+                end = self._new_shared_state(table)
+                add_eps(table, start, frag_start)
+                if not isinstance(node, Plus):
+                    add_eps(table, start, end)
+                if not isinstance(node, OptNode):
+                    add_eps(table, frag_end, frag_start)
+                add_eps(table, frag_end, end)
+                frags.append((start, end))
+                continue
+
+            if isinstance(node, Repeat):
+                if not expanded:
+                    stack.append((node, True))
+                    stack.append((node.child, False))
+                    repeat_starts.append(self._state_counter)
+                    continue
+                frag_start, frag_end = frags.pop()
+                frags.append(self._repeat(table, node, frag_start, frag_end,
+                                          repeat_starts.pop()))
+                continue
+
+            raise TypeError(f"Tipo de nodo de regex no soportado: {type(node)}")
+
+        start, end = frags.pop()
+        return NFAFragment(start, end, table)
+
     def build(self, root: RegexNode) -> NFA:
-        frag = self._build(root)
+        if self.shared_table:
+            frag = self._build_shared(root)
+        else:
+            frag = self._build(root)
         # Collect all states from transitions plus start/end
         states: Set[str] = set()
         for s, inner in frag.transitions.items():
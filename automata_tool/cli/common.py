@@ -0,0 +1,113 @@
+
+import argparse
+import json
+from typing import Any, List, Optional
+
+from automata_tool.core import AutomatonFactory, AutomatonDefinition
+from automata_tool.core.instrument import Observer
+from automata_tool.core.factory import NFA_BUILDERS
+
+def _load_definition_from_json(path: str) -> AutomatonDefinition:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return AutomatonDefinition.from_dict(data)
+
+def _load_keywords(path: str) -> List[str]:
+    """One keyword per line; line endings are stripped and blank lines skipped."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\r\n") for line in f if line.strip("\r\n")]
+
+def _factory_from_args(args: argparse.Namespace,
+                       observer: Optional[Observer] = None) -> AutomatonFactory:
+    return AutomatonFactory(
+        minimize=args.minimize,
+        max_dfa_states=args.max_dfa_states,
+        max_build_time=args.max_build_time,
+        nfa_fallback=args.nfa_fallback,
+        observer=observer,
+        builder=args.builder,
+        simplify=not args.no_simplify,
+        byte_mode=getattr(args, "utf8", False),
+    )
+
+def _add_build_options(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--builder",
+        choices=list(NFA_BUILDERS),
+        default="thompson",
+        help="Construcción del NFA a partir de la regex: Thompson (con transiciones "
+             "epsilon) o Glushkov (sin epsilon, un estado por posición).",
+    )
+    p.add_argument(
+        "--no-simplify",
+        action="store_true",
+        help="No simplificar la regex (estrellas y opcionales redundantes, "
+             "alternativas repetidas) antes de construir los autómatas que solo "
+             "sirven para reconocer.",
+    )
+    p.add_argument(
+        "--minimize",
+        action="store_true",
+        help="Minimizar el DFA (algoritmo de Hopcroft) antes de mostrarlo y dibujarlo.",
+    )
+    p.add_argument(
+        "--max-dfa-states",
+        type=int,
+        default=None,
+        help="Máximo de estados permitidos en la construcción de subconjuntos.",
+    )
+    p.add_argument(
+        "--max-build-time",
+        type=float,
+        default=None,
+        help="Tiempo máximo (segundos) para la construcción de subconjuntos.",
+    )
+    p.add_argument(
+        "--nfa-fallback",
+        action="store_true",
+        help="Si se supera el límite, validar simulando el NFA en lugar de fallar.",
+    )
+
+def _add_cache_option(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directorio de caché de autómatas compilados (se reutilizan entre ejecuciones).",
+    )
+
+def _matcher_from_args(args: argparse.Namespace) -> Any:
+    """Compile the --regex/--definition/--keywords of a bulk command once.
+
+    Returns a CompiledDFA (loaded from --cache-dir when possible), or the NFA
+    matcher when subset construction fell back to NFA simulation.
+    """
+    # Only the bulk commands need the caches: keep them out of CLI startup.
+    from automata_tool.core.cache import regex_key, definition_key, keywords_key
+    from automata_tool.core.disk_cache import ArtifactCache
+
+    factory = _factory_from_args(args)
+    if args.definition:
+        definition = _load_definition_from_json(args.definition)
+        source_key = definition_key(definition)
+        build = lambda: factory.from_definition(definition)
+    elif getattr(args, "keywords", None):
+        keywords = _load_keywords(args.keywords)
+        source_key = keywords_key(keywords)
+        build = lambda: factory.from_keywords(keywords)
+    else:
+        source_key = regex_key(args.regex)
+        build = lambda: factory.from_regex(args.regex)
+
+    cache = ArtifactCache(args.cache_dir) if args.cache_dir else None
+    if cache is not None:
+        compiled = cache.get(cache.key(source_key, factory))
+        if compiled is not None:
+            return compiled
+
+    result = build()
+    if result["dfa"] is None:
+        return result["matcher"]
+    compiled = factory.compile_dfa(result["dfa"])
+    if cache is not None:
+        cache.put(cache.key(source_key, factory), compiled)
+    return compiled
@@ -2,92 +2,123 @@
 import argparse
 import json
 import os
-from typing import Any
-
-from automata_tool.core import (
-    AutomatonFactory,
-    AutomatonDefinition,
-    EPSILON_SYMBOL,
-    is_string_accepted_by_regex,
-    is_string_accepted_by_definition,
-)
-from automata_tool.diagrams import save_automaton_diagram
-
-def _load_definition_from_json(path: str) -> AutomatonDefinition:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return AutomatonDefinition.from_dict(data)
-
-def cmd_from_regex(args: argparse.Namespace) -> None:
-    factory = AutomatonFactory()
-    result = factory.from_regex(args.regex)
-    nfa = result["nfa"]
-    dfa = result["dfa"]
-    nfa_def = result["nfa_def"]
-    dfa_def = result["dfa_def"]
-
-    print("=== NFA generado desde la expresión regular ===")
-    print(json.dumps(nfa_def.to_dict(), indent=2, ensure_ascii=False))
-    print("\n=== DFA equivalente ===")
-    print(json.dumps(dfa_def.to_dict(), indent=2, ensure_ascii=False))
-
-    outdir = args.output_dir or "."
-    os.makedirs(outdir, exist_ok=True)
-    base_nfa = os.path.join(outdir, "nfa_from_regex")
-    base_dfa = os.path.join(outdir, "dfa_from_regex")
-
-    nfa_dot = save_automaton_diagram(nfa, base_nfa, name="NFA")
-    dfa_dot = save_automaton_diagram(dfa, base_dfa, name="DFA")
-
-    print(f"\nArchivos de diagrama generados:")
-    print(f"  NFA: {nfa_dot}")
-    print(f"  DFA: {dfa_dot}")
+import sys
+from typing import Any, Mapping, Optional
+
+from automata_tool.core.instrument import StatsCollector, run_stage
+from .common import _load_definition_from_json, _factory_from_args, _add_build_options
+from .match import add_match_parser
+from .search import add_search_parser
+
+def _print_minimization(result: Mapping[str, Any]) -> None:
+    stats = result.get("minimization")
+    if stats:
+        print(f"\nMinimización del DFA: {stats['states_before']} -> "
+              f"{stats['states_after']} estados")
+
+def _report_result(result: Mapping[str, Any], args: argparse.Namespace,
+                   nfa_title: str, suffix: str,
+                   stats: Optional[StatsCollector] = None) -> None:
+    # Only what is printed, drawn or matched is ever built (see FactoryResult).
+    if not args.no_quintuple:
+        print(f"=== {nfa_title} ===")
+        print(json.dumps(result["nfa_def"].to_dict(), indent=2, ensure_ascii=False))
+        print("\n=== DFA equivalente ===")
+        dfa_def = result["dfa_def"]
+        if dfa_def is not None:
+            print(json.dumps(dfa_def.to_dict(), indent=2, ensure_ascii=False))
+        else:
+            print("(no construido: se superó el límite de la construcción de "
+                  "subconjuntos; las cadenas se validan simulando el NFA)")
+    if args.minimize:
+        _print_minimization(result)
+
+    if not args.no_diagrams:
+        from automata_tool.diagrams import save_automaton_diagram
+
+        outdir = args.output_dir or "."
+        os.makedirs(outdir, exist_ok=True)
+        base_nfa = os.path.join(outdir, f"nfa_{suffix}")
+        base_dfa = os.path.join(outdir, f"dfa_{suffix}")
+
+        nfa, dfa = result["nfa"], result["dfa"]
+        nfa_dot = run_stage(stats, "nfa_diagram",
+                            lambda: save_automaton_diagram(nfa, base_nfa, name="NFA"))
+
+        print(f"\nArchivos de diagrama generados:")
+        print(f"  NFA: {nfa_dot}")
+        if dfa is not None:
+            dfa_dot = run_stage(stats, "dfa_diagram",
+                                lambda: save_automaton_diagram(dfa, base_dfa, name="DFA"))
+            print(f"  DFA: {dfa_dot}")
 
     if args.string:
+        matcher = result["matcher"]
+        accepted = run_stage(stats, "accepts",
+                             lambda: [matcher.accepts(s) for s in args.string],
+                             lambda flags: {"strings": len(flags), "accepted": sum(flags)})
         results = []
-        for s in args.string:
-            accepted = dfa.accepts(s)
-            estado = "ACEPTADA" if accepted else "RECHAZADA"
+        for s, ok in zip(args.string, accepted):
+            estado = "ACEPTADA" if ok else "RECHAZADA"
             results.append((s, estado))
 
         print("\nResultados (cadena, estado):")
         print(results)
 
-def cmd_from_definition(args: argparse.Namespace) -> None:
-    definition = _load_definition_from_json(args.file)
-    factory = AutomatonFactory()
-    result = factory.from_definition(definition)
-    nfa = result["nfa"]
-    dfa = result["dfa"]
-    nfa_def = result["nfa_def"]
-    dfa_def = result["dfa_def"]
-
-    print("=== NFA (a partir de definición) ===")
-    print(json.dumps(nfa_def.to_dict(), indent=2, ensure_ascii=False))
-    print("\n=== DFA equivalente ===")
-    print(json.dumps(dfa_def.to_dict(), indent=2, ensure_ascii=False))
-
-    outdir = args.output_dir or "."
-    os.makedirs(outdir, exist_ok=True)
-    base_nfa = os.path.join(outdir, "nfa_from_definition")
-    base_dfa = os.path.join(outdir, "dfa_from_definition")
-
-    nfa_dot = save_automaton_diagram(nfa, base_nfa, name="NFA")
-    dfa_dot = save_automaton_diagram(dfa, base_dfa, name="DFA")
-
-    print(f"\nArchivos de diagrama generados:")
-    print(f"  NFA: {nfa_dot} ")
-    print(f"  DFA: {dfa_dot} ")
+def _stats_from_args(args: argparse.Namespace) -> Optional[StatsCollector]:
+    if not args.stats and not args.stats_memory:
+        return None
+    return StatsCollector(trace_memory=args.stats_memory)
+
+def _print_stats(stats: Optional[StatsCollector], args: argparse.Namespace) -> None:
+    if stats is None:
+        return
+    if args.stats == "json":
+        print(json.dumps(stats.to_dict(), indent=2), file=sys.stderr)
+    else:
+        print("\n=== Estadísticas por etapa ===", file=sys.stderr)
+        print(stats.format_table(), file=sys.stderr)
+
+def _add_output_options(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--no-quintuple",
+        action="store_true",
+        help="No construir ni imprimir las quíntuplas del NFA y del DFA.",
+    )
+    p.add_argument(
+        "--no-diagrams",
+        action="store_true",
+        help="No generar los diagramas (.dot/.png).",
+    )
+    p.add_argument(
+        "--stats",
+        nargs="?",
+        const="table",
+        choices=["table", "json"],
+        default=None,
+        help="Mostrar en stderr tiempo y contadores de cada etapa (tabla o JSON).",
+    )
+    p.add_argument(
+        "--stats-memory",
+        action="store_true",
+        help="Con --stats, medir también el pico de memoria de cada etapa (más lento).",
+    )
 
-    if args.string:
-        results = []
-        for s in args.string:
-            accepted = dfa.accepts(s)
-            estado = "ACEPTADA" if accepted else "RECHAZADA"
-            results.append((s, estado))
+def cmd_from_regex(args: argparse.Namespace) -> None:
+    stats = _stats_from_args(args)
+    factory = _factory_from_args(args, observer=stats)
+    result = factory.from_regex(args.regex)
+    _report_result(result, args, "NFA generado desde la expresión regular", "from_regex",
+                   stats)
+    _print_stats(stats, args)
 
-        print("\nResultados (cadena, estado):")
-        print(results)
+def cmd_from_definition(args: argparse.Namespace) -> None:
+    stats = _stats_from_args(args)
+    definition = run_stage(stats, "read_json", lambda: _load_definition_from_json(args.file))
+    factory = _factory_from_args(args, observer=stats)
+    result = factory.from_definition(definition)
+    _report_result(result, args, "NFA (a partir de definición)", "from_definition", stats)
+    _print_stats(stats, args)
 
 def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -113,6 +144,8 @@ def build_arg_parser() -> argparse.ArgumentParser:
         help="Directorio donde guardar los diagramas (.dot y opcionalmente .png).",
         default=".",
     )
+    _add_build_options(p_regex)
+    _add_output_options(p_regex)
     p_regex.set_defaults(func=cmd_from_regex)
 
     # from-definition
@@ -135,8 +168,14 @@ def build_arg_parser() -> argparse.ArgumentParser:
         help="Directorio donde guardar los diagramas (.dot y opcionalmente .png).",
         default=".",
     )
+    _add_build_options(p_def)
+    _add_output_options(p_def)
     p_def.set_defaults(func=cmd_from_definition)
 
+    # match / search
+    add_match_parser(subparsers)
+    add_search_parser(subparsers)
+
     return parser
 
 def main(argv: Any = None) -> None:
@@ -0,0 +1,163 @@
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import sys
+import time
+from collections import deque
+from typing import Any, Deque, Iterable, Iterator, List, TextIO, Tuple
+
+from .common import _matcher_from_args, _add_build_options, _add_cache_option
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# Matcher installed in each worker process by _init_worker
+_worker_matcher: Any = None
+
+def _init_worker(matcher: Any) -> None:
+    global _worker_matcher
+    _worker_matcher = matcher
+
+def _format_chunk(lines: List[str], fmt: str) -> Tuple[str, int]:
+    """Match a chunk with the installed matcher and render its output rows."""
+    accepts = _worker_matcher.accepts
+    flags = [accepts(s) for s in lines]
+    if fmt == "csv":
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerows(
+            (s, "true" if f else "false") for s, f in zip(lines, flags))
+        text = buf.getvalue()
+    else:
+        dumps = json.dumps
+        text = "".join(
+            f'{{"input": {dumps(s, ensure_ascii=False)}, "accepted": {"true" if f else "false"}}}\n'
+            for s, f in zip(lines, flags))
+    return text, sum(flags)
+
+def _read_lines(stream: TextIO) -> Iterator[str]:
+    for line in stream:
+        yield line.rstrip("\r\n")
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    it = iter(lines)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def run_match(matcher: Any, source: TextIO, sink: TextIO, fmt: str = "jsonl",
+              workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """Match every line of `source` and stream the results to `sink`.
+
+    With ``workers > 1`` chunks of ``chunk_size`` lines are matched and
+    rendered in a process pool; at most ``2 * workers`` chunks are in
+    flight, so memory stays bounded and results are written in input order.
+    Returns the throughput stats.
+    """
+    if fmt == "csv":
+        sink.write("input,accepted\n")
+    total = accepted = 0
+    t0 = time.perf_counter()
+
+    if workers <= 1:
+        _init_worker(matcher)
+        for chunk in _chunks(_read_lines(source), chunk_size):
+            text, n_accepted = _format_chunk(chunk, fmt)
+            sink.write(text)
+            accepted += n_accepted
+            total += len(chunk)
+    else:
+        # Deferred: spawning machinery is only needed for --workers > 1.
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(matcher,)) as pool:
+            pending: Deque[Tuple[int, Any]] = deque()
+            for chunk in _chunks(_read_lines(source), chunk_size):
+                pending.append((len(chunk), pool.submit(_format_chunk, chunk, fmt)))
+                if len(pending) >= 2 * workers:
+                    size, future = pending.popleft()
+                    text, n_accepted = future.result()
+                    sink.write(text)
+                    accepted += n_accepted
+                    total += size
+            while pending:
+                size, future = pending.popleft()
+                text, n_accepted = future.result()
+                sink.write(text)
+                accepted += n_accepted
+                total += size
+
+    sink.flush()
+    elapsed = time.perf_counter() - t0
+    return {
+        "lines": total,
+        "accepted": accepted,
+        "rejected": total - accepted,
+        "seconds": elapsed,
+        "lines_per_second": total / elapsed if elapsed > 0 else 0.0,
+    }
+
+def cmd_match(args: argparse.Namespace) -> None:
+    matcher = _matcher_from_args(args)
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8",
+                                                      newline="")
+    try:
+        stats = run_match(matcher, source, sink, fmt=args.format,
+                          workers=args.workers, chunk_size=args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(f"{stats['lines']} cadenas ({stats['accepted']} aceptadas, "
+          f"{stats['rejected']} rechazadas) en {stats['seconds']:.3f} s "
+          f"({stats['lines_per_second']:,.0f} cadenas/s)", file=sys.stderr)
+
+def add_match_parser(subparsers: Any) -> argparse.ArgumentParser:
+    p_match = subparsers.add_parser(
+        "match",
+        help="Validar en bloque cadenas (una por línea) leídas de un archivo o stdin.",
+    )
+    source = p_match.add_mutually_exclusive_group(required=True)
+    source.add_argument("--regex", help="Expresión regular contra la que validar.")
+    source.add_argument("--definition", help="Archivo JSON con la quíntupla del autómata.")
+    source.add_argument("--keywords", help="Archivo de palabras clave (una por línea) contra las que validar.")
+    p_match.add_argument(
+        "--input",
+        default="-",
+        help="Archivo con una cadena por línea ('-' para stdin, por defecto).",
+    )
+    p_match.add_argument(
+        "--output",
+        default="-",
+        help="Archivo de resultados ('-' para stdout, por defecto).",
+    )
+    p_match.add_argument(
+        "--format",
+        choices=["jsonl", "csv"],
+        default="jsonl",
+        help="Formato de salida de los resultados.",
+    )
+    p_match.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Número de procesos para validar en paralelo (1 = sin pool).",
+    )
+    p_match.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Cadenas por bloque enviado a cada proceso.",
+    )
+    _add_build_options(p_match)
+    _add_cache_option(p_match)
+    p_match.set_defaults(func=cmd_match)
+    return p_match
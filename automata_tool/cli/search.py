@@ -0,0 +1,60 @@
+
+import argparse
+import json
+import sys
+from typing import Any
+
+from automata_tool.automata.compiled import CompiledDFA
+from automata_tool.automata.search import DFASearcher
+from .common import _matcher_from_args, _add_build_options, _add_cache_option
+
+def cmd_search(args: argparse.Namespace) -> None:
+    compiled = _matcher_from_args(args)
+    if not isinstance(compiled, CompiledDFA):
+        raise SystemExit("search necesita un DFA: se superó el límite de la "
+                         "construcción de subconjuntos")
+    searcher = DFASearcher(compiled)
+
+    out = sys.stdout
+    total = 0
+    for path in args.files:
+        for start, end in searcher.search_file(path):
+            total += 1
+            if args.format == "jsonl":
+                out.write(json.dumps({"file": path, "start": start, "end": end},
+                                     ensure_ascii=False) + "\n")
+            else:
+                out.write(f"{path}\t{start}\t{end}\n")
+    out.flush()
+    print(f"{total} coincidencias", file=sys.stderr)
+
+def add_search_parser(subparsers: Any) -> argparse.ArgumentParser:
+    p_search = subparsers.add_parser(
+        "search",
+        help="Buscar todas las apariciones (más a la izquierda, más largas) en archivos.",
+    )
+    source = p_search.add_mutually_exclusive_group(required=True)
+    source.add_argument("--regex", help="Expresión regular a buscar.")
+    source.add_argument("--definition", help="Archivo JSON con la quíntupla del autómata.")
+    source.add_argument("--keywords", help="Archivo de palabras clave (una por línea) a buscar.")
+    p_search.add_argument(
+        "files",
+        nargs="+",
+        help="Archivos donde buscar (se leen con mmap; los offsets son en bytes).",
+    )
+    p_search.add_argument(
+        "--format",
+        choices=["tsv", "jsonl"],
+        default="tsv",
+        help="Formato de salida: 'archivo<TAB>inicio<TAB>fin' o JSONL.",
+    )
+    p_search.add_argument(
+        "--utf8",
+        action="store_true",
+        help="Leer los archivos como UTF-8 (autómata sobre bytes); por defecto cada "
+             "byte se interpreta como un carácter Latin-1.",
+    )
+    _add_build_options(p_search)
+    _add_cache_option(p_search)
+    p_search.set_defaults(func=cmd_search)
+    return p_search
@@ -1,12 +1,59 @@
+from importlib import import_module
 
 from .factory import AutomatonFactory
+from .result import FactoryResult
 from .definitions import AutomatonDefinition, EPSILON_SYMBOL
-from .validator import is_string_accepted_by_regex, is_string_accepted_by_definition
+
+# Everything else is imported on first access, so that importing the package
+# (e.g. for CLI startup) does not pay for the caches, the instrumentation or
+# the multi-pattern matcher.
+_LAZY = {
+    "AutomatonCache": ".cache",
+    "CacheStats": ".cache",
+    "CompiledAutomaton": ".cache",
+    "compile_regex": ".cache",
+    "compile_definition": ".cache",
+    "compile_pike": ".cache",
+    "set_cache_size": ".cache",
+    "cache_stats": ".cache",
+    "clear_cache": ".cache",
+    "ArtifactCache": ".disk_cache",
+    "StageStats": ".instrument",
+    "StatsCollector": ".instrument",
+    "RegexSet": ".regex_set",
+    "LexToken": ".regex_set",
+    "is_string_accepted_by_regex": ".validator",
+    "is_string_accepted_by_definition": ".validator",
+    "match": ".validator",
+}
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(import_module(module, __name__), name)
+    return value
 
 __all__ = [
     "AutomatonFactory",
+    "FactoryResult",
     "AutomatonDefinition",
     "EPSILON_SYMBOL",
+    "AutomatonCache",
+    "CacheStats",
+    "CompiledAutomaton",
+    "compile_regex",
+    "compile_definition",
+    "compile_pike",
+    "set_cache_size",
+    "cache_stats",
+    "clear_cache",
+    "ArtifactCache",
+    "StageStats",
+    "StatsCollector",
+    "RegexSet",
+    "LexToken",
     "is_string_accepted_by_regex",
     "is_string_accepted_by_definition",
+    "match",
 ]
@@ -0,0 +1,181 @@
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping, Optional, TypeVar
+
+from automata_tool.automata.dfa import DFA
+from automata_tool.automata.compiled import CompiledDFA
+from automata_tool.automata.nfa import NFA
+from automata_tool.automata.pike import PikeVM
+from .definitions import AutomatonDefinition
+from .factory import AutomatonFactory
+
+DEFAULT_CACHE_SIZE = 256
+
+T = TypeVar("T")
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+class CompiledAutomaton:
+    """A regex or definition compiled once, ready to test many strings."""
+
+    def __init__(self, key: str, result: Mapping[str, Any]) -> None:
+        self.key = key
+        self.result = result
+        dfa = result["dfa"]
+        # Without a DFA (budget exceeded with nfa_fallback) match on the NFA.
+        self.compiled = CompiledDFA.from_dfa(dfa) if dfa is not None else result["matcher"]
+
+    @property
+    def nfa(self) -> NFA:
+        return self.result["nfa"]
+
+    @property
+    def dfa(self) -> Optional[DFA]:
+        return self.result["dfa"]
+
+    def accepts(self, s: str) -> bool:
+        return self.compiled.accepts(s)
+
+    def __repr__(self) -> str:
+        return f"CompiledAutomaton({self.key!r})"
+
+class AutomatonCache:
+    """Bounded, thread-safe LRU cache of compiled automata.
+
+    Entries are :class:`CompiledAutomaton` objects, or any other matcher
+    stored with :meth:`get_or_build` (e.g. a :class:`PikeVM`) under a key of
+    its own kind. ``maxsize=0`` disables caching: every lookup compiles and
+    nothing is stored. Compilation runs outside the lock, so two threads missing on the
+    same key at once may both compile it; the last one stored wins.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        if maxsize < 0:
+            raise ValueError("El tamaño de la caché no puede ser negativo")
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def get_or_compile(self, key: str,
+                       compile_fn: Callable[[], Mapping[str, Any]]) -> CompiledAutomaton:
+        return self.get_or_build(key, lambda: CompiledAutomaton(key, compile_fn()))
+
+    def get_or_build(self, key: str, build_fn: Callable[[], T]) -> T:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry
+            self._misses += 1
+
+        entry = build_fn()
+
+        with self._lock:
+            if self._maxsize > 0:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                self._evict()
+        return entry
+
+    def resize(self, maxsize: int) -> None:
+        """Change the capacity; 0 turns the cache off and drops every entry."""
+        if maxsize < 0:
+            raise ValueError("El tamaño de la caché no puede ser negativo")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions,
+                              len(self._entries), self._maxsize)
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+def regex_key(regex: str) -> str:
+    return "regex:" + regex
+
+def pike_key(regex: str) -> str:
+    return "pike:" + regex
+
+def keywords_key(keywords: Iterable[str]) -> str:
+    """Hash of a keyword set, independent of order and duplicates."""
+    blob = "\n".join(sorted(set(keywords)))
+    return "kw:" + hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+def definition_key(definition: AutomatonDefinition) -> str:
+    """Canonical hash of a definition, independent of set/list ordering."""
+    tf = {}
+    for state, trans in definition.transition_function.items():
+        tf[state] = {
+            symbol: sorted(dest) if isinstance(dest, (list, tuple, set)) else dest
+            for symbol, dest in trans.items()
+        }
+    data = definition.to_dict()
+    data["kind"] = data["kind"].upper()
+    data["transition_function"] = tf
+    blob = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return "def:" + hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+_default_cache = AutomatonCache()
+
+def get_default_cache() -> AutomatonCache:
+    return _default_cache
+
+def set_cache_size(maxsize: int) -> None:
+    """Resize the module-level cache (0 disables it)."""
+    _default_cache.resize(maxsize)
+
+def cache_stats() -> CacheStats:
+    return _default_cache.stats()
+
+def clear_cache() -> None:
+    _default_cache.clear()
+
+def compile_regex(regex: str, cache: Optional[AutomatonCache] = None) -> CompiledAutomaton:
+    """Compile a regex once (or fetch it from the cache) for repeated matching."""
+    cache = _default_cache if cache is None else cache
+    return cache.get_or_compile(regex_key(regex),
+                                lambda: AutomatonFactory().from_regex(regex))
+
+def compile_definition(definition: AutomatonDefinition,
+                       cache: Optional[AutomatonCache] = None) -> CompiledAutomaton:
+    """Compile a 5-tuple definition once (or fetch it from the cache)."""
+    cache = _default_cache if cache is None else cache
+    return cache.get_or_compile(definition_key(definition),
+                                lambda: AutomatonFactory().from_definition(definition))
+
+def compile_pike(regex: str, cache: Optional[AutomatonCache] = None) -> PikeVM:
+    """Compile a regex with capture groups to a PikeVM once (or fetch it from the cache)."""
+    cache = _default_cache if cache is None else cache
+    return cache.get_or_build(pike_key(regex),
+                              lambda: AutomatonFactory().pike_from_regex(regex))
@@ -2,11 +2,19 @@
 from dataclasses import dataclass
 from typing import Set, Dict, Any
 
+from automata_tool.automata.charset import is_class_label, label_intervals
+
 EPSILON_SYMBOL = "ε"
 
 @dataclass
 class AutomatonDefinition:
-    """Simple container for an automaton 5-tuple definition."""
+    """Simple container for an automaton 5-tuple definition.
+
+    Symbols are opaque strings, except that with ``char_classes=True`` a
+    symbol written ``[...]`` is a character class with the regex syntax
+    (e.g. ``"[a-z]"``, ``"[^0-9]"``). Without it such symbols are rejected
+    by :meth:`check_symbols` rather than silently read as classes.
+    """
 
     kind: str  # "NFA" or "DFA"
     states: Set[str]
@@ -14,9 +22,10 @@ class AutomatonDefinition:
     initial_state: str
     final_states: Set[str]
     transition_function: Dict[str, Dict[str, Any]]
+    char_classes: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        data = {
             "kind": self.kind,
             "states": sorted(self.states),
             "alphabet": sorted(self.alphabet),
@@ -24,6 +33,34 @@ class AutomatonDefinition:
             "final_states": sorted(self.final_states),
             "transition_function": self.transition_function,
         }
+        if self.char_classes:
+            data["char_classes"] = True
+        return data
+
+    def check_symbols(self) -> None:
+        """Raise ValueError for a ``[...]`` symbol that is not a usable class.
+
+        A symbol spelled like a character class is only accepted when
+        ``char_classes`` is set, and must then be a valid class. This keeps
+        a definition written with an opaque symbol such as ``"[ab]"`` from
+        matching ``a`` or ``b``: it has to be renamed or opted in.
+        """
+        symbols = set(self.alphabet)
+        for trans in self.transition_function.values():
+            symbols.update(trans)
+        for symbol in sorted(symbols):
+            if not is_class_label(symbol):
+                continue
+            if not self.char_classes:
+                raise ValueError(
+                    f"El símbolo {symbol!r} tiene forma de clase de caracteres: declara "
+                    f"\"char_classes\": true para usarlo como clase, o renómbralo")
+            try:
+                valid = bool(label_intervals(symbol))
+            except SyntaxError as exc:
+                raise ValueError(f"Clase de caracteres inválida {symbol!r}: {exc}") from exc
+            if not valid:
+                raise ValueError(f"Clase de caracteres inválida o vacía: {symbol!r}")
 
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> "AutomatonDefinition":
@@ -42,4 +79,5 @@ class AutomatonDefinition:
             initial_state=initial_state,
             final_states=final_states,
             transition_function=transition_function,
+            char_classes=bool(data.get("char_classes", False)),
         )
@@ -0,0 +1,92 @@
+
+import hashlib
+import os
+import tempfile
+from typing import Callable, Optional
+
+from automata_tool.automata.compiled import CompiledDFA
+from automata_tool.automata.binary import FORMAT_VERSION, dumps_compiled, load_compiled
+from .definitions import AutomatonDefinition
+from .factory import AutomatonFactory
+from .cache import regex_key, definition_key
+
+class ArtifactCache:
+    """Content-addressed on-disk cache of compiled DFAs.
+
+    Each entry is one file in the binary format of
+    :mod:`automata_tool.automata.binary`, named after the SHA-256 of the
+    source key (regex text or definition hash), the binary format version
+    and the factory options that change the result. Hits are mapped with
+    ``mmap``, so a restarted service or a new CLI run skips compilation and
+    does not copy the table. Files are written atomically.
+    """
+
+    SUFFIX = ".atdfa"
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        digest = hashlib.sha256(f"v{FORMAT_VERSION}:{key}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + self.SUFFIX)
+
+    def get(self, key: str) -> Optional[CompiledDFA]:
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            return load_compiled(path)
+        except (ValueError, OSError):
+            # Corrupt or foreign file: treat as a miss, it will be rewritten.
+            return None
+
+    def put(self, key: str, compiled: CompiledDFA) -> str:
+        path = self.path_for(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(dumps_compiled(compiled))
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return path
+
+    def get_or_compile(self, key: str,
+                       compile_fn: Callable[[], CompiledDFA]) -> CompiledDFA:
+        compiled = self.get(key)
+        if compiled is None:
+            compiled = compile_fn()
+            self.put(key, compiled)
+        return compiled
+
+    def compile_regex(self, regex: str,
+                      factory: Optional[AutomatonFactory] = None) -> CompiledDFA:
+        factory = factory or AutomatonFactory()
+        return self.get_or_compile(
+            self.key(regex_key(regex), factory),
+            lambda: factory.compile_dfa(self._require_dfa(factory.from_regex(regex))))
+
+    def compile_definition(self, definition: AutomatonDefinition,
+                           factory: Optional[AutomatonFactory] = None) -> CompiledDFA:
+        factory = factory or AutomatonFactory()
+        # Checked before the lookup too, so a stored artifact cannot bypass it.
+        definition.check_symbols()
+        return self.get_or_compile(
+            self.key(definition_key(definition), factory),
+            lambda: factory.compile_dfa(self._require_dfa(factory.from_definition(definition))))
+
+    @staticmethod
+    def key(source_key: str, factory: AutomatonFactory) -> str:
+        """Cache key for a regex/definition key built with `factory`'s options."""
+        key = f"{source_key}|min={int(factory.minimize)}"
+        return key + "|bytes=1" if factory.byte_mode else key
+
+    @staticmethod
+    def _require_dfa(result: dict):
+        if result["dfa"] is None:
+            raise ValueError("No se puede guardar en caché un autómata sin DFA "
+                             "(se superó el límite de la construcción de subconjuntos)")
+        return result["dfa"]
@@ -1,62 +1,280 @@
 
-from typing import Dict, Any
+from typing import Callable, Dict, Iterable, Optional, Tuple
 
 from automata_tool.automata.nfa import NFA
 from automata_tool.automata.dfa import DFA
+from automata_tool.automata.compiled import CompiledDFA
+from automata_tool.automata.lazy import LazyDFA, DEFAULT_MAX_STATES
+from automata_tool.automata.bitset import BitsetNFA
+from automata_tool.automata.charset import has_classes
 from automata_tool.regex.parser import Parser
+from automata_tool.regex.ast import RegexNode
+from automata_tool.regex.simplify import simplify, count_nodes
 from automata_tool.builders.thompson import ThompsonBuilder
-from automata_tool.builders.subset import SubsetConstruction
+from automata_tool.builders.glushkov import GlushkovBuilder
+from automata_tool.builders.direct import DirectDFABuilder
+from automata_tool.builders.subset import SubsetConstruction, StateExplosionError
 from .definitions import AutomatonDefinition, EPSILON_SYMBOL
+from .result import FactoryResult
+from .instrument import Observer, run_stage, automaton_counters
+
+# Regex -> NFA constructions selectable with AutomatonFactory(builder=...)
+NFA_BUILDERS = {
+    "thompson": ThompsonBuilder,
+    "glushkov": GlushkovBuilder,
+}
 
 class AutomatonFactory:
-    """High-level factory to construct NFAs/DFAs from regex or quintuple definitions."""
+    """High-level factory to construct NFAs/DFAs from regex or quintuple definitions.
 
-    def from_regex(self, regex: str) -> Dict[str, Any]:
-        """Build NFA and DFA from a regular expression string."""
-        parser = Parser(regex)
-        ast_root = parser.parse()
+    With ``minimize=True`` the DFA is passed through Hopcroft minimization
+    before being returned; ``result["minimization"]`` then reports the state
+    counts before and after (it is None otherwise).
 
-        thompson = ThompsonBuilder()
-        nfa: NFA = thompson.build(ast_root)
+    ``max_dfa_states`` and ``max_build_time`` (seconds) bound subset
+    construction. When the budget is exceeded a ``StateExplosionError`` is
+    raised, unless ``nfa_fallback=True``: then ``result["dfa"]`` and
+    ``result["dfa_def"]`` are None and ``result["matcher"]`` simulates the
+    NFA instead. ``result["matcher"]`` is always the object to call
+    ``accepts`` on.
 
-        subset = SubsetConstruction()
-        dfa: DFA = subset.build(nfa)
+    Results are :class:`FactoryResult` mappings: each artifact is computed
+    the first time it is read.
 
-        nfa_def = self._definition_from_nfa(nfa)
-        dfa_def = self._definition_from_dfa(dfa)
+    ``builder`` picks the regex -> NFA construction: ``"thompson"`` (the
+    default, epsilon edges, about two states per AST node) or ``"glushkov"``
+    (epsilon-free, one state per literal position plus a start state).
 
-        return {
-            "nfa": nfa,
-            "dfa": dfa,
-            "nfa_def": nfa_def,
-            "dfa_def": dfa_def,
-        }
+    With ``direct_dfa=True`` (the default) ``from_regex`` builds the DFA
+    straight from the regex with followpos (:class:`DirectDFABuilder`) when
+    the NFA has not been read from the result yet, so match-only callers
+    never build an NFA; otherwise the DFA is the subset construction of the
+    NFA. Both accept the same language, but their state numbering may
+    differ.
+
+    With ``simplify=True`` (the default) the match-only artifacts (the DFA
+    built without an NFA, the NFA fallback matcher and ``lazy_from_regex``)
+    are built from the regex after
+    :func:`~automata_tool.regex.simplify.simplify`: redundant stars and
+    optionals, duplicated alternatives and alternations of single
+    characters are rewritten, so the builders see a smaller expression for
+    the same language. The ``"nfa"`` and ``"nfa_def"`` of the result, which
+    are meant to be shown, always follow the regex as written, and a DFA
+    determinized from that NFA keeps its symbols.
+
+    With ``byte_mode=True`` the automata read UTF-8 bytes instead of
+    characters: the regex is rewritten with
+    :func:`~automata_tool.regex.utf8.to_utf8` (and keywords are encoded)
+    before anything is built, so every symbol is a byte ``b``, written as
+    the label ``chr(b)``. Match ``bytes``, ``bytearray``, ``memoryview`` or
+    ``mmap`` input with ``CompiledDFA.accepts``, ``DFASearcher`` or
+    ``StreamMatcher``, which read it without decoding or copying.
 
-    def from_definition(self, definition: AutomatonDefinition) -> Dict[str, Any]:
+    ``observer`` (e.g. a :class:`~automata_tool.core.instrument.StatsCollector`)
+    is called with a ``StageStats`` after every stage that runs: parse,
+    simplify, thompson, subset, minimize, the definition conversions, ... With no
+    observer nothing is measured.
+    """
+
+    def __init__(self, minimize: bool = False,
+                 max_dfa_states: Optional[int] = None,
+                 max_build_time: Optional[float] = None,
+                 nfa_fallback: bool = False,
+                 observer: Optional[Observer] = None,
+                 builder: str = "thompson",
+                 direct_dfa: bool = True,
+                 simplify: bool = True,
+                 byte_mode: bool = False) -> None:
+        if builder not in NFA_BUILDERS:
+            raise ValueError(f"Constructor de NFA desconocido: {builder!r} "
+                             f"(opciones: {', '.join(NFA_BUILDERS)})")
+        self.minimize = minimize
+        self.max_dfa_states = max_dfa_states
+        self.max_build_time = max_build_time
+        self.nfa_fallback = nfa_fallback
+        self.observer = observer
+        self.builder = builder
+        self.direct_dfa = direct_dfa
+        self.simplify = simplify
+        self.byte_mode = byte_mode
+
+    def from_regex(self, regex: str) -> FactoryResult:
+        """Build NFA and DFA from a regular expression string.
+
+        The regex is parsed right away, so syntax errors surface here; the
+        automata and definitions are built when first read from the result.
+        """
+        ast_root = self._parse(regex)
+
+        result = FactoryResult()
+        result.define("nfa", lambda: self._build_nfa(ast_root))
+        result.define("_simplified", lambda: self._simplify(ast_root))
+        result.define("_raw_dfa", lambda: self._direct(result["_simplified"])
+                      if self.direct_dfa and not result.is_computed("nfa")
+                      else self._determinize(result["_match_nfa"]))
+        self._define_derived(result, lambda: result["nfa"] if result.is_computed("nfa")
+                             else self._build_nfa(result["_simplified"]))
+        return result
+
+    def from_definition(self, definition: AutomatonDefinition) -> FactoryResult:
         """Build both NFA and DFA starting from a 5-tuple definition.
 
         - If definition.kind == 'NFA', we build an NFA and then convert to DFA.
         - If definition.kind == 'DFA', we build a DFA and then a trivial NFA.
+
+        Symbols spelled ``[...]`` are only allowed as character classes, in a
+        definition with ``char_classes=True`` (see
+        :meth:`AutomatonDefinition.check_symbols`).
         """
         kind = definition.kind.upper()
+        definition.check_symbols()
+        result = FactoryResult()
         if kind == "NFA":
-            nfa = self._nfa_from_definition(definition)
-            subset = SubsetConstruction()
-            dfa = subset.build(nfa)
+            nfa = run_stage(self.observer, "load_definition",
+                            lambda: self._nfa_from_definition(definition), automaton_counters)
+            result.set("nfa", nfa)
+            result.define("_raw_dfa", lambda: self._determinize(nfa))
         elif kind == "DFA":
-            dfa = self._dfa_from_definition(definition)
-            nfa = self._nfa_from_dfa(dfa)
+            dfa = run_stage(self.observer, "load_definition",
+                            lambda: self._dfa_from_definition(definition), automaton_counters)
+            result.define("nfa", lambda: run_stage(self.observer, "dfa_to_nfa",
+                                                   lambda: self._nfa_from_dfa(dfa)))
+            result.set("_raw_dfa", dfa)
         else:
             raise ValueError("AutomatonDefinition.kind debe ser 'NFA' o 'DFA'")
+        self._define_derived(result)
+        return result
+
+    def from_keywords(self, keywords: Iterable[str]) -> FactoryResult:
+        """Build the automata of a finite keyword set (the regex ``kw1|kw2|...``).
+
+        The DFA is the minimal acyclic one, built directly with
+        :class:`DafsaBuilder` in time proportional to the total keyword
+        length; keyword characters are taken literally. The NFA is that DFA
+        viewed as an NFA, built only if read.
+        """
+        from automata_tool.builders.dafsa import DafsaBuilder
+        dafsa = DafsaBuilder()
+        if self.byte_mode:
+            keywords = [kw.encode("utf-8").decode("latin-1") for kw in keywords]
+        dfa = run_stage(self.observer, "dafsa", lambda: dafsa.build(keywords),
+                        lambda d: {**automaton_counters(d), **dafsa.stats})
+        result = FactoryResult()
+        result.define("nfa", lambda: run_stage(self.observer, "dfa_to_nfa",
+                                               lambda: self._nfa_from_dfa(dfa)))
+        result.set("_raw_dfa", dfa)
+        self._define_derived(result)
+        return result
+
+    def compile_dfa(self, dfa: DFA) -> CompiledDFA:
+        """Compile any DFA into an array-backed table for fast matching."""
+        return CompiledDFA.from_dfa(dfa)
+
+    def lazy_from_regex(self, regex: str, max_states: int = DEFAULT_MAX_STATES) -> LazyDFA:
+        """Build only the NFA and return a matcher that creates DFA states on demand.
+
+        Use it for patterns whose full subset construction explodes.
+        """
+        nfa = self._build_nfa(self._simplify(self._parse(regex)))
+        return LazyDFA(nfa, max_states=max_states)
+
+    def pike_from_regex(self, regex: str) -> "PikeVM":
+        """Compile a regex with capturing groups for submatch extraction.
+
+        Every parenthesis is a group; ``match(text)`` on the returned
+        :class:`PikeVM` gives the span of each one in linear time. The
+        regex is not simplified, since that would change the groups.
+        """
+        from automata_tool.automata.pike import PikeVM
+        from automata_tool.builders.pike import PikeCompiler
+        parser = Parser(regex, captures=True)
+        ast_root = run_stage(self.observer, "parse", parser.parse,
+                             lambda _: {"regex_length": len(regex)})
+        program = run_stage(self.observer, "pike",
+                            lambda: PikeCompiler().build(ast_root, parser.groups),
+                            lambda p: {"instructions": len(p), "groups": p.num_groups})
+        return PikeVM(program)
+
+    def _parse(self, regex: str) -> RegexNode:
+        ast_root = run_stage(self.observer, "parse", lambda: Parser(regex).parse(),
+                             lambda _: {"regex_length": len(regex)})
+        if self.byte_mode:
+            from automata_tool.regex.utf8 import to_utf8
+            parsed = ast_root
+            ast_root = run_stage(self.observer, "utf8", lambda: to_utf8(parsed),
+                                 lambda encoded: {"nodes_before": count_nodes(parsed),
+                                                  "nodes_after": count_nodes(encoded)})
+        return ast_root
+
+    def _simplify(self, ast_root: RegexNode) -> RegexNode:
+        if not self.simplify:
+            return ast_root
+        return run_stage(self.observer, "simplify", lambda: simplify(ast_root),
+                         lambda simplified: {"nodes_before": count_nodes(ast_root),
+                                             "nodes_after": count_nodes(simplified)})
+
+    def _build_nfa(self, ast_root: RegexNode) -> NFA:
+        builder = NFA_BUILDERS[self.builder]()
+        return run_stage(self.observer, self.builder,
+                         lambda: builder.build(ast_root), automaton_counters)
+
+    def _direct(self, ast_root: RegexNode) -> Optional[DFA]:
+        direct = DirectDFABuilder(max_states=self.max_dfa_states,
+                                  max_time=self.max_build_time)
+        try:
+            return run_stage(self.observer, "direct_dfa", lambda: direct.build(ast_root),
+                             lambda dfa: {**automaton_counters(dfa), **direct.stats})
+        except StateExplosionError:
+            if not self.nfa_fallback:
+                raise
+            return None
+
+    def _determinize(self, nfa: NFA) -> Optional[DFA]:
+        subset = SubsetConstruction(max_states=self.max_dfa_states,
+                                    max_time=self.max_build_time)
+        try:
+            return run_stage(self.observer, "subset", lambda: subset.build(nfa),
+                             lambda dfa: {**automaton_counters(dfa), **subset.stats})
+        except StateExplosionError:
+            if not self.nfa_fallback:
+                raise
+            return None
+
+    def _define_derived(self, result: FactoryResult,
+                        match_nfa: Optional[Callable[[], NFA]] = None) -> None:
+        """Register the artifacts derived from the "nfa" and "_raw_dfa" stages.
+
+        `match_nfa` builds the NFA used only for matching ("_match_nfa"),
+        when it may differ from the displayed "nfa".
+        """
+        result.define("_match_nfa", match_nfa or (lambda: result["nfa"]))
+        result.define("_dfa_stage", lambda: self._maybe_minimize(result["_raw_dfa"]))
+        result.define("dfa", lambda: result["_dfa_stage"][0])
+        result.define("nfa_def", lambda: self._stage_definition("nfa_def", result["nfa"]))
+        result.define("dfa_def", lambda: None if result["dfa"] is None
+                      else self._stage_definition("dfa_def", result["dfa"]))
+        result.define("minimization", lambda: result["_dfa_stage"][1])
+        result.define("matcher", lambda: result["dfa"] if result["dfa"] is not None
+                      else self._bitset_matcher(result["_match_nfa"]))
+
+    def _stage_definition(self, stage: str, automaton) -> AutomatonDefinition:
+        convert = self._definition_from_dfa if isinstance(automaton, DFA) else self._definition_from_nfa
+        return run_stage(self.observer, stage, lambda: convert(automaton),
+                         lambda d: {"states": len(d.states)})
 
-        nfa_def = self._definition_from_nfa(nfa)
-        dfa_def = self._definition_from_dfa(dfa)
+    def _bitset_matcher(self, nfa: NFA) -> BitsetNFA:
+        return run_stage(self.observer, "bitset_nfa", lambda: BitsetNFA(nfa),
+                         lambda b: {"states": len(b.state_names)})
 
-        return {
-            "nfa": nfa,
-            "dfa": dfa,
-            "nfa_def": nfa_def,
-            "dfa_def": dfa_def,
+    def _maybe_minimize(self, dfa: Optional[DFA]) -> Tuple[Optional[DFA], Optional[Dict[str, int]]]:
+        if dfa is None or not self.minimize:
+            return dfa, None
+        from automata_tool.builders.minimize import HopcroftMinimizer
+        minimal = run_stage(self.observer, "minimize",
+                            lambda: HopcroftMinimizer().build(dfa), automaton_counters)
+        return minimal, {
+            "states_before": len(dfa.states),
+            "states_after": len(minimal.states),
         }
 
     # ---- helpers to go from definitions to objects ----
@@ -138,6 +356,7 @@ class AutomatonFactory:
             initial_state=nfa.initial_state,
             final_states=set(nfa.final_states),
             transition_function=tf,
+            char_classes=has_classes(nfa.alphabet),
         )
 
     def _definition_from_dfa(self, dfa: DFA) -> AutomatonDefinition:
@@ -153,4 +372,5 @@ class AutomatonFactory:
             initial_state=dfa.initial_state,
             final_states=set(dfa.final_states),
             transition_function=tf,
+            char_classes=has_classes(dfa.alphabet),
         )
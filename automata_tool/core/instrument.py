@@ -0,0 +1,109 @@
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+
+from automata_tool.automata.nfa import NFA
+from automata_tool.automata.dfa import DFA
+
+T = TypeVar("T")
+
+@dataclass
+class StageStats:
+    stage: str
+    seconds: float
+    peak_memory: Optional[int] = None  # bytes; only when tracing memory
+    counters: Dict[str, int] = field(default_factory=dict)
+
+# An observer is any callable taking a StageStats. It may define a
+# ``trace_memory`` attribute to ask for peak-memory measurements.
+Observer = Callable[[StageStats], None]
+
+def count_transitions(automaton: Union[NFA, DFA]) -> int:
+    if isinstance(automaton, NFA):
+        return sum(len(dests) for inner in automaton.transitions.values()
+                   for dests in inner.values())
+    return sum(len(inner) for inner in automaton.transitions.values())
+
+def automaton_counters(automaton: Optional[Union[NFA, DFA]]) -> Dict[str, int]:
+    if automaton is None:
+        return {}
+    return {"states": len(automaton.states),
+            "transitions": count_transitions(automaton)}
+
+def run_stage(observer: Optional[Observer], stage: str, fn: Callable[[], T],
+              counters: Optional[Callable[[T], Dict[str, int]]] = None) -> T:
+    """Run `fn` as pipeline stage `stage` and report it to `observer`.
+
+    Without an observer this is a plain call. Otherwise the wall time (and,
+    if ``observer.trace_memory`` is true, the peak traced memory) of the
+    call is measured, ``counters(value)`` is evaluated and the resulting
+    :class:`StageStats` is passed to the observer. Stages must not nest when
+    memory is traced.
+    """
+    if observer is None:
+        return fn()
+    trace = getattr(observer, "trace_memory", False)
+    started_tracing = False
+    if trace:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    try:
+        value = fn()
+    finally:
+        elapsed = time.perf_counter() - t0
+        peak = None
+        if trace:
+            peak = max(0, tracemalloc.get_traced_memory()[1] - base)
+            if started_tracing:
+                tracemalloc.stop()
+    observer(StageStats(stage, elapsed, peak, counters(value) if counters else {}))
+    return value
+
+class StatsCollector:
+    """Observer that keeps every reported stage, in order.
+
+    Pass it as ``AutomatonFactory(observer=StatsCollector())``; with
+    ``trace_memory=True`` each stage also reports its peak memory (through
+    ``tracemalloc``, which slows the stages down noticeably).
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.stages: List[StageStats] = []
+
+    def __call__(self, stats: StageStats) -> None:
+        self.stages.append(stats)
+
+    def stage(self, stage: str, fn: Callable[[], T],
+              counters: Optional[Callable[[T], Dict[str, int]]] = None) -> T:
+        """Measure a stage run outside the factory (e.g. diagram output)."""
+        return run_stage(self, stage, fn, counters)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(s.seconds for s in self.stages)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_seconds": self.total_seconds,
+            "stages": [
+                {"stage": s.stage, "seconds": s.seconds,
+                 "peak_memory": s.peak_memory, "counters": dict(s.counters)}
+                for s in self.stages
+            ],
+        }
+
+    def format_table(self) -> str:
+        lines = [f"{'etapa':<14} {'tiempo (ms)':>12} {'memoria (KiB)':>14}  contadores"]
+        for s in self.stages:
+            memory = "-" if s.peak_memory is None else f"{s.peak_memory / 1024:.1f}"
+            counters = ", ".join(f"{k}={v}" for k, v in s.counters.items())
+            lines.append(f"{s.stage:<14} {s.seconds * 1e3:12.3f} {memory:>14}  {counters}")
+        lines.append(f"{'total':<14} {self.total_seconds * 1e3:12.3f}")
+        return "\n".join(lines)
@@ -0,0 +1,135 @@
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Set
+
+from automata_tool.automata.nfa import NFA
+from automata_tool.automata.dfa import DFA
+from automata_tool.automata.compiled import CompiledDFA
+from automata_tool.regex.parser import Parser
+from automata_tool.regex.simplify import simplify
+from automata_tool.builders.thompson import ThompsonBuilder
+from automata_tool.builders.subset import SubsetConstruction
+
+@dataclass(frozen=True)
+class LexToken:
+    pattern: int  # index of the pattern in the RegexSet
+    start: int
+    end: int
+    text: str
+
+class RegexSet:
+    """N regular expressions compiled into one DFA tagged with pattern ids.
+
+    The Thompson NFAs of all patterns are joined under a fresh start state
+    and determinized once; every DFA state carries the set of patterns whose
+    final state it contains. One scan of the input then tells which patterns
+    match it (:meth:`matches`), and :meth:`tokenize` uses the same table as
+    a maximal-munch lexer in which ties between patterns are broken by
+    ``priorities`` (lower wins; by default the pattern order).
+    """
+
+    START_STATE = "q_start"
+
+    def __init__(self, patterns: Sequence[str],
+                 priorities: Optional[Sequence[int]] = None,
+                 max_dfa_states: Optional[int] = None,
+                 max_build_time: Optional[float] = None) -> None:
+        if not patterns:
+            raise ValueError("RegexSet necesita al menos un patrón")
+        if priorities is None:
+            priorities = range(len(patterns))
+        if len(priorities) != len(patterns):
+            raise ValueError("Debe haber una prioridad por patrón")
+        self.patterns = list(patterns)
+        self.priorities = list(priorities)
+
+        self.nfa = self._combined_nfa()
+        subset = SubsetConstruction(max_states=max_dfa_states, max_time=max_build_time)
+        self.dfa: DFA = subset.build(self.nfa)
+
+        self.tags: Dict[str, FrozenSet[int]] = {}
+        for state in self.dfa.states:
+            self.tags[state] = frozenset(self._final_tag[s]
+                                         for s in subset.nfa_states(state)
+                                         if s in self._final_tag)
+        self.compiled = CompiledDFA.from_dfa(self.dfa)
+
+        # Per dense compiled state: matching pattern ids and the preferred one
+        self._state_tags: List[FrozenSet[int]] = [frozenset()]
+        self._state_winner: List[int] = [-1]
+        for name in self.compiled.state_names[1:]:
+            tags = self.tags[name]
+            self._state_tags.append(tags)
+            self._state_winner.append(
+                min(tags, key=lambda i: (self.priorities[i], i)) if tags else -1)
+
+    def _combined_nfa(self) -> NFA:
+        # One builder for every pattern keeps state names unique across them.
+        builder = ThompsonBuilder()
+        transitions: Dict[str, Dict[Optional[str], Set[str]]] = {self.START_STATE: {}}
+        states: Set[str] = {self.START_STATE}
+        alphabet: Set[str] = set()
+        self._final_tag: Dict[str, int] = {}
+        for i, pattern in enumerate(self.patterns):
+            nfa = builder.build(simplify(Parser(pattern).parse()))
+            transitions.update(nfa.transitions)
+            states |= nfa.states
+            alphabet |= nfa.alphabet
+            transitions[self.START_STATE].setdefault(NFA.EPSILON, set()).add(nfa.initial_state)
+            for final in nfa.final_states:
+                self._final_tag[final] = i
+        return NFA(states=states,
+                   alphabet=alphabet,
+                   initial_state=self.START_STATE,
+                   final_states=set(self._final_tag),
+                   transitions=transitions)
+
+    def matches(self, s: str) -> Set[int]:
+        """Ids of every pattern that matches the whole string `s`."""
+        compiled = self.compiled
+        table = compiled.table
+        lookup = compiled.lookup
+        state = compiled.start
+        for ch in s:
+            col = lookup(ch)
+            if col is None:
+                return set()
+            state = table[state + col]
+            if not state:
+                return set()
+        return set(self._state_tags[state // compiled.num_columns])
+
+    def is_match(self, s: str) -> bool:
+        return bool(self.matches(s))
+
+    def tokenize(self, text: str, pos: int = 0) -> Iterator[LexToken]:
+        """Split `text` into the longest tokens, left to right.
+
+        Raises ``ValueError`` at the first position where no pattern matches a
+        non-empty prefix.
+        """
+        compiled = self.compiled
+        table = compiled.table
+        lookup = compiled.lookup
+        width = compiled.num_columns
+        winner = self._state_winner
+        n = len(text)
+        while pos < n:
+            state = compiled.start
+            best_end, best_pattern = -1, -1
+            i = pos
+            while i < n:
+                col = lookup(text[i])
+                if col is None:
+                    break
+                state = table[state + col]
+                if not state:
+                    break
+                i += 1
+                w = winner[state // width]
+                if w >= 0:
+                    best_end, best_pattern = i, w
+            if best_end < 0:
+                raise ValueError(f"Ningún patrón reconoce la entrada en la posición {pos}")
+            yield LexToken(best_pattern, pos, best_end, text[pos:best_end])
+            pos = best_end
@@ -0,0 +1,46 @@
+
+from typing import Any, Callable, Dict, Iterator, Mapping
+
+class FactoryResult(Mapping):
+    """Read-only mapping whose artifacts are computed on first access.
+
+    ``AutomatonFactory`` registers one loader per key (``"nfa"``, ``"dfa"``,
+    ``"nfa_def"``, ...); a loader runs the first time its key is read and
+    its value is kept, so callers that only use the DFA never pay for the
+    definition conversions, and so on. Loaders may read other keys of the
+    same result. Keys starting with ``_`` are internal stages and are not
+    listed by iteration.
+    """
+
+    def __init__(self) -> None:
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._values: Dict[str, Any] = {}
+
+    def define(self, key: str, loader: Callable[[], Any]) -> None:
+        self._loaders[key] = loader
+
+    def set(self, key: str, value: Any) -> None:
+        self._loaders.setdefault(key, lambda: value)
+        self._values[key] = value
+
+    def is_computed(self, key: str) -> bool:
+        return key in self._values
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        value = self._values[key] = self._loaders[key]()
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in self._loaders if not key.startswith("_"))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        shown = ", ".join(f"{key}={'<computed>' if key in self._values else '<lazy>'}"
+                          for key in self)
+        return f"FactoryResult({shown})"
@@ -1,15 +1,20 @@
+from typing import List, Optional
 
-from .factory import AutomatonFactory
+from automata_tool.automata.pike import Span
 from .definitions import AutomatonDefinition
+from .cache import compile_regex, compile_definition, compile_pike
 
 def is_string_accepted_by_regex(regex: str, s: str) -> bool:
-    factory = AutomatonFactory()
-    result = factory.from_regex(regex)
-    dfa = result["dfa"]
-    return dfa.accepts(s)
+    return compile_regex(regex).accepts(s)
 
 def is_string_accepted_by_definition(definition: AutomatonDefinition, s: str) -> bool:
-    factory = AutomatonFactory()
-    result = factory.from_definition(definition)
-    dfa = result["dfa"]
-    return dfa.accepts(s)
+    return compile_definition(definition).accepts(s)
+
+def match(regex: str, s: str) -> Optional[List[Optional[Span]]]:
+    """Spans of the whole match and of every group if `s` matches `regex` entirely.
+
+    Item 0 is ``(0, len(s))`` and item ``k`` the ``(start, end)`` of the
+    ``k``-th parenthesis (None if it took no part); None if `s` does not
+    match. Runs in time linear in ``len(s)``.
+    """
+    return compile_pike(regex).match(s)
@@ -5,6 +5,10 @@ from automata_tool.automata.nfa import NFA
 from automata_tool.automata.dfa import DFA
 
 
+def _escape(label: str) -> str:
+    # Class labels such as [\-"] may contain quotes and backslashes
+    return label.replace("\\", "\\\\").replace('"', '\\"')
+
 def automaton_to_dot(automaton, name: str = "Automaton") -> str:
     """Return a Graphviz DOT representation of an NFA or DFA."""
     lines = [
@@ -26,13 +30,13 @@ def automaton_to_dot(automaton, name: str = "Automaton") -> str:
     if isinstance(automaton, NFA):
         for state, inner in automaton.transitions.items():
             for symbol, dests in inner.items():
-                label = symbol if symbol is not None else "ε"
+                label = _escape(symbol) if symbol is not None else "ε"
                 for dest in dests:
                     lines.append(f'  "{state}" -> "{dest}" [label="{label}"];')
     elif isinstance(automaton, DFA):
         for state, inner in automaton.transitions.items():
             for symbol, dest in inner.items():
-                lines.append(f'  "{state}" -> "{dest}" [label="{symbol}"];')
+                lines.append(f'  "{state}" -> "{dest}" [label="{_escape(symbol)}"];')
     else:
         raise TypeError("Solo se pueden dibujar NFAs o DFAs.")
 
@@ -40,6 +44,22 @@ def automaton_to_dot(automaton, name: str = "Automaton") -> str:
     return "\n".join(lines)
 
 
+_graphviz_module = None
+_graphviz_checked = False
+
+def _load_graphviz():
+    """Import the optional graphviz package once, on first use (None if missing)."""
+    global _graphviz_module, _graphviz_checked
+    if not _graphviz_checked:
+        _graphviz_checked = True
+        try:
+            import graphviz  # type: ignore
+            _graphviz_module = graphviz
+        except ImportError:
+            _graphviz_module = None
+    return _graphviz_module
+
+
 def save_automaton_diagram(automaton, filepath_base: str, name: Optional[str] = None) -> str:
     """Save DOT (and optionally PNG if graphviz is available) for the automaton.
 
@@ -55,13 +75,14 @@ def save_automaton_diagram(automaton, filepath_base: str, name: Optional[str] =
         f.write(dot)
 
     # Try to render PNG using graphviz (optional)
-    try:
-        import graphviz  # type: ignore
-        src = graphviz.Source(dot)
-        # cleanup=True removes intermediate .gv file if created
-        src.render(filepath_base, format="png", cleanup=True)
-    except Exception:
-        # If graphviz is not installed, silently ignore; the .dot file is still usable.
-        pass
+    graphviz = _load_graphviz()
+    if graphviz is not None:
+        try:
+            src = graphviz.Source(dot)
+            # cleanup=True removes intermediate .gv file if created
+            src.render(filepath_base, format="png", cleanup=True)
+        except Exception:
+            # E.g. the Graphviz binaries are missing; the .dot file is still usable.
+            pass
 
     return dot_path
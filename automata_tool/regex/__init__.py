@@ -1,14 +1,37 @@
 
+from importlib import import_module
+
 from .parser import Parser
-from .ast import RegexNode, Literal, Concat, Union, Star, Plus, Optional
+from .ast import RegexNode, Literal, CharClass, Concat, Union, Star, Plus, Optional, Repeat, Group
+from .simplify import Simplifier, simplify
+
+# The UTF-8 rewriting is imported on first access (see automata_tool.core).
+_LAZY = {
+    "to_utf8": ".utf8",
+    "utf8_sequences": ".utf8",
+}
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(import_module(module, __name__), name)
+    return value
 
 __all__ = [
     "Parser",
     "RegexNode",
     "Literal",
+    "CharClass",
     "Concat",
     "Union",
     "Star",
     "Plus",
     "Optional",
+    "Repeat",
+    "Group",
+    "Simplifier",
+    "simplify",
+    "to_utf8",
+    "utf8_sequences",
 ]
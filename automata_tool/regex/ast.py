@@ -1,5 +1,6 @@
 
 from abc import ABC
+from typing import Optional as OptType
 
 class RegexNode(ABC):
     pass
@@ -11,6 +12,12 @@ class Literal(RegexNode):
     def __repr__(self) -> str:
         return f"Literal({self.symbol!r})"
 
+class CharClass(Literal):
+    """A character class; `symbol` is its canonical label, e.g. ``"[a-z]"``."""
+
+    def __repr__(self) -> str:
+        return f"CharClass({self.symbol!r})"
+
 class Concat(RegexNode):
     def __init__(self, left: 'RegexNode', right: 'RegexNode') -> None:
         self.left = left
@@ -47,3 +54,24 @@ class Optional(RegexNode):
 
     def __repr__(self) -> str:
         return f"Optional({self.child!r})"
+
+class Repeat(RegexNode):
+    """Counted repetition ``child{min,max}``; ``max`` is None for ``{min,}``."""
+
+    def __init__(self, child: 'RegexNode', min: int, max: OptType[int]) -> None:
+        self.child = child
+        self.min = min
+        self.max = max
+
+    def __repr__(self) -> str:
+        return f"Repeat({self.child!r}, {self.min}, {self.max})"
+
+class Group(RegexNode):
+    """Capturing group number `index` (from 1, by opening parenthesis)."""
+
+    def __init__(self, child: 'RegexNode', index: int) -> None:
+        self.child = child
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"Group({self.child!r}, {self.index})"
@@ -1,13 +1,19 @@
 
 from .tokens import TokenType, Token
+from automata_tool.automata.charset import parse_class, read_escape, class_label, DOT_LABEL
 
 class Lexer:
     """Simple lexer for regular expressions.
 
     Supports:
     - literal characters: a-z, 0-9
-    - operators: | * + ?
+    - operators: | * + ? and counted repetition {m} {m,} {m,n}; REPEAT
+      tokens carry "m,n" (or "m," when unbounded)
     - parentheses: ( )
+    - character classes: [abc], ranges [a-z0-9], negated [^...], and .
+      (any character but newline); CLASS tokens carry the canonical label
+    - backslash escapes: a backslash followed by a character is that
+      character literally; n, t, r and xHH / uHHHH / UHHHHHHHH are decoded
     - ignores whitespace
     """
 
@@ -43,12 +49,25 @@ class Lexer:
             if ch == "?":
                 self._advance()
                 return Token(TokenType.QUESTION, ch)
+            if ch == "{":
+                return Token(TokenType.REPEAT, self._read_repeat())
             if ch == "(":
                 self._advance()
                 return Token(TokenType.LPAREN, ch)
             if ch == ")":
                 self._advance()
                 return Token(TokenType.RPAREN, ch)
+            if ch == ".":
+                self._advance()
+                return Token(TokenType.CLASS, DOT_LABEL)
+            if ch == "[":
+                intervals, self.pos = parse_class(self.text, self.pos)
+                if not intervals:
+                    raise SyntaxError("Clase de caracteres vacía")
+                return Token(TokenType.CLASS, class_label(intervals))
+            if ch == "\\":
+                literal, self.pos = read_escape(self.text, self.pos)
+                return Token(TokenType.CHAR, literal)
 
             # Literal character: allow a-z, 0-9 explicitly, and optionally others
             if ch.isalnum():
@@ -58,3 +77,16 @@ class Lexer:
             raise SyntaxError(f"Carácter no válido en expresión regular: {ch!r}")
 
         return Token(TokenType.EOF, "")
+
+    def _read_repeat(self) -> str:
+        close = self.text.find("}", self.pos)
+        if close < 0:
+            raise SyntaxError("Repetición sin cerrar: falta '}'")
+        body = self.text[self.pos + 1:close].replace(" ", "")
+        low, comma, high = body.partition(",")
+        if not low.isdecimal() or (high and not high.isdecimal()):
+            raise SyntaxError(f"Repetición inválida: {{{body}}}")
+        if high and int(high) < int(low):
+            raise SyntaxError(f"Repetición inválida: {{{body}}} (máximo menor que mínimo)")
+        self.pos = close + 1
+        return f"{int(low)}{comma}{int(high) if high else ''}"
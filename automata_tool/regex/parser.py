@@ -1,23 +1,48 @@
 
+from typing import Dict, List, Optional as OptType, Tuple
+
 from .tokens import TokenType, Token
 from .lexer import Lexer
-from .ast import RegexNode, Literal, Concat, Union, Star, Plus, Optional
+from .ast import RegexNode, Literal, CharClass, Concat, Union, Star, Plus, Optional, Repeat, Group
+
+# Guardrails for counted repetition: the largest count allowed in {m,n}, and
+# the most literal positions a regex with repetitions may have once they are
+# expanded (the builders create copies, e.g. (a{100}){100} has 10000).
+MAX_REPEAT = 1000
+MAX_EXPANSION = 20_000
 
 class Parser:
-    """Recursive-descent parser for regular expressions.
+    """Parser for regular expressions.
 
     Grammar:
 
         regex   ::= union
         union   ::= concat ('|' concat)*
         concat  ::= repeat+
-        repeat  ::= atom ('*' | '+' | '?')*
-        atom    ::= CHAR | '(' regex ')'
+        repeat  ::= atom ('*' | '+' | '?' | '{' m [',' [n]] '}')*
+        atom    ::= CHAR | CLASS | '(' regex ')'
+
+    Parenthesised groups are parsed with an explicit stack of open groups,
+    not by recursion, so deep nesting does not hit the recursion limit.
+
+    Counts above ``max_repeat``, or a regex with counted repetitions whose
+    expansion would exceed ``max_expansion`` literal positions, raise
+    ``SyntaxError``.
+
+    Parentheses only group, unless ``captures=True``: then each one becomes
+    a :class:`Group` numbered from 1 in order of its opening parenthesis,
+    and ``groups`` holds how many there are.
     """
 
-    def __init__(self, text: str) -> None:
+    def __init__(self, text: str, max_repeat: int = MAX_REPEAT,
+                 max_expansion: int = MAX_EXPANSION, captures: bool = False) -> None:
         self.lexer = Lexer(text)
         self.current: Token = self.lexer.next_token()
+        self.max_repeat = max_repeat
+        self.max_expansion = max_expansion
+        self._has_repeat = False
+        self.captures = captures
+        self.groups = 0
 
     def _eat(self, token_type: TokenType) -> None:
         if self.current.type == token_type:
@@ -29,30 +54,50 @@ class Parser:
         node = self._regex()
         if self.current.type != TokenType.EOF:
             raise SyntaxError("Expresión regular inválida: tokens restantes inesperados.")
+        size = expanded_size(node) if self._has_repeat else 0
+        if size > self.max_expansion:
+            raise SyntaxError(f"La expresión regular expandida tendría {size} posiciones "
+                              f"(límite: {self.max_expansion})")
         return node
 
     def _regex(self) -> RegexNode:
-        return self._union()
-
-    def _union(self) -> RegexNode:
-        node = self._concat()
-        while self.current.type == TokenType.UNION:
-            self._eat(TokenType.UNION)
-            right = self._concat()
-            node = Union(node, right)
-        return node
-
-    def _concat(self) -> RegexNode:
-        node = self._repeat()
-        # concatenation is implicit: if next token starts an atom, it's concatenation
-        while self.current.type in (TokenType.CHAR, TokenType.LPAREN):
-            right = self._repeat()
-            node = Concat(node, right)
-        return node
+        # One frame per open parenthesis, so that nesting depth is bounded by
+        # memory rather than by Python's recursion limit.
+        frames: List[_Frame] = [_Frame(0)]
+        while True:
+            tok = self.current
+            frame = frames[-1]
+            if tok.type == TokenType.LPAREN:
+                self._eat(TokenType.LPAREN)
+                if self.captures:
+                    self.groups += 1
+                frames.append(_Frame(self.groups))
+                continue
+            if tok.type in (TokenType.CHAR, TokenType.CLASS):
+                self._eat(tok.type)
+                # A one-character class such as [a] is labelled by the character itself
+                node = (Literal(tok.value) if tok.type == TokenType.CHAR or len(tok.value) == 1
+                        else CharClass(tok.value))
+            elif frame.concat is None:
+                raise SyntaxError(f"Token inesperado en átomo: {tok.type}")
+            elif tok.type == TokenType.UNION:
+                self._eat(TokenType.UNION)
+                frame.end_branch()
+                continue
+            elif tok.type == TokenType.RPAREN and len(frames) > 1:
+                self._eat(TokenType.RPAREN)
+                frames.pop()
+                node = Group(frame.node(), frame.index) if self.captures else frame.node()
+                frame = frames[-1]
+            elif len(frames) > 1:
+                raise SyntaxError(f"Se esperaba token {TokenType.RPAREN}, se encontró {tok.type}")
+            else:
+                return frame.node()
+            frame.append(self._repeat(node))
 
-    def _repeat(self) -> RegexNode:
-        node = self._atom()
-        while self.current.type in (TokenType.STAR, TokenType.PLUS, TokenType.QUESTION):
+    def _repeat(self, node: RegexNode) -> RegexNode:
+        while self.current.type in (TokenType.STAR, TokenType.PLUS, TokenType.QUESTION,
+                                    TokenType.REPEAT):
             if self.current.type == TokenType.STAR:
                 self._eat(TokenType.STAR)
                 node = Star(node)
@@ -62,16 +107,55 @@ class Parser:
             elif self.current.type == TokenType.QUESTION:
                 self._eat(TokenType.QUESTION)
                 node = Optional(node)
+            else:
+                counts = self.current.value
+                low, comma, high = counts.partition(",")
+                if max(int(low), int(high or 0)) > self.max_repeat:
+                    raise SyntaxError(f"Repetición demasiado grande: {{{counts}}} "
+                                      f"(límite: {self.max_repeat})")
+                self._eat(TokenType.REPEAT)
+                node = Repeat(node, int(low),
+                              int(high) if high else None if comma else int(low))
+                self._has_repeat = True
         return node
 
-    def _atom(self) -> RegexNode:
-        if self.current.type == TokenType.CHAR:
-            tok = self.current
-            self._eat(TokenType.CHAR)
-            return Literal(tok.value)
-        if self.current.type == TokenType.LPAREN:
-            self._eat(TokenType.LPAREN)
-            node = self._regex()
-            self._eat(TokenType.RPAREN)
-            return node
-        raise SyntaxError(f"Token inesperado en átomo: {self.current.type}")
+class _Frame:
+    """An open parenthesis (or the whole regex): its alternatives so far."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.branches: List[RegexNode] = []
+        self.concat: OptType[RegexNode] = None
+
+    def append(self, node: RegexNode) -> None:
+        self.concat = node if self.concat is None else Concat(self.concat, node)
+
+    def end_branch(self) -> None:
+        self.branches.append(self.concat)
+        self.concat = None
+
+    def node(self) -> RegexNode:
+        node = None
+        for branch in self.branches + [self.concat]:
+            node = branch if node is None else Union(node, branch)
+        return node
+
+def expanded_size(root: RegexNode) -> int:
+    """Literal positions of `root` once every counted repetition is expanded."""
+    sizes: Dict[int, int] = {}
+    stack: List[Tuple[RegexNode, bool]] = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if isinstance(node, Literal):
+            sizes[id(node)] = 1
+            continue
+        children = [node.left, node.right] if isinstance(node, (Concat, Union)) else [node.child]
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for child in children)
+            continue
+        size = sum(sizes[id(child)] for child in children)
+        if isinstance(node, Repeat):
+            size *= max(node.min if node.max is None else node.max, 1)
+        sizes[id(node)] = size
+    return sizes[id(root)]
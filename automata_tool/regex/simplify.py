@@ -0,0 +1,220 @@
+
+from typing import Dict, Hashable, List, Optional as OptType, Sequence, Set, Tuple
+
+from .ast import RegexNode, Literal, CharClass, Concat, Union, Star, Plus, Optional, Repeat, Group
+from automata_tool.automata.charset import label_intervals, normalize, class_label
+
+class Simplifier:
+    """Normalize a regex AST before automaton construction.
+
+    Nodes are rebuilt bottom-up through smart constructors that hash-cons
+    them: structurally equal subexpressions become the same node object
+    (the result is a DAG), so equality is an identity check and each node's
+    intern key -- built from its children's ids -- is computed once.
+    Unions and concatenations are flattened to n-ary form to simplify them
+    and then rebuilt as left-nested binary nodes, which is what the
+    builders expect. The rewrites all preserve the language:
+
+    * ``(x*)*``, ``(x+)*``, ``(x?)*`` -> ``x*``; ``(x|y?)*``, ``(x|y*)*`` ->
+      ``(x|y)*``; ``(x*)+``, ``(x?)+`` -> ``x*``; ``(x+)+`` -> ``x+``;
+      ``(x+)?`` -> ``x*``; ``x?`` and ``x+`` with ``x`` nullable -> ``x`` / ``x*``
+    * ``x{1}`` -> ``x``, ``x{0,}`` -> ``x*``, ``x{1,}`` -> ``x+``, ``x{0,1}`` -> ``x?``
+    * duplicated union branches are dropped (``a|a`` -> ``a``) and the
+      single-character branches of a union become one class
+      (``a|b|[x-z]`` -> ``[abx-z]``)
+    * ``x*x*`` -> ``x*``
+
+    Branch order is otherwise kept. Capturing groups are dropped: the result
+    is only meant for language-level (accept/reject) automata.
+    """
+
+    def __init__(self) -> None:
+        self._interned: Dict[Hashable, RegexNode] = {}
+        self._nullable: Dict[int, bool] = {}
+
+    def simplify(self, root: RegexNode) -> RegexNode:
+        # Post-order walk with an explicit stack; a shared input node is
+        # simplified once. A whole chain of nested unions (or concatenations)
+        # is handed to one smart-constructor call, which keeps long
+        # alternations linear.
+        done: Dict[int, RegexNode] = {}
+        stack: List[Tuple[RegexNode, bool]] = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in done:
+                continue
+            if isinstance(node, Literal):
+                done[id(node)] = self.literal(node.symbol)
+                continue
+            children = _chain(node)
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children))
+                continue
+            new = [done[id(child)] for child in children]
+            if isinstance(node, Concat):
+                result = self.concat(new)
+            elif isinstance(node, Union):
+                result = self.union(new)
+            elif isinstance(node, Star):
+                result = self.star(new[0])
+            elif isinstance(node, Plus):
+                result = self.plus(new[0])
+            elif isinstance(node, Optional):
+                result = self.optional(new[0])
+            elif isinstance(node, Repeat):
+                result = self.repeat(new[0], node.min, node.max)
+            elif isinstance(node, Group):
+                result = new[0]
+            else:
+                raise TypeError(f"Tipo de nodo de regex no soportado: {type(node)}")
+            done[id(node)] = result
+        return done[id(root)]
+
+    # ---- hash-consing ----
+
+    def _intern(self, key: Hashable, make, nullable: bool) -> RegexNode:
+        node = self._interned.get(key)
+        if node is None:
+            node = self._interned[key] = make()
+            self._nullable[id(node)] = nullable
+        return node
+
+    def nullable(self, node: RegexNode) -> bool:
+        return self._nullable[id(node)]
+
+    # ---- smart constructors ----
+
+    def literal(self, symbol: str) -> RegexNode:
+        cls = CharClass if len(symbol) > 1 else Literal
+        return self._intern(("lit", symbol), lambda: cls(symbol), False)
+
+    def concat(self, parts: Sequence[RegexNode]) -> RegexNode:
+        flat: List[RegexNode] = []
+        for part in parts:
+            for operand in _chain(part, Concat):
+                if flat and operand is flat[-1] and isinstance(operand, Star):
+                    continue  # x*x* -> x*
+                flat.append(operand)
+        return self._fold(Concat, "cat", flat)
+
+    def union(self, branches: Sequence[RegexNode]) -> RegexNode:
+        flat: List[RegexNode] = []
+        seen: Set[int] = set()
+        char_labels: List[str] = []
+        char_slot = -1
+        for branch in branches:
+            for operand in _chain(branch, Union):
+                if id(operand) in seen:
+                    continue
+                seen.add(id(operand))
+                if isinstance(operand, Literal) and label_intervals(operand.symbol):
+                    char_labels.append(operand.symbol)
+                    if char_slot >= 0:
+                        continue
+                    char_slot = len(flat)
+                flat.append(operand)
+        if len(char_labels) > 1:
+            chars = [iv for label in char_labels for iv in label_intervals(label)]
+            flat[char_slot] = self.literal(class_label(normalize(chars)))
+        return self._fold(Union, "alt", flat)
+
+    def star(self, child: RegexNode) -> RegexNode:
+        child = self._strip(child)
+        return self._intern(("star", id(child)), lambda: Star(child), True)
+
+    def plus(self, child: RegexNode) -> RegexNode:
+        if isinstance(child, (Star, Plus)):
+            return child
+        if isinstance(child, Optional) or self.nullable(child):
+            return self.star(child)
+        return self._intern(("plus", id(child)), lambda: Plus(child), False)
+
+    def optional(self, child: RegexNode) -> RegexNode:
+        if self.nullable(child):
+            return child
+        if isinstance(child, Plus):
+            return self.star(child.child)
+        return self._intern(("opt", id(child)), lambda: Optional(child), True)
+
+    def repeat(self, child: RegexNode, min: int, max: OptType[int]) -> RegexNode:
+        if (min, max) == (1, 1):
+            return child
+        if max is None and min <= 1:
+            return self.plus(child) if min else self.star(child)
+        if (min, max) == (0, 1):
+            return self.optional(child)
+        return self._intern(("rep", id(child), min, max), lambda: Repeat(child, min, max),
+                            min == 0 or self.nullable(child))
+
+    def _strip(self, node: RegexNode) -> RegexNode:
+        """Drop the ?, * and + that are redundant under a star, also per union branch."""
+        while isinstance(node, (Star, Plus, Optional)):
+            node = node.child
+        if isinstance(node, Union):
+            branches = _chain(node)
+            stripped = [self._strip(b) if isinstance(b, (Star, Plus, Optional)) else b
+                        for b in branches]
+            if any(s is not b for s, b in zip(stripped, branches)):
+                node = self.union(stripped)
+        return node
+
+    def _fold(self, cls, tag: str, operands: List[RegexNode]) -> RegexNode:
+        """Left-nested binary `cls` nodes over `operands`, each prefix interned.
+
+        Operands are never `cls` nodes themselves, so :func:`_chain` recovers
+        them by walking the left spine.
+        """
+        node = operands[0]
+        nullable = self.nullable(node)
+        for i in range(1, len(operands)):
+            left, right = node, operands[i]
+            if tag == "cat":
+                nullable = nullable and self.nullable(right)
+            else:
+                nullable = nullable or self.nullable(right)
+            node = self._intern((tag, id(left), id(right)), lambda: cls(left, right), nullable)
+        return node
+
+def _children(node: RegexNode) -> Tuple[RegexNode, ...]:
+    if isinstance(node, (Concat, Union)):
+        return (node.left, node.right)
+    if isinstance(node, (Star, Plus, Optional, Repeat, Group)):
+        return (node.child,)
+    return ()
+
+def _chain(node: RegexNode, cls=None) -> List[RegexNode]:
+    """Operands of the maximal `cls` (default: ``type(node)``) subtree at `node`.
+
+    For a node that is not a Concat/Union this is its children, or the node
+    itself when `cls` is given.
+    """
+    cls = cls or type(node)
+    if cls not in (Concat, Union):
+        return list(_children(node))
+    operands: List[RegexNode] = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, cls):
+            stack.append(current.right)
+            stack.append(current.left)
+        else:
+            operands.append(current)
+    return operands
+
+def simplify(root: RegexNode) -> RegexNode:
+    """Simplified, hash-consed equivalent of `root` (see :class:`Simplifier`)."""
+    return Simplifier().simplify(root)
+
+def count_nodes(root: RegexNode) -> int:
+    """Number of distinct node objects reachable from `root`."""
+    seen: Set[int] = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        stack.extend(_children(node))
+    return len(seen)
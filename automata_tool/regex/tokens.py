@@ -4,9 +4,11 @@ from dataclasses import dataclass
 
 class TokenType(Enum):
     CHAR = auto()
+    CLASS = auto()
     STAR = auto()
     PLUS = auto()
     QUESTION = auto()
+    REPEAT = auto()
     UNION = auto()
     LPAREN = auto()
     RPAREN = auto()
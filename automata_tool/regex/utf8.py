@@ -0,0 +1,114 @@
+
+from typing import Dict, List, Tuple
+
+from .ast import RegexNode, Literal, CharClass, Concat, Union, Star, Plus, Optional, Repeat, Group
+from automata_tool.automata.charset import Interval, label_intervals, class_label
+
+# Largest code point encoded with 1, 2 and 3 UTF-8 bytes
+_LENGTH_LIMITS = (0x7F, 0x7FF, 0xFFFF)
+_SURROGATES = (0xD800, 0xDFFF)
+
+ByteSequence = List[Interval]  # one byte range per position
+
+def utf8_sequences(lo: int, hi: int) -> List[ByteSequence]:
+    """Byte-range sequences whose UTF-8 strings are those of code points lo..hi.
+
+    Surrogates (which UTF-8 cannot encode) are left out. The range is split
+    until each piece has one encoded length and, at every byte position,
+    either a single byte or the full continuation range below it; each piece
+    is then the byte ranges between the encodings of its two ends. The
+    sequences are disjoint and in code point order.
+    """
+    sequences: List[ByteSequence] = []
+    stack: List[Tuple[int, int]] = [(lo, hi)]
+    while stack:
+        lo, hi = stack.pop()
+        if lo > hi:
+            continue
+        if lo <= _SURROGATES[1] and hi >= _SURROGATES[0]:
+            stack.append((_SURROGATES[1] + 1, hi))
+            stack.append((lo, _SURROGATES[0] - 1))
+            continue
+        split = _split_point(lo, hi)
+        if split is not None:
+            stack.append((split + 1, hi))
+            stack.append((lo, split))
+            continue
+        if hi <= 0x7F:
+            sequences.append([(lo, hi)])
+            continue
+        sequences.append(list(zip(chr(lo).encode("utf-8"), chr(hi).encode("utf-8"))))
+    return sequences
+
+def _split_point(lo: int, hi: int):
+    """Last code point of the first piece of lo..hi, or None if it needs no split."""
+    for limit in _LENGTH_LIMITS:
+        if lo <= limit < hi:
+            return limit
+    for i in range(1, 4):
+        mask = (1 << (6 * i)) - 1
+        if lo & ~mask != hi & ~mask:
+            if lo & mask:
+                return lo | mask
+            if hi & mask != mask:
+                return (hi & ~mask) - 1
+    return None
+
+def _byte_node(lo: int, hi: int) -> RegexNode:
+    # Byte b is the symbol chr(b), as in CompiledDFA.byte_columns.
+    return Literal(chr(lo)) if lo == hi else CharClass(class_label(((lo, hi),)))
+
+def _label_to_utf8(symbol: str) -> RegexNode:
+    intervals = label_intervals(symbol)
+    if not intervals or intervals[-1][1] <= 0x7F:
+        return Literal(symbol) if len(symbol) == 1 else CharClass(symbol)
+    node = None
+    for lo, hi in intervals:
+        for sequence in utf8_sequences(lo, hi):
+            branch = _byte_node(*sequence[0])
+            for byte_range in sequence[1:]:
+                branch = Concat(branch, _byte_node(*byte_range))
+            node = branch if node is None else Union(node, branch)
+    if node is None:
+        raise SyntaxError(f"La clase {symbol} no contiene caracteres codificables en UTF-8")
+    return node
+
+def to_utf8(root: RegexNode) -> RegexNode:
+    """Rewrite a character regex into the equivalent regex over UTF-8 bytes.
+
+    Every label becomes the alternation of the byte sequences of its
+    characters (see :func:`utf8_sequences`), with byte ``b`` written as the
+    one-character label ``chr(b)`` or a class of such labels; ASCII-only
+    labels are kept as they are. Automata built from the result read
+    bytes-like input through ``CompiledDFA.byte_columns``.
+    """
+    labels: Dict[str, RegexNode] = {}
+    done: Dict[int, RegexNode] = {}
+    stack: List[Tuple[RegexNode, bool]] = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in done:
+            continue
+        if isinstance(node, Literal):
+            if node.symbol not in labels:
+                labels[node.symbol] = _label_to_utf8(node.symbol)
+            done[id(node)] = labels[node.symbol]
+            continue
+        children = [node.left, node.right] if isinstance(node, (Concat, Union)) else [node.child]
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for child in children)
+            continue
+        new = [done[id(child)] for child in children]
+        if isinstance(node, (Concat, Union)):
+            result = type(node)(new[0], new[1])
+        elif isinstance(node, (Star, Plus, Optional)):
+            result = type(node)(new[0])
+        elif isinstance(node, Repeat):
+            result = Repeat(new[0], node.min, node.max)
+        elif isinstance(node, Group):
+            result = Group(new[0], node.index)
+        else:
+            raise TypeError(f"Tipo de nodo de regex no soportado: {type(node)}")
+        done[id(node)] = result
+    return done[id(root)]
@@ -0,0 +1,2 @@
+
+"""Stand-alone performance scripts for automata_tool (run with ``python -m``)."""
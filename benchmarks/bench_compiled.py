@@ -0,0 +1,45 @@
+
+"""Dict-based ``DFA.accepts`` vs. array-backed ``CompiledDFA.accepts``.
+
+Matches long accepted inputs (the whole string has to be scanned) and
+reports throughput in millions of characters per second.
+
+Usage:
+    python -m benchmarks.bench_compiled [--length 1000000]
+"""
+
+import argparse
+from typing import List
+
+from automata_tool.core import AutomatonFactory
+
+from .suite import best_time, description
+
+CASES = [
+    ("a(b|c)*", lambda n: "a" + "bc" * (n // 2)),
+    ("(ab|cd)*e", lambda n: "abcd" * (n // 4) + "e"),
+    ("(a|b)*a(a|b)(a|b)", lambda n: "ab" * (n // 2) + "aab"),
+]
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=description(__doc__))
+    parser.add_argument("--length", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    factory = AutomatonFactory(minimize=True)
+    print(f"{'regex':<20} {'dict Mch/s':>11} {'table Mch/s':>12} {'speedup':>8}")
+    for regex, make_input in CASES:
+        dfa = factory.from_regex(regex)["dfa"]
+        compiled = factory.compile_dfa(dfa)
+        text = make_input(args.length)
+        assert dfa.accepts(text) and compiled.accepts(text)
+
+        t_dict = best_time(lambda: dfa.accepts(text), args.repeat)
+        t_table = best_time(lambda: compiled.accepts(text), args.repeat)
+        mch = len(text) / 1e6
+        print(f"{regex:<20} {mch / t_dict:11.2f} {mch / t_table:12.2f} "
+              f"{t_dict / t_table:7.2f}x")
+
+if __name__ == "__main__":
+    main()
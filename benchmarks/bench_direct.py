@@ -0,0 +1,43 @@
+"""Regex -> DFA compile time and peak memory: via an NFA vs. followpos.
+
+Compares ``Parser`` + ``ThompsonBuilder`` + ``SubsetConstruction`` (what
+``from_regex`` does when the NFA is read) with ``Parser`` +
+``DirectDFABuilder`` (what it does for match-only callers) on the pattern
+families of ``benchmarks.suite``. Peak memory is measured with
+``tracemalloc`` in a separate, untimed run.
+
+Usage:
+    python -m benchmarks.bench_direct [--repeat 3]
+"""
+
+import argparse
+from typing import List
+
+from automata_tool.builders.direct import DirectDFABuilder
+from automata_tool.builders.subset import SubsetConstruction
+from automata_tool.builders.thompson import ThompsonBuilder
+from automata_tool.regex.parser import Parser
+
+from .suite import FAMILIES, best_time, description, peak_kib
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=description(__doc__))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<16} {'DFA states':>10} {'via NFA (s)':>12} {'direct (s)':>11} "
+          f"{'speedup':>8} {'NFA KiB':>9} {'direct KiB':>11}")
+    for family, (make_regex, _, sizes, _) in FAMILIES.items():
+        for n in sizes:
+            regex = make_regex(n)
+            via_nfa = lambda: SubsetConstruction().build(ThompsonBuilder().build(Parser(regex).parse()))
+            direct = lambda: DirectDFABuilder().build(Parser(regex).parse())
+            states = len(direct().states)
+            t_nfa = best_time(via_nfa, args.repeat)
+            t_direct = best_time(direct, args.repeat)
+            print(f"{family + '[' + str(n) + ']':<16} {states:>10} {t_nfa:12.4f} "
+                  f"{t_direct:11.4f} {t_nfa / t_direct:7.2f}x "
+                  f"{peak_kib(via_nfa):9.0f} {peak_kib(direct):11.0f}")
+
+if __name__ == "__main__":
+    main()
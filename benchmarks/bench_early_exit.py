@@ -0,0 +1,61 @@
+
+"""Early termination of ``accepts`` on dead and accept-forever states.
+
+Each case is a long input whose answer is decided after a few characters,
+either because no final state can be reached any more or because every
+continuation is accepted. The early-exit ``CompiledDFA.accepts`` is timed
+against a loop that steps the same table through the whole input.
+
+Usage:
+    python -m benchmarks.bench_early_exit [--length 1000000]
+"""
+
+import argparse
+from typing import List
+
+from automata_tool.automata import CompiledDFA
+from automata_tool.core import AutomatonFactory
+
+from .suite import best_time, description
+
+ANY = "[\\x00-\\U0010FFFF]"
+
+CASES = [
+    # Dead after "ax": the rest of the input is never read.
+    ("a(b|c)*d", lambda n: "ax" + "bc" * (n // 2)),
+    # Accept-forever once the "ab" prefix is seen.
+    (f"ab{ANY}*", lambda n: "ab" + "xy" * (n // 2)),
+    (f"{ANY}*error{ANY}*", lambda n: "error " + "ok " * (n // 3)),
+]
+
+def full_scan(compiled: CompiledDFA, text: str) -> bool:
+    """``accepts`` without early termination: step through every character."""
+    table, lookup = compiled.table, compiled.lookup
+    state = compiled.start
+    for ch in text:
+        col = lookup(ch)
+        state = table[state + col] if col is not None else 0
+    return state in compiled.final_rows
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=description(__doc__))
+    parser.add_argument("--length", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    factory = AutomatonFactory(minimize=True)
+    width = max(len(regex) for regex, _ in CASES)
+    print(f"{'regex':<{width}} {'read':>8} {'full ms':>9} {'early ms':>9} {'speedup':>9}")
+    for regex, make_input in CASES:
+        compiled = factory.compile_dfa(factory.from_regex(regex)["dfa"])
+        text = make_input(args.length)
+        accepted, read = compiled.decide(text)
+        assert accepted == full_scan(compiled, text) == compiled.accepts(text)
+
+        t_full = best_time(lambda: full_scan(compiled, text), args.repeat)
+        t_early = best_time(lambda: compiled.accepts(text), args.repeat)
+        print(f"{regex:<{width}} {read:>8} {t_full * 1e3:9.2f} {t_early * 1e3:9.3f} "
+              f"{t_full / t_early:8.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Thompson vs. Glushkov NFAs: size, subset construction and simulation.
+
+For each pattern family of ``benchmarks.suite`` builds both NFAs and
+reports their states and edges (epsilon edges included for Thompson), the
+time of ``SubsetConstruction.build`` on each, and the throughput of
+``NFA.accepts`` (set-based, epsilon closures at every step) and of
+``BitsetNFA.accepts`` on the same input.
+
+Usage:
+    python -m benchmarks.bench_glushkov [--length 5000] [--repeat 3]
+"""
+
+import argparse
+import random
+from typing import List
+
+from automata_tool.automata.bitset import BitsetNFA
+from automata_tool.builders.glushkov import GlushkovBuilder
+from automata_tool.builders.subset import SubsetConstruction
+from automata_tool.builders.thompson import ThompsonBuilder
+from automata_tool.core.instrument import count_transitions
+from automata_tool.regex.parser import Parser
+
+from .suite import FAMILIES, best_time, description
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=description(__doc__))
+    parser.add_argument("--length", type=int, default=5000,
+                        help="Input length for the simulations.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<16} {'builder':<9} {'states':>7} {'edges':>8} {'subset (s)':>11} "
+          f"{'NFA kch/s':>10} {'bitset kch/s':>13}")
+    for family, (make_regex, make_input, sizes, _) in FAMILIES.items():
+        for n in sizes:
+            regex = make_regex(n)
+            text = make_input(n, args.length, random.Random(n))
+            ast_root = Parser(regex).parse()
+            for name, builder in (("thompson", ThompsonBuilder), ("glushkov", GlushkovBuilder)):
+                nfa = builder().build(ast_root)
+                bits = BitsetNFA(nfa)
+                assert nfa.accepts(text) == bits.accepts(text)
+                t_subset = best_time(lambda: SubsetConstruction().build(nfa), args.repeat)
+                t_nfa = best_time(lambda: nfa.accepts(text), args.repeat)
+                t_bits = best_time(lambda: bits.accepts(text), args.repeat)
+                kch = len(text) / 1e3
+                print(f"{family + '[' + str(n) + ']':<16} {name:<9} {len(nfa.states):>7} "
+                      f"{count_transitions(nfa):>8} {t_subset:11.4f} "
+                      f"{kch / t_nfa:10.1f} {kch / t_bits:13.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Keyword sets: ``kw1|kw2|...`` through the regex pipeline vs. ``from_keywords``.
+
+Builds the DFA of ``n`` random keywords both as a regex (parse, simplify,
+followpos DFA) and with the incremental minimal-DAFSA construction, and
+reports build time, peak memory (``tracemalloc``, separate untimed run) and
+DFA states. The regex path is skipped above ``--regex-limit`` keywords.
+
+Usage:
+    python -m benchmarks.bench_keywords [--sizes 1000 10000 100000] [--repeat 3]
+"""
+
+import argparse
+import random
+from typing import List
+
+from automata_tool.core.factory import AutomatonFactory
+
+from .suite import best_time, description, peak_kib
+
+def make_keywords(n: int, rng: random.Random) -> List[str]:
+    return ["".join(rng.choice("abcdefghijklmnop") for _ in range(rng.randint(4, 12)))
+            for _ in range(n)]
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=description(__doc__))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--regex-limit", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    factory = AutomatonFactory()
+    print(f"{'keywords':>9} {'path':<9} {'DFA states':>11} {'build (s)':>10} {'peak KiB':>10}")
+    for n in args.sizes:
+        keywords = make_keywords(n, random.Random(n))
+        regex = "|".join(keywords)
+        paths = [("keywords", lambda: factory.from_keywords(keywords)["dfa"])]
+        if n <= args.regex_limit:
+            paths.insert(0, ("regex", lambda: factory.from_regex(regex)["dfa"]))
+        for name, build in paths:
+            states = len(build().states)
+            print(f"{n:>9} {name:<9} {states:>11} {best_time(build, args.repeat):10.4f} "
+                  f"{peak_kib(build):10.0f}")
+
+if __name__ == "__main__":
+    main()
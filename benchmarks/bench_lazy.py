@@ -0,0 +1,60 @@
+
+"""Full subset construction vs. the on-demand LazyDFA on ``(a|b)*a(a|b){n}``.
+
+The full DFA of this family has 2**(n+1) states, so its construction time
+explodes with ``n``; the lazy matcher only builds the states the input
+visits and never keeps more than ``--max-states`` of them.
+
+Usage:
+    python -m benchmarks.bench_lazy [--sizes 4 8 12 16 20] [--length 100000]
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from automata_tool.core import AutomatonFactory
+from automata_tool.regex.parser import Parser
+from automata_tool.builders.thompson import ThompsonBuilder
+from automata_tool.builders.subset import SubsetConstruction
+
+from .suite import description
+
+def exponential_family(n: int) -> str:
+    return "(a|b)*a" + "(a|b)" * n
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=description(__doc__))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 8, 12, 16, 20])
+    parser.add_argument("--length", type=int, default=100_000)
+    parser.add_argument("--max-states", type=int, default=4096)
+    parser.add_argument("--subset-limit", type=int, default=12,
+                        help="Largest n for which the full DFA is also built.")
+    args = parser.parse_args(argv)
+
+    random.seed(0)
+    text = "".join(random.choice("ab") for _ in range(args.length))
+    factory = AutomatonFactory()
+
+    print(f"{'n':>3} {'full DFA (s)':>13} {'DFA states':>11} "
+          f"{'lazy (s)':>9} {'built':>8} {'flushes':>8}")
+    for n in args.sizes:
+        regex = exponential_family(n)
+        full, states = "", ""
+        if n <= args.subset_limit:
+            nfa = ThompsonBuilder().build(Parser(regex).parse())
+            t0 = time.perf_counter()
+            dfa = SubsetConstruction().build(nfa)
+            full = f"{time.perf_counter() - t0:13.4f}"
+            states = len(dfa.states)
+
+        lazy = factory.lazy_from_regex(regex, max_states=args.max_states)
+        t0 = time.perf_counter()
+        lazy.accepts(text)
+        elapsed = time.perf_counter() - t0
+        print(f"{n:>3} {full:>13} {states:>11} {elapsed:9.4f} "
+              f"{lazy.states_built:>8} {lazy.flushes:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Submatch extraction: PikeVM.match vs. NFA.accepts vs. Python's re.
+
+On patterns where a backtracking engine explores exponentially many paths
+(``(a|a)*b``, ``(a*)*b`` and ``(a|aa)*c`` against runs of ``a`` that do not
+match), times ``re.fullmatch``, ``PikeVM.match`` (which also returns the
+group spans) and ``NFA.accepts`` on the Thompson NFA of the same regex.
+``re`` is only run up to ``--re-limit`` characters, since its time doubles
+with every extra one or two.
+
+Usage:
+    python -m benchmarks.bench_pike [--sizes 16 20 24 1000 10000] [--repeat 3]
+"""
+
+import argparse
+import re
+from typing import List
+
+from automata_tool.core.factory import AutomatonFactory
+
+from .suite import best_time, description
+
+PATTERNS = ["(a|a)*b", "(a*)*b", "(a|aa)*c"]
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=description(__doc__))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 20, 24, 1000, 10000])
+    parser.add_argument("--re-limit", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    factory = AutomatonFactory()
+    print(f"{'pattern':<10} {'length':>7} {'re (s)':>10} {'PikeVM (s)':>11} {'NFA (s)':>10}")
+    for pattern in PATTERNS:
+        compiled = re.compile(pattern)
+        vm = factory.pike_from_regex(pattern)
+        nfa = factory.from_regex(pattern)["nfa"]
+        for n in args.sizes:
+            text = "a" * n
+            assert vm.match(text) is None and not nfa.accepts(text)
+            t_re = (f"{best_time(lambda: compiled.fullmatch(text), args.repeat):10.4f}"
+                    if n <= args.re_limit else f"{'-':>10}")
+            t_vm = best_time(lambda: vm.match(text), args.repeat)
+            t_nfa = best_time(lambda: nfa.accepts(text), args.repeat)
+            print(f"{pattern:<10} {n:>7} {t_re} {t_vm:11.4f} {t_nfa:10.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Regex AST simplification: AST, NFA and DFA sizes with and without it.
+
+For each pattern family of ``benchmarks.suite`` reports the number of
+distinct AST nodes, Thompson NFA states and edges and subset-construction
+DFA states for the parsed regex and for its ``simplify``-ed form, plus the
+time of the simplification itself.
+
+Usage:
+    python -m benchmarks.bench_simplify [--repeat 3]
+"""
+
+import argparse
+from typing import List
+
+from automata_tool.builders.subset import SubsetConstruction
+from automata_tool.builders.thompson import ThompsonBuilder
+from automata_tool.core.instrument import count_transitions
+from automata_tool.regex.parser import Parser
+from automata_tool.regex.simplify import simplify, count_nodes
+
+from .suite import FAMILIES, best_time, description
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=description(__doc__))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<16} {'ast':<10} {'nodes':>7} {'NFA states':>11} {'NFA edges':>10} "
+          f"{'DFA states':>11} {'simplify (s)':>13}")
+    for family, (make_regex, _, sizes, _) in FAMILIES.items():
+        for n in sizes:
+            parsed = Parser(make_regex(n)).parse()
+            t_simplify = best_time(lambda: simplify(parsed), args.repeat)
+            for name, ast_root in (("parsed", parsed), ("simplified", simplify(parsed))):
+                nfa = ThompsonBuilder().build(ast_root)
+                dfa = SubsetConstruction().build(nfa)
+                timing = f"{t_simplify:13.4f}" if name == "simplified" else f"{'':>13}"
+                print(f"{family + '[' + str(n) + ']':<16} {name:<10} {count_nodes(ast_root):>7} "
+                      f"{len(nfa.states):>11} {count_transitions(nfa):>10} "
+                      f"{len(dfa.states):>11} {timing}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+
+"""Whole-string ``accepts`` vs. ``StreamMatcher`` fed in chunks.
+
+The input is split into chunks up front so only matching is timed; the
+chunked and whole-string throughputs should be about the same for every
+chunk size that is not tiny.
+
+Usage:
+    python -m benchmarks.bench_streaming [--length 2000000] [--chunk-sizes 64 4096 65536]
+"""
+
+import argparse
+from typing import List
+
+from automata_tool.automata import BitsetNFA
+from automata_tool.automata.streaming import StreamMatcher
+from automata_tool.core import AutomatonFactory
+
+from .suite import best_time, description
+
+REGEX = "(ab|cd)*e"
+
+def feed_all(matcher: StreamMatcher, chunks: List[str]) -> bool:
+    matcher.reset()
+    for chunk in chunks:
+        matcher.feed(chunk)
+    return matcher.is_accepting()
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=description(__doc__))
+    parser.add_argument("--length", type=int, default=2_000_000)
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[64, 4096, 65536])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    factory = AutomatonFactory(minimize=True)
+    result = factory.from_regex(REGEX)
+    text = "abcd" * (args.length // 4) + "e"
+    mch = len(text) / 1e6
+
+    engines = [
+        ("CompiledDFA", factory.compile_dfa(result["dfa"])),
+        ("BitsetNFA", BitsetNFA(result["nfa"])),
+    ]
+    print(f"{'engine':<12} {'chunk':>8} {'Mch/s':>8}")
+    for name, engine in engines:
+        whole = best_time(lambda: engine.accepts(text), args.repeat)
+        print(f"{name:<12} {'whole':>8} {mch / whole:8.2f}")
+        matcher = StreamMatcher(engine)
+        for size in args.chunk_sizes:
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            assert feed_all(matcher, chunks)
+            chunked = best_time(lambda: feed_all(matcher, chunks), args.repeat)
+            print(f"{name:<12} {size:>8} {mch / chunked:8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+
+"""Thompson construction time as a function of regex length.
+
+Builds alternations of ``n`` three-letter literals (the shape of our
+generated patterns) with the shared-table builder and, for the smaller
+sizes, with the legacy merge-per-node builder (which is quadratic and
+recursive, so it also runs out of stack on long alternations). The
+``us/literal`` column should stay roughly flat for the shared builder,
+i.e. build time grows linearly with the length of the regex.
+
+Usage:
+    python -m benchmarks.bench_thompson [--sizes 500 1000 2000 ...]
+"""
+
+import argparse
+import gc
+import itertools
+import string
+import time
+from typing import List
+
+from automata_tool.regex.parser import Parser
+from automata_tool.builders.thompson import ThompsonBuilder
+
+from .suite import description
+
+def literal_alternation(n: int) -> str:
+    words = itertools.product(string.ascii_lowercase, repeat=3)
+    return "|".join("".join(w) for w in itertools.islice(words, n))
+
+def time_build(regex: str, shared_table: bool, repeat: int = 3) -> float:
+    ast_root = Parser(regex).parse()
+    best = float("inf")
+    for _ in range(repeat):
+        builder = ThompsonBuilder(shared_table=shared_table)
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            builder.build(ast_root)
+            best = min(best, time.perf_counter() - t0)
+        finally:
+            gc.enable()
+    return best
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=description(__doc__))
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[250, 500, 1000, 2000, 4000, 8000, 16000])
+    parser.add_argument("--merge-limit", type=int, default=1000,
+                        help="Largest size also timed with the merge builder.")
+    args = parser.parse_args(argv)
+
+    print(f"{'literals':>9} {'shared (s)':>11} {'us/literal':>11} {'merge (s)':>10}")
+    for n in args.sizes:
+        regex = literal_alternation(n)
+        shared = time_build(regex, shared_table=True)
+        merge = ""
+        if n <= args.merge_limit:
+            try:
+                merge = f"{time_build(regex, shared_table=False, repeat=1):10.4f}"
+            except RecursionError:
+                merge = "recursion"
+        print(f"{n:>9} {shared:11.4f} {shared / n * 1e6:11.2f} {merge:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Per-stage benchmark suite over scalable pattern families.
+
+Times every stage of the pipeline separately -- ``Lexer``, ``Parser``,
+``ThompsonBuilder.build``, ``SubsetConstruction.build``, the definition
+conversions (objects -> quintuples -> objects), ``automaton_to_dot`` and
+``DFA.accepts`` / ``NFA.accepts`` on long inputs -- for three families:
+
+* ``literals``:    ``(w1|w2|...|wn)*`` over ``n`` three-letter words,
+* ``nested``:      ``n`` nested stars, ``((a)*)*...``,
+* ``exponential``: ``(a|b)*a(a|b){n}``, whose DFA has ``2**(n+1)`` states.
+
+``run`` writes the best-of-``--repeat`` times as JSON; ``compare`` reads two
+such files and flags every stage that got slower than ``--threshold``
+(exit status 1 if there is any regression).
+
+Usage:
+    python -m benchmarks.suite run [--quick] [--output results.json]
+    python -m benchmarks.suite compare base.json new.json [--threshold 0.10]
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import platform
+import random
+import string
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from automata_tool.core import AutomatonFactory
+from automata_tool.regex.lexer import Lexer
+from automata_tool.regex.parser import Parser
+from automata_tool.regex.tokens import TokenType
+from automata_tool.builders.thompson import ThompsonBuilder
+from automata_tool.builders.subset import SubsetConstruction
+from automata_tool.diagrams.generator import automaton_to_dot
+
+SCHEMA_VERSION = 1
+
+def _words(n: int) -> List[str]:
+    words = itertools.product(string.ascii_lowercase, repeat=3)
+    return ["".join(w) for w in itertools.islice(words, n)]
+
+def literals_family(n: int) -> str:
+    return "(" + "|".join(_words(n)) + ")*"
+
+def literals_input(n: int, length: int, rng: random.Random) -> str:
+    words = _words(n)
+    return "".join(rng.choice(words) for _ in range(length // 3))
+
+def nested_family(n: int) -> str:
+    regex = "a"
+    for _ in range(n):
+        regex = f"({regex})*"
+    return regex
+
+def nested_input(n: int, length: int, rng: random.Random) -> str:
+    return "a" * length
+
+def exponential_family(n: int) -> str:
+    return "(a|b)*a" + "(a|b)" * n
+
+def exponential_input(n: int, length: int, rng: random.Random) -> str:
+    return "".join(rng.choice("ab") for _ in range(length))
+
+# name -> (regex for size n, input generator, default sizes, --quick sizes)
+FAMILIES: Dict[str, Tuple[Callable[[int], str], Callable[..., str], List[int], List[int]]] = {
+    "literals": (literals_family, literals_input, [10, 100, 1000], [10, 100]),
+    "nested": (nested_family, nested_input, [2, 8, 32], [2, 8]),
+    "exponential": (exponential_family, exponential_input, [4, 8, 12], [4, 8]),
+}
+
+def description(doc: str) -> str:
+    """First line of a benchmark's module docstring, for ``--help``."""
+    return doc.strip().splitlines()[0]
+
+def best_time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        finally:
+            gc.enable()
+    return best
+
+def peak_kib(fn: Callable[[], object]) -> float:
+    """Peak memory allocated while running `fn` once, in KiB (``tracemalloc``)."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+def _lex_all(regex: str) -> None:
+    lexer = Lexer(regex)
+    while lexer.next_token().type is not TokenType.EOF:
+        pass
+
+def bench_case(family: str, n: int, length: int, nfa_length: int,
+               repeat: int) -> Dict[str, Any]:
+    """Time every stage for one (family, n) and return the JSON record."""
+    make_regex, make_input, _, _ = FAMILIES[family]
+    rng = random.Random(n)
+    regex = make_regex(n)
+    text = make_input(n, length, rng)
+    nfa_text = text[:nfa_length]
+    factory = AutomatonFactory()
+
+    ast_root = Parser(regex).parse()
+    nfa = ThompsonBuilder().build(ast_root)
+    dfa = SubsetConstruction().build(nfa)
+    nfa_def = factory._definition_from_nfa(nfa)
+    dfa_def = factory._definition_from_dfa(dfa)
+
+    stages = {
+        "lex": lambda: _lex_all(regex),
+        "parse": lambda: Parser(regex).parse(),
+        "thompson": lambda: ThompsonBuilder().build(ast_root),
+        "subset": lambda: SubsetConstruction().build(nfa),
+        "nfa_to_definition": lambda: factory._definition_from_nfa(nfa),
+        "dfa_to_definition": lambda: factory._definition_from_dfa(dfa),
+        "definition_to_nfa": lambda: factory._nfa_from_definition(nfa_def),
+        "definition_to_dfa": lambda: factory._dfa_from_definition(dfa_def),
+        "nfa_to_dot": lambda: automaton_to_dot(nfa),
+        "dfa_to_dot": lambda: automaton_to_dot(dfa),
+        "dfa_accepts": lambda: dfa.accepts(text),
+        "nfa_accepts": lambda: nfa.accepts(nfa_text),
+    }
+    return {
+        "family": family,
+        "n": n,
+        "regex_length": len(regex),
+        "input_length": len(text),
+        "nfa_input_length": len(nfa_text),
+        "nfa_states": len(nfa.states),
+        "dfa_states": len(dfa.states),
+        "seconds": {stage: best_time(fn, repeat) for stage, fn in stages.items()},
+    }
+
+def run(args: argparse.Namespace) -> int:
+    families = args.families or list(FAMILIES)
+    results = []
+    for family in families:
+        _, _, sizes, quick_sizes = FAMILIES[family]
+        for n in (quick_sizes if args.quick else sizes):
+            record = bench_case(family, n, args.length, args.nfa_length, args.repeat)
+            results.append(record)
+            slowest = max(record["seconds"].items(), key=lambda kv: kv[1])
+            print(f"{family:<12} n={n:<5} nfa={record['nfa_states']:<6} "
+                  f"dfa={record['dfa_states']:<6} slowest: {slowest[0]} "
+                  f"{slowest[1]:.4f} s", file=sys.stderr)
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return 0
+
+def _timings(report: Dict[str, Any]) -> Dict[Tuple[str, int, str], float]:
+    return {(r["family"], r["n"], stage): seconds
+            for r in report["results"]
+            for stage, seconds in r["seconds"].items()}
+
+def compare_reports(base: Dict[str, Any], new: Dict[str, Any], threshold: float,
+                    min_seconds: float) -> List[Tuple[Tuple[str, int, str], float, float]]:
+    """Stages present in both reports that are slower by more than `threshold`.
+
+    Timings under `min_seconds` in both runs are ignored as noise.
+    """
+    old_t, new_t = _timings(base), _timings(new)
+    regressions = []
+    for key in sorted(old_t.keys() & new_t.keys()):
+        before, after = old_t[key], new_t[key]
+        if max(before, after) < min_seconds:
+            continue
+        if after > before * (1 + threshold):
+            regressions.append((key, before, after))
+    return regressions
+
+def compare(args: argparse.Namespace) -> int:
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    regressions = compare_reports(base, new, args.threshold, args.min_seconds)
+    if not regressions:
+        print(f"Sin regresiones (umbral {args.threshold:.0%}).")
+        return 0
+    print(f"{'family':<12} {'n':>5} {'stage':<18} {'base (s)':>10} {'new (s)':>10} {'ratio':>7}")
+    for (family, n, stage), before, after in regressions:
+        ratio = after / before if before > 0 else float("inf")
+        print(f"{family:<12} {n:>5} {stage:<18} {before:10.5f} {after:10.5f} {ratio:6.2f}x")
+    print(f"{len(regressions)} regresiones (umbral {args.threshold:.0%}).")
+    return 1
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=description(__doc__))
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Run the suite and write the JSON report.")
+    p_run.add_argument("--families", nargs="+", choices=list(FAMILIES))
+    p_run.add_argument("--quick", action="store_true", help="Only the small sizes.")
+    p_run.add_argument("--length", type=int, default=100_000,
+                       help="Input length for DFA.accepts.")
+    p_run.add_argument("--nfa-length", type=int, default=10_000,
+                       help="Input length for NFA.accepts (a prefix of the same input).")
+    p_run.add_argument("--repeat", type=int, default=3)
+    p_run.add_argument("--output", default="-", help="JSON file ('-' for stdout).")
+    p_run.set_defaults(func=run)
+
+    p_cmp = sub.add_parser("compare", help="Flag regressions between two reports.")
+    p_cmp.add_argument("base")
+    p_cmp.add_argument("new")
+    p_cmp.add_argument("--threshold", type=float, default=0.10,
+                       help="Relative slowdown reported as a regression.")
+    p_cmp.add_argument("--min-seconds", type=float, default=1e-4,
+                       help="Ignore stages faster than this in both runs.")
+    p_cmp.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
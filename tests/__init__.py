@@ -0,0 +1 @@
+"""Differential tests of the matching engines against Python's ``re``."""
@@ -0,0 +1,48 @@
+"""ArtifactCache must round-trip compiled DFAs and recover from bad files."""
+
+import os
+
+import pytest
+
+from automata_tool.core import ArtifactCache, AutomatonFactory
+from automata_tool.core.cache import regex_key
+
+from .test_engines import INPUTS
+
+REGEX = "(a|b)*abb"
+
+def test_hit_returns_the_stored_table(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    built = cache.compile_regex(REGEX)
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and files[0].endswith(ArtifactCache.SUFFIX)
+
+    loaded = cache.compile_regex(REGEX)
+    assert loaded is not built and loaded.buffer is not None
+    assert list(loaded.table) == list(built.table)
+    assert all(loaded.accepts(text) == built.accepts(text) for text in INPUTS)
+
+def test_key_depends_on_factory_options(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    cache.compile_regex(REGEX)
+    cache.compile_regex(REGEX, AutomatonFactory(minimize=True))
+    cache.compile_regex(REGEX, AutomatonFactory(byte_mode=True))
+    assert len(os.listdir(tmp_path)) == 3
+
+def test_corrupt_file_is_a_miss(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    cache.compile_regex(REGEX)
+    [name] = os.listdir(tmp_path)
+    with open(tmp_path / name, "wb") as f:
+        f.write(b"not a compiled DFA")
+
+    compiled = cache.compile_regex(REGEX)
+    assert compiled.accepts("babb") and not compiled.accepts("bab")
+    # The bad file was replaced by a good one.
+    assert cache.get(cache.key(regex_key(REGEX), AutomatonFactory())) is not None
+
+def test_refuses_nfa_fallback(tmp_path):
+    factory = AutomatonFactory(max_dfa_states=1, nfa_fallback=True)
+    with pytest.raises(ValueError):
+        ArtifactCache(str(tmp_path)).compile_regex("(a|b)*a(a|b)", factory)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(ArtifactCache.SUFFIX)]
@@ -0,0 +1,134 @@
+"""Differential tests of the matching engines against Python's ``re``.
+
+Every engine must agree with ``re.fullmatch`` on a fixed pattern set, for
+the automata of every factory configuration.
+"""
+
+import itertools
+import pickle
+import re
+
+import pytest
+
+from automata_tool.automata import BitsetNFA, CompiledDFA, StreamMatcher
+from automata_tool.automata.binary import dumps_compiled, loads_compiled
+from automata_tool.automata.search import DFASearcher
+from automata_tool.builders import SubsetConstruction
+from automata_tool.core import AutomatonFactory, AutomatonDefinition
+
+PATTERNS = [
+    "a",
+    "ab|ba",
+    "a(b|c)*",
+    "(a|b)*abb",
+    "(ab|cd)*e?",
+    "a+b?c*",
+    "(a|b)*a(a|b)(a|b)",
+    "[a-c]+x",
+    "[^a]b*",
+    "a.c",
+    "(a|b){2,3}c{1,}",
+    "(ab){0,2}a{2}",
+    "((a|b)c?)+",
+    "[a-c\\n]*c",
+]
+
+ALPHABET = "abcx\n"
+
+INPUTS = ["".join(word) for n in range(6) for word in itertools.product(ALPHABET, repeat=n)]
+
+FACTORIES = {
+    "thompson": AutomatonFactory(direct_dfa=False),
+    "direct": AutomatonFactory(),
+    "glushkov": AutomatonFactory(builder="glushkov", direct_dfa=False),
+    "minimized": AutomatonFactory(minimize=True, direct_dfa=False),
+    "no-simplify": AutomatonFactory(simplify=False),
+}
+
+# engine -> build(factory, pattern, result); the result is the factory's
+# from_regex(pattern). The DFA is read before the NFA, so that factories
+# with direct_dfa=True build it without one.
+ENGINES = {
+    "dfa": lambda factory, pattern, result: result["dfa"],
+    "nfa": lambda factory, pattern, result: result["nfa"],
+    "compiled": lambda factory, pattern, result: CompiledDFA.from_dfa(result["dfa"]),
+    "binary": lambda factory, pattern, result: loads_compiled(
+        dumps_compiled(CompiledDFA.from_dfa(result["dfa"]))),
+    "lazy": lambda factory, pattern, result: factory.lazy_from_regex(pattern),
+    "bitset": lambda factory, pattern, result: BitsetNFA(result["nfa"]),
+    "pike": lambda factory, pattern, result: factory.pike_from_regex(pattern),
+}
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+@pytest.mark.parametrize("name", sorted(FACTORIES))
+def test_engines_agree_with_re(name, pattern):
+    factory = FACTORIES[name]
+    result = factory.from_regex(pattern)
+    engines = {engine: build(factory, pattern, result) for engine, build in ENGINES.items()}
+    expected = re.compile(pattern)
+    for text in INPUTS:
+        accepted = expected.fullmatch(text) is not None
+        for engine, matcher in engines.items():
+            assert matcher.accepts(text) == accepted, (engine, pattern, text)
+
+def test_equivalence_classes_stay_internal():
+    definition = AutomatonDefinition(
+        kind="NFA",
+        states={"q0", "q1"},
+        alphabet={"0", "1"},
+        initial_state="q0",
+        final_states={"q1"},
+        transition_function={"q0": {"0": ["q0", "q1"], "1": ["q0", "q1"]}},
+    )
+    result = FACTORIES["thompson"].from_definition(definition)
+    dfa = result["dfa"]
+    assert dfa.alphabet == {"0", "1"}
+    assert not result["dfa_def"].char_classes
+    assert all(set(inner) == {"0", "1"} for inner in dfa.transitions.values())
+    # "0" and "1" behave alike, so the compiled table has a single column.
+    assert CompiledDFA.from_dfa(dfa).num_columns == 1
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_subset_paths_build_the_same_dfa(pattern):
+    nfa = FACTORIES["thompson"].from_regex(pattern)["nfa"]
+    with_bits = SubsetConstruction(use_bitsets=True).build(nfa)
+    with_sets = SubsetConstruction(use_bitsets=False).build(nfa)
+    assert len(with_bits.states) == len(with_sets.states)
+    assert with_bits.alphabet == with_sets.alphabet
+    assert all(with_bits.accepts(text) == with_sets.accepts(text) for text in INPUTS)
+
+def test_bitset_nfa_pickles():
+    bits = BitsetNFA(FACTORIES["thompson"].from_regex("[a-c]*x(a|b)*")["nfa"])
+    copy = pickle.loads(pickle.dumps(bits))
+    assert all(copy.accepts(text) == bits.accepts(text) for text in INPUTS)
+
+@pytest.mark.parametrize("pattern", ["ab+", "a|bc", "(ab|cd)+"])
+def test_search_finds_leftmost_longest(pattern):
+    factory = FACTORIES["minimized"]
+    searcher = DFASearcher(factory.compile_dfa(factory.from_regex(pattern)["dfa"]))
+    text = "xxabbbcdabcdabxbcab"
+    # With no overlapping alternatives, re's leftmost-first equals leftmost-longest.
+    expected = [m.span() for m in re.finditer(f"(?:{pattern})", text)]
+    assert searcher.findall(text) == expected
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_stream_matcher_agrees_with_accepts(pattern):
+    factory = FACTORIES["minimized"]
+    compiled = factory.compile_dfa(factory.from_regex(pattern)["dfa"])
+    matcher = StreamMatcher(compiled)
+    for text in INPUTS[::7]:
+        for cut in range(len(text) + 1):
+            matcher.reset()
+            matcher.feed(text[:cut])
+            matcher.feed(text[cut:])
+            assert matcher.is_accepting() == compiled.accepts(text), (pattern, text, cut)
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_glushkov_nfa_is_epsilon_free(pattern):
+    nfa = FACTORIES["glushkov"].from_regex(pattern)["nfa"]
+    assert all(None not in inner for inner in nfa.transitions.values())
+
+def test_direct_dfa_skips_the_nfa():
+    result = FACTORIES["direct"].from_regex("(a|b)*abb")
+    assert result["dfa"].accepts("aabb")
+    assert not result.is_computed("nfa")
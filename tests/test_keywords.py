@@ -0,0 +1,34 @@
+"""from_keywords must build the minimal DFA of exactly the keyword set."""
+
+import itertools
+import random
+
+import pytest
+
+from automata_tool.builders.minimize import HopcroftMinimizer
+from automata_tool.core import AutomatonFactory
+
+def random_keywords(seed, n):
+    rng = random.Random(seed)
+    return ["".join(rng.choice("abc") for _ in range(rng.randint(0, 5))) for _ in range(n)]
+
+@pytest.mark.parametrize("seed", range(10))
+def test_accepts_exactly_the_keywords_and_is_minimal(seed):
+    keywords = random_keywords(seed, 30)
+    dfa = AutomatonFactory().from_keywords(keywords)["dfa"]
+    words = ["".join(w) for n in range(7) for w in itertools.product("abc", repeat=n)]
+    assert {w for w in words if dfa.accepts(w)} == set(keywords)
+    assert len(dfa.states) == len(HopcroftMinimizer().build(dfa).states)
+
+def test_keywords_are_literal():
+    dfa = AutomatonFactory().from_keywords(["a.b", "(x)", "[ab]"])["dfa"]
+    assert dfa.accepts("a.b") and dfa.accepts("(x)") and dfa.accepts("[ab]")
+    assert not dfa.accepts("axb") and not dfa.accepts("a")
+
+def test_nfa_view_and_byte_mode():
+    result = AutomatonFactory().from_keywords(["café", "cafe"])
+    assert result["nfa"].accepts("café") and not result["nfa"].accepts("caf")
+    factory = AutomatonFactory(byte_mode=True)
+    compiled = factory.compile_dfa(factory.from_keywords(["café", "cafe"])["dfa"])
+    assert compiled.accepts("café".encode("utf-8")) and compiled.accepts(b"cafe")
+    assert not compiled.accepts("café".encode("latin-1"))
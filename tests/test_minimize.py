@@ -0,0 +1,52 @@
+"""Hopcroft minimization must give the minimal DFA of the same language."""
+
+import itertools
+
+import pytest
+
+from automata_tool.builders.minimize import HopcroftMinimizer
+from automata_tool.core import AutomatonFactory
+
+from .test_engines import INPUTS, PATTERNS
+
+def moore_classes(dfa):
+    """Number of live states of the minimal DFA, by naive Moore refinement."""
+    dead = None
+    states = sorted(dfa.states) + [dead]
+    symbols = sorted(dfa.alphabet)
+
+    def step(state, symbol):
+        return None if state is None else dfa.transitions.get(state, {}).get(symbol)
+
+    block = {state: state in dfa.final_states for state in states}
+    while True:
+        signature = {state: (block[state],) + tuple(block[step(state, symbol)]
+                                                    for symbol in symbols)
+                     for state in states}
+        if len(set(signature.values())) == len(set(block.values())):
+            break
+        block = signature
+    # The dead state's class does not appear in a partial DFA.
+    return sum(1 for cls in set(block.values()) if cls != block[dead])
+
+@pytest.mark.parametrize("pattern", PATTERNS + ["(a|b)*(a|b)*", "(aa|a)*", "a*|b*|(a|b)*"])
+def test_minimal_and_equivalent(pattern):
+    dfa = AutomatonFactory(direct_dfa=False).from_regex(pattern)["dfa"]
+    minimal = HopcroftMinimizer().build(dfa)
+    assert len(minimal.states) == moore_classes(dfa)
+    for text in INPUTS:
+        assert minimal.accepts(text) == dfa.accepts(text), (pattern, text)
+    assert len(HopcroftMinimizer().build(minimal).states) == len(minimal.states)
+
+def test_factory_reports_minimization():
+    result = AutomatonFactory(minimize=True, direct_dfa=False).from_regex("(a|b)*abb")
+    assert result["minimization"]["states_after"] == len(result["dfa"].states) == 4
+    assert result["minimization"]["states_before"] >= 4
+
+def test_empty_language():
+    dfa = AutomatonFactory().from_regex("a")["dfa"]
+    dfa.final_states = set()
+    minimal = HopcroftMinimizer().build(dfa)
+    assert len(minimal.states) == 1 and not minimal.final_states
+    assert not any(minimal.accepts("".join(w)) for n in range(3)
+                   for w in itertools.product("ab", repeat=n))
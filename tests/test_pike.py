@@ -0,0 +1,45 @@
+"""PikeVM submatch spans must match ``re.fullmatch(...).span(i)``."""
+
+import itertools
+import re
+
+import pytest
+
+from automata_tool.core import AutomatonFactory, match
+
+# Loops with a nullable body, such as (a*)*, are left out: re may report one
+# more empty iteration than the PikeVM (see PikeVM's docstring).
+PATTERNS = [
+    "(a)(b)",
+    "(a|ab)(c|bcd)?",
+    "(a+)(a*)",
+    "((a)|(b))+",
+    "(a|b)*(b)",
+    "(ab|a)(bc|c)?",
+    "((ab)|c)*d?",
+    "(a){2}(b{1,2})",
+    "(a|(b))(c)?",
+    "x(y)?z",
+]
+
+INPUTS = ["".join(word) for n in range(6) for word in itertools.product("abcd", repeat=n)]
+
+def re_spans(compiled, text):
+    found = compiled.fullmatch(text)
+    if found is None:
+        return None
+    return [found.span(i) if found.span(i) != (-1, -1) else None
+            for i in range(compiled.groups + 1)]
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_spans_agree_with_re(pattern):
+    vm = AutomatonFactory().pike_from_regex(pattern)
+    expected = re.compile(pattern)
+    assert vm.num_groups == expected.groups
+    for text in INPUTS:
+        assert vm.match(text) == re_spans(expected, text), (pattern, text)
+
+def test_match_helper_uses_cached_vm():
+    assert match("(a|b)*(c)", "abac") == [(0, 4), (2, 3), (3, 4)]
+    assert match("(a|b)*(c)", "abab") is None
+    assert match("(a)|(b)", "b") == [(0, 1), None, (0, 1)]
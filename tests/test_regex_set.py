@@ -0,0 +1,39 @@
+"""RegexSet must report the patterns ``re`` matches and lex by maximal munch."""
+
+import itertools
+import re
+
+import pytest
+
+from automata_tool.core import LexToken, RegexSet
+
+PATTERNS = ["ab*", "a(b|c)", "[a-c]+", "c?x", "x"]
+
+def test_matches_agree_with_re():
+    regex_set = RegexSet(PATTERNS)
+    expected = [re.compile(pattern) for pattern in PATTERNS]
+    for n in range(5):
+        for word in itertools.product("abcx", repeat=n):
+            text = "".join(word)
+            assert regex_set.matches(text) == {
+                i for i, pattern in enumerate(expected) if pattern.fullmatch(text)}, text
+            assert regex_set.is_match(text) == bool(regex_set.matches(text))
+
+def test_tokenize_longest_match_then_priority():
+    lexer = RegexSet(["if", "[a-z]+", "[0-9]+", "\\ +"])
+    tokens = list(lexer.tokenize("if iffy 42"))
+    assert [(t.pattern, t.text) for t in tokens] == [
+        (0, "if"), (3, " "), (1, "iffy"), (3, " "), (2, "42")]
+    assert tokens[2] == LexToken(1, 3, 7, "iffy")
+
+def test_priorities_break_ties():
+    lexer = RegexSet(["[a-z]+", "if"], priorities=[1, 0])
+    assert [t.pattern for t in lexer.tokenize("if")] == [1]
+
+def test_tokenize_rejects_unknown_input():
+    with pytest.raises(ValueError):
+        list(RegexSet(["a+"]).tokenize("aab"))
+
+def test_requires_patterns():
+    with pytest.raises(ValueError):
+        RegexSet([])
@@ -0,0 +1,52 @@
+"""The simplifier's rewrites, and that they never reach the displayed NFA."""
+
+import pytest
+
+from automata_tool.core import AutomatonFactory
+from automata_tool.regex import Parser, simplify
+from automata_tool.regex.simplify import count_nodes
+
+REWRITES = [
+    ("(a*)*", "a*"),
+    ("(a+)*", "a*"),
+    ("(a?)*", "a*"),
+    ("(a|b?)*", "[ab]*"),
+    ("(ab|c*)*", "(ab|c)*"),
+    ("(a*)+", "a*"),
+    ("(a?)+", "a*"),
+    ("(a+)+", "a+"),
+    ("(a+)?", "a*"),
+    ("(a*)?", "a*"),
+    ("(a?b?)+", "(a?b?)*"),
+    ("a{1}", "a"),
+    ("a{0,}", "a*"),
+    ("a{1,}", "a+"),
+    ("a{0,1}", "a?"),
+    ("ab|ab", "ab"),
+    ("a|b|[x-z]", "[abx-z]"),
+    ("a|bc|d", "[ad]|bc"),
+    ("a*a*", "a*"),
+    ("a{2,3}", "a{2,3}"),
+]
+
+@pytest.mark.parametrize("source, expected", REWRITES)
+def test_rewrite(source, expected):
+    assert repr(simplify(Parser(source).parse())) == repr(Parser(expected).parse())
+
+def test_equal_subexpressions_are_shared():
+    root = simplify(Parser("(ab|c)*x(ab|c)*").parse())
+    assert root.left.left is root.right
+    assert count_nodes(root) < count_nodes(Parser("(ab|c)*x(ab|c)*").parse())
+
+def test_displayed_nfa_follows_the_regex_as_written():
+    result = AutomatonFactory().from_regex("a(b|c)*")
+    expected = AutomatonFactory(simplify=False).from_regex("a(b|c)*")
+    assert result["nfa"].alphabet == {"a", "b", "c"}
+    assert len(result["nfa"].states) == len(expected["nfa"].states)
+    assert result["nfa_def"].to_dict() == expected["nfa_def"].to_dict()
+    assert result["dfa"].alphabet == {"a", "b", "c"}
+
+def test_match_only_dfa_uses_the_simplified_regex():
+    result = AutomatonFactory().from_regex("a(b|c)*")
+    assert result["dfa"].alphabet == {"a", "[bc]"}
+    assert not result.is_computed("nfa")
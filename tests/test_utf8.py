@@ -0,0 +1,64 @@
+"""UTF-8 byte-range compilation and byte-mode matching."""
+
+import itertools
+import re
+
+import pytest
+
+from automata_tool.core import AutomatonFactory
+from automata_tool.regex import utf8_sequences
+
+RANGES = [
+    (0x00, 0x7F),
+    (0x41, 0x5A),
+    (0x7F, 0x80),
+    (0xE0, 0x10FF),
+    (0x7FF, 0x800),
+    (0xD000, 0xE100),      # straddles the surrogates
+    (0xFFFF, 0x10000),
+    (0x1F600, 0x1F64F),
+    (0x0, 0x10FFFF),
+]
+
+def covers(sequence, data):
+    return (len(sequence) == len(data)
+            and all(lo <= b <= hi for (lo, hi), b in zip(sequence, data)))
+
+@pytest.mark.parametrize("lo, hi", RANGES)
+def test_utf8_sequences_round_trip(lo, hi):
+    sequences = utf8_sequences(lo, hi)
+    # Every encodable code point is covered by exactly one sequence...
+    step = max(1, (hi - lo) // 5000)
+    for cp in itertools.chain(range(lo, hi + 1, step), [hi]):
+        if 0xD800 <= cp <= 0xDFFF:
+            continue
+        data = chr(cp).encode("utf-8")
+        assert sum(covers(seq, data) for seq in sequences) == 1, hex(cp)
+    # ...and every sequence only holds encodings of code points in range.
+    for seq in sequences:
+        for data in (bytes(first for first, _ in seq), bytes(last for _, last in seq)):
+            cp = ord(data.decode("utf-8"))
+            assert lo <= cp <= hi and not 0xD800 <= cp <= 0xDFFF
+
+# Written with escapes where the lexer needs them; re reads them the same way.
+PATTERNS = ["é+", "[à-ÿ]x", "[^a]", ".\\u20ac?", "(a|\\U0001F600)*b", "[a😀-😂]{1,2}",
+            "[Ā-\\U0001F000]"]
+CHARS = ["a", "b", "x", "é", "€", "😀", "ß", "\n"]
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_byte_mode_agrees_with_re(pattern):
+    factory = AutomatonFactory(byte_mode=True)
+    compiled = factory.compile_dfa(factory.from_regex(pattern)["dfa"])
+    expected = re.compile(pattern)
+    for n in range(4):
+        for word in itertools.product(CHARS, repeat=n):
+            text = "".join(word)
+            data = text.encode("utf-8")
+            assert compiled.accepts(data) == (expected.fullmatch(text) is not None), (pattern, text)
+
+def test_invalid_utf8_is_rejected():
+    factory = AutomatonFactory(byte_mode=True)
+    dot = factory.compile_dfa(factory.from_regex(".")["dfa"])
+    assert not dot.accepts(b"\xff")
+    assert not dot.accepts(b"\xed\xa0\x80")   # an encoded surrogate
+    assert not dot.accepts(b"\xc3")           # truncated sequence